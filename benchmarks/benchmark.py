@@ -0,0 +1,558 @@
+# Benchmark do analisador léxico, do sintático e do pipeline completo.
+#
+#   python benchmarks/benchmark.py                      # todos os tamanhos
+#   python benchmarks/benchmark.py --tamanhos 1K,1M     # só alguns
+#   python benchmarks/benchmark.py --salvar base.json   # grava a linha de base
+#   python benchmarks/benchmark.py --comparar base.json # aponta regressões
+#   python benchmarks/benchmark.py --partida            # partida a frio da CLI
+#   python benchmarks/benchmark.py --execucao           # máquina virtual contra Python gerado
+#   python benchmarks/benchmark.py --execucao -O2       # idem, com o código otimizado
+#
+# Cada medição roda num processo novo, para que o pico de memória de uma
+# etapa não contamine a seguinte.
+
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+# Sem o pacote instalado, o lalg/ da raiz do repositório; na frente, para
+# valer o código que está sendo medido, não uma cópia instalada
+sys.path.insert(0, str(RAIZ))
+
+ETAPAS = ("lexico", "tokenizar", "analisar", "pipeline", "semantico", "fluxo", "edicao", "cache")
+TAMANHOS_PADRAO = "1K,10K,100K,1M,10M,100M"
+
+# Com o rastro completo o sintático guarda a pilha a cada passo; acima
+# disso a memória passa de GBs. Os outros níveis de rastro não têm limite.
+TAMANHO_MAXIMO_SINTATICO = 1024 * 1024
+
+# A etapa 'edicao' guarda o estado da análise incremental inteira (tokens,
+# log de ações e marcos); acima disso a preparação domina o tempo da medição
+TAMANHO_MAXIMO_EDICAO = 10 * 1024 * 1024
+
+# A etapa 'cache' analisa o programa uma vez antes de medir; acima disso o
+# resultado nem cabe no limite padrão de memória do cache
+TAMANHO_MAXIMO_CACHE = 10 * 1024 * 1024
+
+# Linha digitada e apagada, uma tecla por vez, pela etapa 'edicao'
+LINHA_DIGITADA = "    a := a + 1;\n"
+
+# Queda de vazão (ou alta de memória) tolerada antes de acusar regressão
+TOLERANCIA_PADRAO = 0.10
+
+CABECALHO = """program bench;
+var a, b, c: integer;
+var x, y: real;
+begin
+"""
+
+# Bloco repetido até o tamanho pedido: um pouco de cada construção da LALG.
+BLOCO = """    read(a, b);
+    a := a + 1; x := (x - 0.5) * 2;
+    // comentário de linha
+    while (a * 2 + (c - 3) / 4 < 100) do begin read(a); write(b); end;
+    if a >= b then write(a, b) else read(c);
+    /* comentário de
+       várias linhas */
+    if x + 2.5 <> y - 0.75 then begin write(x); write(y); end;
+    repeat read(c); until c <> 10;
+"""
+
+RODAPE = "end.\n"
+
+# Programas da medição de --execucao: laços que rodam por algumas centenas de
+# milhares de instruções, cada um puxando por um lado da máquina virtual.
+PROGRAMAS_EXECUCAO = {
+    # for aninhados e aritmética inteira
+    "somas": """program somas;
+var i, j, s: integer;
+begin
+    s := 0;
+    for i := 1 to 300 do begin
+        for j := 1 to 300 do begin s := s + i * j - (i + j); end;
+    end;
+    write(s);
+end.
+""",
+    # while e repeat com divisão inteira e if
+    "collatz": """program collatz;
+var n, x, passos: integer;
+begin
+    passos := 0;
+    n := 1;
+    repeat
+        x := n;
+        while (x <> 1) do begin
+            if x - x / 2 * 2 = 0 then x := x / 2 else x := 3 * x + 1;
+            passos := passos + 1;
+        end;
+        n := n + 1;
+    until n > 1000;
+    write(passos);
+end.
+""",
+    # chamadas: procedimento num laço e função recursiva
+    "chamadas": """program chamadas;
+var i, total, n, peso: integer;
+procedure acumular(v: integer; peso: integer);
+var t: integer;
+begin
+    t := v * peso;
+    total := total + t;
+end;
+function fib(n: integer): integer;
+var a, b: integer;
+begin
+    if n < 2 then fib := n
+    else begin
+        a := n - 1; fib(a); b := fib;
+        a := n - 2; fib(a); fib := b + fib;
+    end;
+end;
+begin
+    total := 0;
+    peso := 3;
+    for i := 1 to 20000 do begin acumular(i, peso); end;
+    n := 18;
+    fib(n);
+    write(total, fib);
+end.
+""",
+    # aritmética real, com conversão de inteiros
+    "reais": """program reais;
+var i: integer;
+var x, raiz, anterior: real;
+begin
+    x := 0;
+    for i := 1 to 40000 do begin x := x + 1.0 / i - 0.5 / (i + 1); end;
+    raiz := x;
+    repeat
+        anterior := raiz;
+        raiz := (raiz + x / raiz) / 2;
+    until anterior - raiz < 0.000001;
+    write(x, raiz);
+end.
+""",
+    # constantes e expressões invariantes dentro de um while (para -O)
+    "invariantes": """program invariantes;
+const escala = 4;
+const base = 7;
+var i, largura, altura, area, soma: integer;
+var fator, total: real;
+procedure medidas;
+begin
+    largura := 120;
+    altura := 35;
+    fator := 0.5;
+end;
+begin
+    medidas;
+    soma := 0;
+    total := 0;
+    i := 0;
+    while (i < 30000) do begin
+        area := largura * altura / 10;
+        soma := soma + area + (largura * escala + base) * (altura - 1) - i;
+        total := total + fator * 2.5 * fator;
+        i := i + 1;
+    end;
+    write(soma, total);
+end.
+""",
+}
+
+
+def ler_tamanho(texto):
+    """'1K' -> 1024, '10M' -> 10485760, '500' -> 500."""
+    multiplicadores = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    texto = texto.strip().upper()
+    if texto[-1] in multiplicadores:
+        return int(float(texto[:-1]) * multiplicadores[texto[-1]])
+    return int(texto)
+
+
+def gerar_programa(tamanho):
+    """Programa LALG válido com aproximadamente tamanho bytes."""
+    repeticoes = max(1, (tamanho - len(CABECALHO) - len(RODAPE)) // len(BLOCO.encode("utf-8")))
+    return CABECALHO + BLOCO * repeticoes + RODAPE
+
+
+def pico_memoria_mb():
+    """Pico de memória residente desde o último zerar_pico() (ou do processo)."""
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss vem em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def zerar_pico():
+    """
+    Faz o pico voltar à memória atual (Linux), para que montar a entrada não
+    conte na medição; sem /proc, o pico continua sendo o do processo.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def memoria_atual_mb():
+    """Memória residente agora (Linux); sem /proc, usa o pico até aqui."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize() / 1024 ** 2
+    except OSError:
+        return pico_memoria_mb()
+
+
+def preparar_entrada(etapa, texto):
+    """
+    As etapas 'analisar' e 'semantico' medem só o sintático (com ou sem a
+    tabela de símbolos): os tokens vêm prontos. A etapa
+    'edicao' mede só as edições: a análise inicial do analisador incremental
+    (e uma edição no ponto escolhido, que leva até ali a lacuna do buffer de
+    tokens) ficam fora da medição. A etapa 'fluxo' lê o programa de um
+    arquivo temporário, como faria com um arquivo de verdade. A etapa
+    'cache' mede a análise repetida do mesmo texto: a primeira, que enche
+    o cache, fica fora da medição.
+    """
+    if etapa in ("analisar", "semantico"):
+        from lalg.analisador_sintatico import AnalisadorSintatico
+        tokens, _ = AnalisadorSintatico().tokenizar(texto)
+        return tokens
+    if etapa == "edicao":
+        from lalg.sintatico_incremental import AnalisadorSintaticoIncremental
+        incremental = AnalisadorSintaticoIncremental(texto)
+        posicao = texto.index(";\n", len(texto) // 2) + 2
+        incremental.editar(posicao, posicao, " ")
+        incremental.editar(posicao, posicao + 1, "")
+        return incremental, posicao
+    if etapa == "cache":
+        from lalg.cache_resultados import CacheAnalise
+        cache = CacheAnalise()
+        cache.analisar(texto)
+        return cache, texto
+    if etapa == "fluxo":
+        descritor, caminho = tempfile.mkstemp(suffix=".lalg")
+        with os.fdopen(descritor, "w", encoding="utf-8", newline="") as f:
+            # Em pedaços: codificar o texto inteiro de uma vez subiria o pico
+            # de memória do processo, que a medição compara
+            for i in range(0, len(texto), 1024 * 1024):
+                f.write(texto[i:i + 1024 * 1024])
+        atexit.register(os.remove, caminho)
+        return caminho
+    return texto
+
+
+def executar_etapa(etapa, entrada, motor, rastro, motor_sintatico):
+    """
+    Executa uma etapa uma vez. Devolve os tokens produzidos ou analisados
+    (None na etapa 'fluxo', que não os guarda).
+    """
+    from lalg.analisador_lexico_texto import AnalisadorLexicoTexto
+    from lalg.analisador_sintatico import AnalisadorSintatico
+
+    if etapa == "lexico":
+        analisador = AnalisadorLexicoTexto(entrada, motor=motor)
+        analisador.analisar()
+        return analisador.tokens
+
+    sintatico = AnalisadorSintatico()
+    if etapa == "tokenizar":
+        tokens, _ = sintatico.tokenizar(entrada)
+        return tokens
+    if etapa == "analisar":
+        sintatico.analisar(entrada, rastro=rastro, motor=motor_sintatico)
+        return entrada
+    if etapa == "semantico":
+        sintatico.analisar_semantico(entrada)
+        return entrada
+    if etapa == "pipeline":
+        tokens, _ = sintatico.tokenizar(entrada)
+        sintatico.analisar(tokens, rastro=rastro, motor=motor_sintatico)
+        return tokens
+    if etapa == "fluxo":
+        # Léxico e sintático fundidos, lendo o arquivo em blocos
+        with open(entrada, encoding="utf-8", newline="") as f:
+            sintatico.analisar_fluxo(f)
+        return None
+    if etapa == "edicao":
+        # Digita LINHA_DIGITADA no meio do programa e a apaga, tecla a tecla
+        incremental, posicao = entrada
+        for i, caractere in enumerate(LINHA_DIGITADA):
+            incremental.editar(posicao + i, posicao + i, caractere)
+        for i in range(len(LINHA_DIGITADA), 0, -1):
+            incremental.editar(posicao + i - 1, posicao + i, "")
+        return incremental.tokens
+    if etapa == "cache":
+        cache, texto = entrada
+        return cache.analisar(texto).tokens
+    raise ValueError(f"Etapa desconhecida: {etapa}")
+
+
+def contar_passos(tokens):
+    """Passos do sintático sobre os tokens (pelo rastro compacto, fora da medição)."""
+    from lalg.analisador_sintatico import RASTRO_ACOES, AnalisadorSintatico
+    _, _, rastro = AnalisadorSintatico().analisar(tokens, rastro=RASTRO_ACOES)
+    return len(rastro)
+
+
+def medir(etapa, tamanho, motor, rastro, motor_sintatico, repeticoes):
+    """
+    Mede uma etapa sobre um programa de tamanho bytes, no processo atual:
+    melhor tempo de repeticoes execuções e pico de memória acima da memória
+    ocupada antes da etapa (texto gerado e, para 'analisar' e 'semantico', os
+    tokens).
+    """
+    # Importa antes de medir, para não cronometrar a carga dos módulos
+    from lalg import analisador_lexico_texto  # noqa: F401
+    from lalg import analisador_sintatico  # noqa: F401
+
+    texto = gerar_programa(tamanho)
+    entrada = preparar_entrada(etapa, texto)
+    if motor_sintatico == analisador_sintatico.MOTOR_DESCENDENTE:
+        # Gera e importa o módulo descendente antes de medir
+        analisador_sintatico.descendente_da_gramatica(str(analisador_sintatico.ARQUIVO_GRAMATICA))
+
+    gc.collect()
+    zerar_pico()
+    memoria_antes = memoria_atual_mb()
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        tokens = executar_etapa(etapa, entrada, motor, rastro, motor_sintatico)
+        melhor = min(melhor, time.perf_counter() - inicio)
+        gc.collect()
+    pico = max(0.0, pico_memoria_mb() - memoria_antes)
+
+    if tokens is None:
+        # A etapa não guardou os tokens: conta-os fora da medição
+        tokens, _ = analisador_sintatico.AnalisadorSintatico().tokenizar(texto)
+    usa_sintatico = etapa in ("analisar", "pipeline")
+    n_passos = contar_passos(tokens) if usa_sintatico or etapa in ("semantico", "fluxo") else 0
+    return {
+        "etapa": etapa,
+        "tamanho": tamanho,
+        "bytes": len(texto.encode("utf-8")),
+        "motor": motor if etapa == "lexico" else "compilado",
+        "rastro": rastro if usa_sintatico else "",
+        "motor_sintatico": motor_sintatico if usa_sintatico else "",
+        "tokens": len(tokens),
+        "passos": n_passos,
+        "segundos": melhor,
+        "tokens_por_s": len(tokens) / melhor,
+        "passos_por_s": n_passos / melhor,
+        "pico_memoria_mb": pico,
+    }
+
+
+def medir_partida(repeticoes):
+    """
+    Partida a frio de `python -m lalg` analisando um programa pequeno, em
+    processos novos, comparada com a do interpretador sozinho. Os .pyc são
+    gerados antes, numa execução fora da medição. Devolve {comando: (mediana,
+    mínimo)} em segundos.
+    """
+    import statistics
+
+    descritor, caminho = tempfile.mkstemp(suffix=".lalg")
+    with os.fdopen(descritor, "w", encoding="utf-8") as f:
+        f.write(gerar_programa(1024))
+    atexit.register(os.remove, caminho)
+    ambiente = dict(os.environ)
+    ambiente.pop("PYTHONDONTWRITEBYTECODE", None)
+    comandos = {
+        "python -c pass": [sys.executable, "-c", "pass"],
+        "python -m lalg": [sys.executable, "-m", "lalg", caminho],
+    }
+    tempos = {nome: [] for nome in comandos}
+    for i in range(repeticoes + 1):
+        # Alterna os comandos, para a carga da máquina pesar igual nos dois
+        for nome, comando in comandos.items():
+            inicio = time.perf_counter()
+            subprocess.run(comando, cwd=RAIZ, env=ambiente, capture_output=True, check=True)
+            if i:
+                tempos[nome].append(time.perf_counter() - inicio)
+    return {nome: (statistics.median(t), min(t)) for nome, t in tempos.items()}
+
+
+def medir_execucao(repeticoes, nivel=0):
+    """
+    Compila cada programa de PROGRAMAS_EXECUCAO e o executa nos dois
+    motores: a máquina virtual e o código Python gerado. Vale o melhor tempo
+    de execução (sem a compilação) entre as repetições, alternando os
+    motores. Devolve {programa: (instruções da máquina virtual, segundos na
+    máquina virtual, segundos no Python gerado)}. nivel é o de -O do
+    otimizador.
+    """
+    import io
+    from lalg.arvore_abstrata import programa_do_texto
+    from lalg.bytecode import compilar
+    from lalg.gerador_python import executar_python, gerar_python
+    from lalg.maquina_virtual import executar
+    from lalg.otimizador import otimizar, otimizar_bytecode, passos_do_nivel
+
+    passos = passos_do_nivel(nivel)
+    resultados = {}
+    for nome, texto in PROGRAMAS_EXECUCAO.items():
+        programa = programa_do_texto(texto)
+        otimizar(programa, passos)
+        objeto, codigo_python = compilar(programa), gerar_python(programa)
+        otimizar_bytecode(objeto, passos)
+        maquina = python = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            instrucoes = executar(objeto, io.StringIO(), io.StringIO()).executadas
+            maquina = min(maquina, time.perf_counter() - inicio)
+            inicio = time.perf_counter()
+            executar_python(codigo_python, io.StringIO(), io.StringIO())
+            python = min(python, time.perf_counter() - inicio)
+        resultados[nome] = (instrucoes, maquina, python)
+    return resultados
+
+
+def medir_em_subprocesso(etapa, tamanho, motor, rastro, motor_sintatico, repeticoes):
+    comando = [sys.executable, __file__, "--medir", etapa, str(tamanho), motor, rastro, motor_sintatico, str(repeticoes)]
+    saida = subprocess.run(comando, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout)
+
+
+def chave(resultado):
+    usa_sintatico = resultado["etapa"] in ("analisar", "pipeline")
+    motor_sintatico = resultado.get("motor_sintatico", "tabela" if usa_sintatico else "")
+    return resultado["etapa"], resultado["tamanho"], resultado["motor"], resultado.get("rastro", ""), motor_sintatico
+
+
+def comparar(resultados, base, tolerancia):
+    """
+    Compara com uma linha de base salva. Devolve as regressões: vazão abaixo
+    de (1 - tolerancia) vezes a da base ou memória acima de (1 + tolerancia)
+    vezes a da base (ignorando diferenças de menos de 1 MB).
+    """
+    anteriores = {chave(r): r for r in base["resultados"]}
+    regressoes = []
+    for atual in resultados:
+        anterior = anteriores.get(chave(atual))
+        if anterior is None:
+            continue
+        for campo in ("tokens_por_s", "passos_por_s"):
+            if anterior[campo] and atual[campo] < anterior[campo] * (1 - tolerancia):
+                regressoes.append(f"{atual['etapa']} {atual['tamanho']} B: {campo} "
+                                  f"{anterior[campo]:,.0f} -> {atual[campo]:,.0f}")
+        memoria_antes, memoria = anterior["pico_memoria_mb"], atual["pico_memoria_mb"]
+        if memoria > memoria_antes * (1 + tolerancia) and memoria - memoria_antes > 1:
+            regressoes.append(f"{atual['etapa']} {atual['tamanho']} B: pico_memoria_mb "
+                              f"{memoria_antes:.1f} -> {memoria:.1f}")
+    return regressoes
+
+
+def imprimir(resultado):
+    passos = f"{resultado['passos_por_s']:>12,.0f}" if resultado["passos"] else f"{'-':>12}"
+    print(f"{resultado['etapa']:<10} {resultado['bytes']:>11,} {resultado['tokens']:>11,} "
+          f"{resultado['segundos']:>9.3f} {resultado['tokens_por_s']:>12,.0f} {passos} "
+          f"{resultado['pico_memoria_mb']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do analisador léxico e sintático de LALG")
+    parser.add_argument("--tamanhos", default=TAMANHOS_PADRAO, help="lista como 1K,1M,100M")
+    parser.add_argument("--etapas", default=",".join(ETAPAS), help="lista entre: " + ", ".join(ETAPAS))
+    parser.add_argument("--motor", default="compilado", help="motor léxico da etapa 'lexico'")
+    parser.add_argument("--rastro", default="completo", help="nível de rastro do sintático: nenhum, acoes, completo")
+    parser.add_argument("--motor-sintatico", default="tabela",
+                        help="motor do sintático: tabela ou descendente (este só com --rastro nenhum)")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--max-sintatico", default=str(TAMANHO_MAXIMO_SINTATICO),
+                        help="maior entrada para as etapas que usam o sintático com rastro completo")
+    parser.add_argument("--salvar", metavar="JSON", help="grava os resultados como linha de base")
+    parser.add_argument("--comparar", metavar="JSON", help="compara com uma linha de base")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO)
+    parser.add_argument("--partida", action="store_true", help="mede a partida a frio de python -m lalg")
+    parser.add_argument("--execucao", action="store_true",
+                        help="mede a máquina virtual e o Python gerado em programas com laços")
+    parser.add_argument("-O", dest="nivel", type=int, default=0, choices=(0, 1, 2),
+                        help="nível de otimização dos programas de --execucao")
+    parser.add_argument("--medir", nargs=6, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.partida:
+        for nome, (mediana, minimo) in medir_partida(max(args.repeticoes, 20)).items():
+            print(f"{nome:<16} mediana {mediana * 1000:6.1f} ms   mínimo {minimo * 1000:6.1f} ms")
+        return 0
+
+    if args.execucao:
+        print(f"{'programa':<12} {'instruções':>11} {'máquina s':>10} {'instruções/s':>13} {'python s':>9} {'ganho':>6}")
+        for nome, (instrucoes, maquina, python) in medir_execucao(args.repeticoes, args.nivel).items():
+            print(f"{nome:<12} {instrucoes:>11} {maquina:>10.3f} {instrucoes / maquina:>13,.0f} "
+                  f"{python:>9.3f} {maquina / python:>5.1f}x")
+        return 0
+
+    if args.medir:
+        etapa, tamanho, motor, rastro, motor_sintatico, repeticoes = args.medir
+        print(json.dumps(medir(etapa, int(tamanho), motor, rastro, motor_sintatico, int(repeticoes))))
+        return 0
+    if args.motor_sintatico == "descendente" and args.rastro != "nenhum":
+        parser.error("o motor descendente só valida: use --rastro nenhum")
+
+    tamanhos = [ler_tamanho(t) for t in args.tamanhos.split(",")]
+    etapas = args.etapas.split(",")
+    max_sintatico = ler_tamanho(args.max_sintatico)
+
+    print(f"{'etapa':<10} {'bytes':>11} {'tokens':>11} {'segundos':>9} {'tokens/s':>12} {'passos/s':>12} {'pico MB':>9}")
+    resultados = []
+    for etapa in etapas:
+        for tamanho in tamanhos:
+            usa_sintatico = etapa in ("analisar", "pipeline")
+            if usa_sintatico and args.rastro == "completo" and tamanho > max_sintatico:
+                continue
+            if etapa == "edicao" and tamanho > TAMANHO_MAXIMO_EDICAO:
+                continue
+            if etapa == "cache" and tamanho > TAMANHO_MAXIMO_CACHE:
+                continue
+            # Entradas grandes demoram: uma execução basta
+            repeticoes = args.repeticoes if tamanho <= 1024 * 1024 else 1
+            resultado = medir_em_subprocesso(etapa, tamanho, args.motor, args.rastro, args.motor_sintatico, repeticoes)
+            imprimir(resultado)
+            resultados.append(resultado)
+
+    if args.salvar:
+        dados = {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "resultados": resultados,
+        }
+        Path(args.salvar).write_text(json.dumps(dados, indent=2), encoding="utf-8")
+        print(f"\nLinha de base salva em {args.salvar}")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text(encoding="utf-8"))
+        regressoes = comparar(resultados, base, args.tolerancia)
+        if regressoes:
+            print(f"\nRegressões em relação a {args.comparar} (tolerância {args.tolerancia:.0%}):")
+            for regressao in regressoes:
+                print("  " + regressao)
+            return 1
+        print(f"\nNenhuma regressão em relação a {args.comparar}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
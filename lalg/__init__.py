@@ -0,0 +1,55 @@
+"""
+Analisadores léxico e sintático de LALG num pacote só:
+
+    import lalg
+    tokens, erro = lalg.AnalisadorSintatico().tokenizar(texto)
+
+Os módulos do léxico e do sintático são submódulos do pacote (lalg.gramatica,
+lalg.bytecode...), então nenhum nome genérico fica solto no sys.path. Os
+nomes exportados são importados sob demanda, no primeiro acesso: `import
+lalg` não carrega a tabela, o léxico nem as interfaces gráficas (tkinter).
+A linha de comando é `python -m lalg`, ou `lalg` com o pacote instalado
+(veja lalg/__main__.py).
+"""
+import importlib
+
+# Nome exportado -> módulo de onde vem
+_ORIGEM = {
+    "AnalisadorLexicoTexto": "analisador_lexico_texto",
+    "BufferTokens": "buffer_tokens",
+    "TabelaIdentificadores": "identificadores",
+    "Diagnostico": "diagnosticos",
+    "TipoToken": "tipos_token",
+    "AnalisadorSintatico": "analisador_sintatico",
+    "ErroSintatico": "analisador_sintatico",
+    "RastroAcoes": "analisador_sintatico",
+    "RASTRO_NENHUM": "analisador_sintatico",
+    "RASTRO_ACOES": "analisador_sintatico",
+    "RASTRO_COMPLETO": "analisador_sintatico",
+    "ArvoreSintatica": "arvore_sintatica",
+    "AnalisadorSintaticoIncremental": "sintatico_incremental",
+    "CacheAnalise": "cache_resultados",
+    "TabelaSimbolos": "semantico",
+    "ErroSemantico": "semantico",
+    "ErroCompilacao": "arvore_abstrata",
+    "CodigoObjeto": "bytecode",
+    "MaquinaVirtual": "maquina_virtual",
+    "ErroExecucao": "maquina_virtual",
+    "CodigoPython": "gerador_python",
+    "Efeito": "otimizador",
+}
+
+__all__ = list(_ORIGEM)
+
+
+def __getattr__(nome):
+    modulo = _ORIGEM.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nome)
+    globals()[nome] = valor  # os próximos acessos não passam por aqui
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
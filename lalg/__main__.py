@@ -0,0 +1,228 @@
+"""
+Linha de comando dos analisadores, sem interface gráfica:
+
+    python -m lalg [opções] programa.lalg [outro.lalg ...]
+
+      --tokens       lista os tokens de cada arquivo
+      --erros        todos os erros sintáticos, não só o primeiro
+      --semantico    confere as declarações (ids não declarados ou repetidos)
+      --fluxo        léxico e sintático numa só passada, em memória constante
+      --cache PASTA  guarda os resultados em PASTA e os reaproveita
+      --bytecode     mostra o código da máquina virtual de cada programa
+      --python       mostra a tradução de cada programa para Python
+      --executar     compila e executa cada programa (read lê da entrada padrão)
+      --motor MOTOR  motor de --executar: maquina (a máquina virtual, padrão) ou python
+      -O0, -O1, -O2  nível de otimização do código (padrão -O0: nenhuma)
+      --passos LISTA passos de otimização, no lugar do nível (ex.: constantes,invariantes)
+      --relatorio    mostra o efeito de cada passo de otimização
+
+Mostra "arquivo: mensagem" para cada arquivo ('-' lê a entrada padrão) e
+sai com 0 se todos passaram, 1 se algum tem erro (de execução, também) e 2 se algum não pôde
+ser lido (ou as opções são inválidas). Só importa o que a análise pedida
+usa, para partir rápido: nem argparse (que traz shutil, locale e gettext).
+"""
+import sys
+
+OPCOES = ("--tokens", "--erros", "--semantico", "--fluxo", "--bytecode", "--python", "--executar", "--relatorio")
+MOTORES = ("maquina", "python")
+
+
+class Opcoes:
+    def __init__(self):
+        self.tokens = self.erros = self.semantico = self.fluxo = False
+        self.bytecode = self.python = self.executar = self.relatorio = False
+        self.motor = "maquina"
+        self.nivel = 0
+        self.passos = None
+        self.cache = None
+        self.arquivos = []
+
+
+def ler_opcoes(argv):
+    """Opcoes da linha de comando; ValueError com a mensagem se forem inválidas."""
+    opcoes = Opcoes()
+    argumentos = iter(argv[1:])
+    for argumento in argumentos:
+        if argumento in OPCOES:
+            setattr(opcoes, argumento[2:], True)
+        elif argumento == "--cache":
+            opcoes.cache = next(argumentos, None)
+            if opcoes.cache is None:
+                raise ValueError("--cache precisa de uma pasta")
+        elif argumento == "--motor":
+            opcoes.motor = next(argumentos, None)
+            if opcoes.motor not in MOTORES:
+                raise ValueError(f"--motor precisa de um motor entre: {', '.join(MOTORES)}")
+        elif argumento.startswith("-O") and argumento[2:].isdigit():
+            opcoes.nivel = int(argumento[2:])
+        elif argumento == "--passos":
+            passos = next(argumentos, None)
+            if passos is None:
+                raise ValueError("--passos precisa de uma lista de passos")
+            opcoes.passos = tuple(p for p in passos.split(",") if p)
+        elif argumento.startswith("-") and argumento != "-":
+            raise ValueError(f"opção desconhecida: {argumento}")
+        else:
+            opcoes.arquivos.append(argumento)
+    if not opcoes.arquivos:
+        raise ValueError("nenhum arquivo para analisar")
+    if opcoes.fluxo and (opcoes.tokens or opcoes.erros or opcoes.semantico or opcoes.cache):
+        raise ValueError("--fluxo não guarda os tokens: não combina com --tokens, --erros, --semantico nem --cache")
+    if (opcoes.bytecode or opcoes.python or opcoes.executar) and (opcoes.fluxo or opcoes.erros):
+        raise ValueError("--bytecode, --python e --executar não combinam com --fluxo nem --erros")
+    if (opcoes.nivel or opcoes.passos is not None or opcoes.relatorio) and not (
+            opcoes.bytecode or opcoes.python or opcoes.executar):
+        raise ValueError("-O, --passos e --relatorio só valem com --bytecode, --python ou --executar")
+    return opcoes
+
+
+def ler(caminho):
+    if caminho == "-":
+        return sys.stdin.read()
+    with open(caminho, encoding="utf-8") as f:
+        return f.read()
+
+
+def mostrar_tokens(tokens):
+    for i in range(len(tokens)):
+        print(f"  {tokens.linha(i)}:{tokens.coluna_ini(i)}\t{tokens.codigo(i)}\t{tokens.lexema(i)}")
+
+
+def analisar_arquivo(caminho, args, sintatico, cache, passos=()):
+    """Analisa um arquivo e mostra o resultado; devolve se passou."""
+    if args.fluxo:
+        if caminho == "-":
+            sucesso, mensagem, _ = sintatico.analisar_fluxo(sys.stdin)
+        else:
+            with open(caminho, encoding="utf-8") as f:
+                sucesso, mensagem, _ = sintatico.analisar_fluxo(f)
+        print(f"{caminho}: {mensagem}")
+        return sucesso
+
+    texto = ler(caminho)
+    if cache is not None:
+        resultado = cache.analisar(texto)
+        tokens, erro = resultado.tokens, resultado.erro_lexico
+    else:
+        tokens, erro = sintatico.tokenizar(texto)
+    if erro:
+        print(f"{caminho}: {erro}")
+        return False
+    if args.tokens:
+        mostrar_tokens(tokens)
+    if args.bytecode or args.python or args.executar:
+        return executar_tokens(caminho, tokens, args, sintatico, passos)
+
+    erros_semanticos = []
+    if args.semantico:
+        # A tabela de símbolos é montada na própria análise sintática
+        sucesso, mensagem, erros_semanticos, _ = sintatico.analisar_semantico(tokens)
+    elif cache is not None:
+        sucesso, mensagem = resultado.sucesso, resultado.mensagem
+    else:
+        sucesso, mensagem, _ = sintatico.analisar(tokens, rastro="nenhum")
+    for erro_semantico in erros_semanticos:
+        print(f"{caminho}: {erro_semantico}")
+
+    if args.erros and not sucesso:
+        _, erros = sintatico.analisar_recuperando(tokens)
+        for erro_sintatico in erros:
+            print(f"{caminho}: {erro_sintatico}")
+        return False
+    print(f"{caminho}: {mensagem}")
+    return sucesso and not erros_semanticos
+
+
+def executar_tokens(caminho, tokens, args, sintatico, passos):
+    """
+    Compila os tokens para a máquina virtual e/ou para Python, mostra o
+    código e/ou executa no motor pedido; devolve se deu certo.
+    """
+    from .arvore_abstrata import ErroCompilacao, programa_dos_tokens
+    from .maquina_virtual import ErroExecucao
+    python = args.python or (args.executar and args.motor == "python")
+    maquina = args.bytecode or (args.executar and args.motor == "maquina")
+    try:
+        programa = programa_dos_tokens(tokens, sintatico)
+        efeitos = []
+        if passos:
+            from .otimizador import otimizar
+            efeitos += otimizar(programa, passos)
+        if maquina:
+            from .bytecode import compilar
+            objeto = compilar(programa)
+            if passos:
+                from .otimizador import otimizar_bytecode
+                efeitos += otimizar_bytecode(objeto, passos)
+        if python:
+            from .gerador_python import gerar_python
+            codigo_python = gerar_python(programa)
+    except ErroCompilacao as e:
+        print(f"{caminho}: {e}")
+        return False
+    if args.relatorio:
+        for efeito in efeitos:
+            print(f"{caminho}: {efeito}", file=sys.stderr)
+    if args.bytecode:
+        print(objeto.desmontar())
+    if args.python:
+        print(codigo_python.fonte, end="")
+    if args.executar:
+        try:
+            if args.motor == "python":
+                from .gerador_python import executar_python
+                executar_python(codigo_python)
+            else:
+                from .maquina_virtual import executar
+                executar(objeto)
+        except ErroExecucao as e:
+            sys.stdout.flush()
+            print(f"{caminho}: {e}", file=sys.stderr)
+            return False
+    return True
+
+
+def main(argv=None):
+    # Sem argv (o script `lalg` instalado pelo pacote), usa os da linha de comando
+    argv = sys.argv if argv is None else argv
+    if any(argumento in ("-h", "--help") for argumento in argv[1:]):
+        print(__doc__.strip())
+        return 0
+    try:
+        args = ler_opcoes(argv)
+    except ValueError as e:
+        print(f"python -m lalg: {e} (veja --help)", file=sys.stderr)
+        return 2
+
+    passos = ()
+    if args.passos is not None or args.nivel:
+        from .otimizador import PASSOS, passos_do_nivel
+        try:
+            passos = args.passos if args.passos is not None else passos_do_nivel(args.nivel)
+            desconhecidos = [p for p in passos if p not in PASSOS]
+            if desconhecidos:
+                raise ValueError(f"passo desconhecido: {', '.join(desconhecidos)} (passos: {', '.join(PASSOS)})")
+        except ValueError as e:
+            print(f"python -m lalg: {e} (veja --help)", file=sys.stderr)
+            return 2
+
+    from .analisador_sintatico import AnalisadorSintatico
+    sintatico = AnalisadorSintatico()
+    cache = None
+    if args.cache:
+        from .cache_resultados import CacheAnalise
+        cache = CacheAnalise(sintatico, pasta=args.cache)
+
+    codigo = 0
+    for caminho in args.arquivos:
+        try:
+            if not analisar_arquivo(caminho, args, sintatico, cache, passos):
+                codigo = max(codigo, 1)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"{caminho}: não foi possível ler: {e}", file=sys.stderr)
+            codigo = 2
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
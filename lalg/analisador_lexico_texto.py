@@ -0,0 +1,559 @@
+import re
+import string
+from functools import cached_property
+
+from .buffer_tokens import BufferTokens
+from .diagnosticos import (CARACTERE_INVALIDO, COMENTARIO_NAO_FECHADO, IDENTIFICADOR_LONGO, INTEIRO_MAL_FORMADO,
+                          OVERFLOW_INTEIRO, REAL_MAL_FORMADO, LimiteDeErros, ListaDiagnosticos)
+from .identificadores import SEM_SIMBOLO, TabelaIdentificadores
+from .tipos_token import (CODIGO_DO_TIPO, SIMPLES, TIPO_DUPLO, TIPO_RESERVADA,
+                         TIPO_SIMPLES, TipoToken)
+
+LIMITE_INTEIRO = 2147483647
+LIMITE_IDENTIFICADOR = 255
+
+# Tabelas pré-computadas do motor compilado (lexema -> código do token)
+CODIGO_SIMPLES = {c: CODIGO_DO_TIPO[t] for c, t in TIPO_SIMPLES.items()}
+CODIGO_DUPLO = {s: CODIGO_DO_TIPO[t] for s, t in TIPO_DUPLO.items()}
+CODIGO_RESERVADA = {p: CODIGO_DO_TIPO[t] for p, t in TIPO_RESERVADA.items()}
+# Códigos dos tokens de número e de identificador, da mesma tabela
+CODIGO_INTEIRO = CODIGO_DO_TIPO[TipoToken.NUMERO_INTEIRO]
+CODIGO_REAL = CODIGO_DO_TIPO[TipoToken.NUMERO_REAL]
+CODIGO_IDENTIFICADOR = CODIGO_DO_TIPO[TipoToken.IDENTIFICADOR]
+
+# Tipos como int puro: no laço do motor compilado evita o custo do IntEnum
+TIPO_INTEIRO = int(TipoToken.NUMERO_INTEIRO)
+TIPO_REAL = int(TipoToken.NUMERO_REAL)
+TIPO_IDENTIFICADOR = int(TipoToken.IDENTIFICADOR)
+
+# Mesmas quebras de linha reconhecidas por str.splitlines()
+QUEBRA = r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+NAO_QUEBRA = r"[^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]"
+
+# Padrão mestre: espaços iniciais seguidos de uma alternativa por classe de
+# lexema, na mesma ordem de prioridade do motor clássico. O número do grupo
+# (m.lastindex) indica a classe; espaços nunca geram uma iteração própria.
+(G_QUEBRA, G_COMENTARIO_LINHA, G_COMENTARIO_BLOCO, G_BLOCO_ABERTO,
+ G_DUPLO, G_REAL, G_REAL_MAL_FORMADO, G_INTEIRO, G_IDENTIFICADOR,
+ G_SIMPLES, G_INVALIDO, G_FIM) = range(1, 13)
+
+PADRAO_MESTRE = re.compile(
+    r"[ \t]*(?:"
+    rf"({QUEBRA})"
+    rf"|(//{NAO_QUEBRA}*)"
+    rf"|(/\*.*?\*/{NAO_QUEBRA}*)"  # após o fechamento o resto da linha é ignorado
+    r"|(/\*)"
+    r"|(<>|>=|<=|:=)"
+    r"|([0-9]+\.[0-9]+)"
+    r"|([0-9]+\.)"
+    r"|([0-9]+)"
+    r"|([A-Za-z][A-Za-z0-9_]*)"
+    r"|([()*/+\-><=$;:,.])"
+    r"|(.)"
+    r"|(\Z))",
+    re.DOTALL,
+)
+PADRAO_QUEBRA = re.compile(QUEBRA)
+
+MOTORES = ("classico", "compilado", "paralelo")
+
+# Tamanho (em caracteres) de cada leitura feita por iter_tokens
+TAMANHO_BLOCO = 64 * 1024
+
+# Estados do varredor entre um bloco de entrada e o próximo
+NORMAL, EM_COMENTARIO, RESTO_DA_LINHA = range(3)
+
+
+def contar_quebras(texto, de=0, ate=None):
+    """Número de quebras de linha (no sentido de str.splitlines) em texto[de:ate]."""
+    if ate is None:
+        ate = len(texto)
+    n = texto.count("\n", de, ate) + texto.count("\r", de, ate) - texto.count("\r\n", de, ate)
+    for c in "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029":
+        n += texto.count(c, de, ate)
+    return n
+
+
+def contar_linhas(texto):
+    """len(texto.splitlines()), sem montar a lista de linhas."""
+    if not texto:
+        return 0
+    return contar_quebras(texto) + (0 if PADRAO_QUEBRA.match(texto[-1]) else 1)
+
+
+def varrer_colunar(texto, de, ate, num_linha, tokens, erros):
+    """
+    Núcleo do motor compilado: varre texto[de:ate], que começa no início da
+    linha num_linha, gravando os tokens nas colunas de tokens (BufferTokens,
+    com offsets relativos ao texto inteiro) e os erros em erros
+    (ListaDiagnosticos, que interrompe a varredura ao atingir o limite).
+    Os identificadores são internados em tokens.identificadores.
+    Devolve True se parou num comentário /* sem "*/" antes de ate.
+    """
+    tipos = tokens.tipos.append
+    inicios = tokens.inicios.append
+    fins = tokens.fins.append
+    linhas = tokens.linhas.append
+    colunas = tokens.colunas.append
+    simbolos = tokens.simbolos.append
+    ids = tokens.identificadores.ids
+    buscar_id = ids.get
+
+    inicio_linha = de  # offset do primeiro caractere da linha atual
+    simbolo = SEM_SIMBOLO
+
+    for m in PADRAO_MESTRE.finditer(texto, de, ate):
+        grupo = m.lastindex
+
+        if grupo == G_IDENTIFICADOR:
+            ini, fim = m.span(grupo)
+            if fim - ini > LIMITE_IDENTIFICADOR:
+                erros.reportar(IDENTIFICADOR_LONGO, num_linha, ini - inicio_linha + 1, fim - inicio_linha)
+                continue
+            ident = m[grupo]
+            tipo = TIPO_RESERVADA.get(ident)
+            if tipo is None:
+                tipos(TIPO_IDENTIFICADOR)
+                simbolo = buscar_id(ident)
+                if simbolo is None:
+                    simbolo = ids[ident] = len(ids)
+            else:
+                tipos(tipo)
+
+        elif grupo == G_SIMPLES:
+            ini, fim = m.span(grupo)
+            tipos(TIPO_SIMPLES[texto[ini]])
+
+        elif grupo == G_QUEBRA:
+            num_linha += 1
+            inicio_linha = m.end()
+            continue
+
+        elif grupo == G_INTEIRO:
+            ini, fim = m.span(grupo)
+            if fim - ini >= 10 and int(m[grupo]) > LIMITE_INTEIRO:
+                erros.reportar(OVERFLOW_INTEIRO, num_linha, ini - inicio_linha + 1, fim - inicio_linha, m[grupo])
+                continue
+            tipos(TIPO_INTEIRO)
+
+        elif grupo == G_DUPLO:
+            ini, fim = m.span(grupo)
+            tipos(TIPO_DUPLO[m[grupo]])
+
+        elif grupo == G_REAL:
+            ini, fim = m.span(grupo)
+            tipos(TIPO_REAL)
+
+        elif grupo == G_COMENTARIO_LINHA or grupo == G_FIM:
+            continue
+
+        elif grupo == G_COMENTARIO_BLOCO:
+            # O comentário pode atravessar linhas: avança a contagem
+            for q in PADRAO_QUEBRA.finditer(texto, m.start(grupo), m.end()):
+                num_linha += 1
+                inicio_linha = q.end()
+            continue
+
+        elif grupo == G_REAL_MAL_FORMADO:
+            ini, fim = m.span(grupo)
+            erros.reportar(REAL_MAL_FORMADO, num_linha, ini - inicio_linha + 1, fim - inicio_linha)
+            continue
+
+        elif grupo == G_BLOCO_ABERTO:
+            return True
+
+        else:
+            ini = m.start(grupo) - inicio_linha + 1
+            erros.reportar(CARACTERE_INVALIDO, num_linha, ini, ini, m[grupo])
+            continue
+
+        inicios(ini)
+        fins(fim)
+        linhas(num_linha)
+        colunas(ini - inicio_linha + 1)
+        simbolos(simbolo)
+        simbolo = SEM_SIMBOLO
+
+    return False
+
+
+class AnalisadorLexicoTexto:
+    def __init__(self, texto="", motor="classico", max_erros=None):
+        """
+        max_erros limita quantos erros são reportados: atingido o limite a
+        varredura para ali mesmo e self.abortado fica True. Com max_erros=1
+        a análise para no primeiro erro (modo usado pelo sintático).
+        """
+        if motor not in MOTORES:
+            raise ValueError(f"Motor léxico desconhecido: {motor}")
+        if max_erros is not None and max_erros < 1:
+            raise ValueError(f"max_erros deve ser positivo: {max_erros}")
+        self.texto = texto
+        self.motor = motor
+        self.tokens = []
+        self.erros = ListaDiagnosticos(max_erros)
+        self.abortado = False
+        # Nomes dos identificadores, internados: cada um é guardado uma vez só
+        self.identificadores = TabelaIdentificadores()
+
+    @cached_property
+    def codigo(self):
+        # Só o motor clássico precisa do texto quebrado em linhas
+        return self.texto.splitlines()
+
+    def eh_simbolo_simples(self, c):
+        return c in SIMPLES
+
+    def token_simples(self, c):
+        return CODIGO_SIMPLES[c]
+
+    def eh_duplo(self, s):
+        return s in TIPO_DUPLO
+
+    def token_duplo(self, s):
+        return CODIGO_DUPLO[s]
+
+    def eh_reservada(self, palavra):
+        return palavra in TIPO_RESERVADA
+
+    def token_reservada(self, palavra):
+        return CODIGO_RESERVADA[palavra]
+
+    def eh_letra(self, c):
+        return c in string.ascii_letters
+
+    def eh_digito(self, c):
+        return c in "0123456789"
+
+    def analisar(self):
+        try:
+            if self.motor == "compilado":
+                self.analisar_compilado()
+            elif self.motor == "paralelo":
+                self.analisar_paralelo()
+            else:
+                self.analisar_classico()
+        except LimiteDeErros:
+            self.abortado = True
+
+    def analisar_classico(self):
+        LIMITE_INTEIRO = 2147483647
+        LIMITE_IDENTIFICADOR = 255
+
+        num_linha = 0
+        while num_linha < len(self.codigo):
+            linha = self.codigo[num_linha]
+            i = 0
+            tamanho = len(linha)
+            while i < tamanho:
+                c = linha[i]
+                prox = linha[i + 1] if i + 1 < tamanho else ""
+                coluna_ini = i + 1  # 1-based 
+
+
+                # Comentário por // (ignora o restante da linha)
+                if c == '/' and prox == '/':
+                    break  # ignora o restante da linha inteira
+
+                # Comentário por /* ... */
+                if c == '/' and prox == '*':
+                    i += 2
+                    fechado = False
+                    while num_linha < len(self.codigo):
+                        while i < len(linha):
+                            if linha[i] == '*' and i + 1 < len(linha) and linha[i + 1] == '/':
+                                i += 2
+                                fechado = True
+                                break
+                            i += 1
+                        if fechado:
+                            break
+                        num_linha += 1
+                        if num_linha < len(self.codigo):
+                            linha = self.codigo[num_linha]
+                            tamanho = len(linha)
+                            i = 0
+                    if not fechado:
+                        self.erros.reportar(COMENTARIO_NAO_FECHADO, num_linha + 1)
+                    break  # vai para a próxima linha
+                   
+                elif self.eh_duplo(c + prox):
+                    self.tokens.append((self.token_duplo(c + prox), c + prox, num_linha + 1, coluna_ini, coluna_ini + 1))
+                    i += 2
+                    continue
+
+                elif self.eh_simbolo_simples(c):
+                    self.tokens.append((self.token_simples(c), c, num_linha + 1, coluna_ini, coluna_ini))
+                    i += 1
+                    continue
+
+                elif self.eh_digito(c):
+                    num = c
+                    i += 1
+                    while i < tamanho and self.eh_digito(linha[i]):
+                        num += linha[i]
+                        i += 1
+                    is_real = False
+                    if i < tamanho and linha[i] == '.':
+                        num += '.'
+                        i += 1
+                        if i < tamanho and self.eh_digito(linha[i]):
+                            while i < tamanho and self.eh_digito(linha[i]):
+                                num += linha[i]
+                                i += 1
+                            is_real = True
+                            self.tokens.append((CODIGO_REAL, num, num_linha + 1, coluna_ini, coluna_ini + len(num) - 1))
+                        else:
+                            self.erros.reportar(REAL_MAL_FORMADO, num_linha + 1, coluna_ini, coluna_ini + len(num) - 1)
+                    elif not is_real:
+                        try:
+                            if int(num) > LIMITE_INTEIRO:
+                                self.erros.reportar(OVERFLOW_INTEIRO, num_linha + 1, coluna_ini, coluna_ini + len(num) - 1, num)
+                            else:
+                                self.tokens.append((CODIGO_INTEIRO, num, num_linha + 1, coluna_ini, coluna_ini + len(num) - 1))
+                        except ValueError:
+                            self.erros.reportar(INTEIRO_MAL_FORMADO, num_linha + 1, coluna_ini, coluna_ini + len(num) - 1, num)
+                    continue
+
+                elif self.eh_letra(c):
+                    ident = c
+                    i += 1
+                    while i < tamanho and (self.eh_letra(linha[i]) or self.eh_digito(linha[i]) or linha[i] == "_"):
+                        ident += linha[i]
+                        i += 1
+                    if len(ident) > LIMITE_IDENTIFICADOR:
+                        self.erros.reportar(IDENTIFICADOR_LONGO, num_linha + 1, coluna_ini, coluna_ini + len(ident) - 1)
+                        continue
+                    if self.eh_reservada(ident):
+                        tipo = self.token_reservada(ident)
+                    else:
+                        tipo = CODIGO_IDENTIFICADOR
+                        ident = self.identificadores.canonico(ident)
+                    self.tokens.append((tipo, ident, num_linha + 1, coluna_ini, coluna_ini + len(ident) - 1))
+                    continue
+
+                elif c in [' ', '\t', '\n', '\r']:
+                    i += 1
+                    continue
+
+                else:
+                    self.erros.reportar(CARACTERE_INVALIDO, num_linha + 1, coluna_ini, coluna_ini, c)
+                    i += 1
+
+            num_linha += 1
+
+    def analisar_paralelo(self, processos=None):
+        """
+        Motor paralelo: divide textos grandes em pedaços por linha e varre
+        cada um com o motor compilado num processo (ver lexico_paralelo).
+        Os identificadores são internados em self.identificadores.
+        """
+        if self.erros.max_erros is not None:
+            # Com limite de erros o objetivo é parar cedo: varre em sequência
+            return self.analisar_compilado()
+
+        from .lexico_paralelo import analisar_paralelo
+
+        self.tokens, self.erros = analisar_paralelo(self.texto, processos, self.identificadores)
+
+    def analisar_compilado(self):
+        """
+        Motor compilado: percorre o texto inteiro numa única passada do
+        PADRAO_MESTRE e grava os tokens direto nas colunas de um BufferTokens
+        (self.tokens), sem montar tuplas nem copiar lexemas, com o id de
+        cada identificador em self.identificadores na coluna simbolos.
+        Produz exatamente os mesmos tokens e erros do motor clássico.
+        """
+        self.tokens = BufferTokens(self.texto, self.identificadores)
+        if varrer_colunar(self.texto, 0, len(self.texto), 1, self.tokens, self.erros):
+            # Sem "*/" até o fim do texto: o motor clássico consome todas
+            # as linhas restantes e reporta a linha seguinte à última.
+            self.erros.reportar(COMENTARIO_NAO_FECHADO, contar_linhas(self.texto) + 1)
+
+    def iter_tokens(self, stream, tamanho_bloco=TAMANHO_BLOCO, tipos=False):
+        """
+        Gera os tokens de um arquivo aberto em modo texto à medida que são
+        reconhecidos, lendo-o em blocos de tamanho_bloco caracteres.
+        Os erros vão para self.erros. A memória usada é limitada ao bloco
+        atual mais o maior lexema (e os nomes distintos dos identificadores,
+        internados em self.identificadores), qualquer que seja o tamanho da
+        entrada. Como o texto não fica guardado, os tokens saem como 5-tuplas.
+        Com tipos=True o primeiro item é o tipo (TipoToken) em vez do código
+        tokNNN, para quem, como o sintático, só consulta tabelas por tipo.
+        """
+        return self._parar_no_limite(self._varrer(iter(lambda: stream.read(tamanho_bloco), ""), tipos))
+
+    def _parar_no_limite(self, tokens):
+        try:
+            yield from tokens
+        except LimiteDeErros:
+            self.abortado = True
+
+    def _varrer(self, blocos, tipos=False):
+        """
+        Varre uma sequência de blocos de texto com o PADRAO_MESTRE.
+        Um lexema que encosta no fim do bloco pode continuar no próximo, então
+        é guardado e varrido de novo junto com ele; comentários que atravessam
+        blocos são acompanhados pelo estado EM_COMENTARIO / RESTO_DA_LINHA.
+        """
+        # O primeiro item de cada token: o tipo ou o código de exibição
+        if tipos:
+            reservada, simples, duplo = TIPO_RESERVADA, TIPO_SIMPLES, TIPO_DUPLO
+            identificador, inteiro, real = TIPO_IDENTIFICADOR, TIPO_INTEIRO, TIPO_REAL
+        else:
+            reservada, simples, duplo = CODIGO_RESERVADA, CODIGO_SIMPLES, CODIGO_DUPLO
+            identificador, inteiro, real = CODIGO_IDENTIFICADOR, CODIGO_INTEIRO, CODIGO_REAL
+        erros = self.erros
+        quebras = PADRAO_QUEBRA.finditer
+        ids = self.identificadores.ids
+
+        buf = ""
+        pos = 0
+        estado = NORMAL
+        num_linha = 1
+        inicio_linha = 0  # offset (relativo a buf) do início da linha atual
+        blocos = iter(blocos)
+
+        while True:
+            bloco = next(blocos, None)
+            final = bloco is None
+            if not final:
+                if not bloco:
+                    continue
+                buf = buf[pos:] + bloco
+                inicio_linha -= pos
+                pos = 0
+            n = len(buf)
+
+            while True:
+                if estado == EM_COMENTARIO:
+                    fim = buf.find("*/", pos)
+                    if fim < 0:
+                        if final:
+                            # Conta as linhas como str.splitlines(): a última
+                            # só existe se não estiver vazia.
+                            for q in quebras(buf, pos):
+                                num_linha += 1
+                                inicio_linha = q.end()
+                            total = num_linha if inicio_linha < n else num_linha - 1
+                            erros.reportar(COMENTARIO_NAO_FECHADO, total + 1)
+                            return
+                        # Descarta o que já foi lido, guardando o último
+                        # caractere (pode ser o '*' de "*/") e um '\r' que
+                        # pode formar "\r\n" com o próximo bloco.
+                        corte = n - 1
+                        if corte > pos and buf[corte - 1] == "\r":
+                            corte -= 1
+                        if corte > pos:
+                            for q in quebras(buf, pos, corte):
+                                num_linha += 1
+                                inicio_linha = q.end()
+                            pos = corte
+                        break
+                    for q in quebras(buf, pos, fim):
+                        num_linha += 1
+                        inicio_linha = q.end()
+                    pos = fim + 2
+                    estado = RESTO_DA_LINHA
+
+                if estado == RESTO_DA_LINHA:
+                    q = PADRAO_QUEBRA.search(buf, pos)
+                    if q is None:
+                        pos = n
+                        break
+                    pos = q.start()
+                    estado = NORMAL
+
+                for m in PADRAO_MESTRE.finditer(buf, pos):
+                    grupo = m.lastindex
+
+                    if m.end() == n and not final and grupo != G_FIM:
+                        # O lexema pode continuar no próximo bloco
+                        if grupo == G_COMENTARIO_LINHA or grupo == G_COMENTARIO_BLOCO:
+                            for q in quebras(buf, m.start(grupo), n):
+                                num_linha += 1
+                                inicio_linha = q.end()
+                            estado = RESTO_DA_LINHA
+                            pos = n
+                        elif grupo == G_BLOCO_ABERTO:
+                            estado = EM_COMENTARIO
+                            pos = n
+                        else:
+                            pos = m.start(grupo)
+                        break
+
+                    if grupo == G_IDENTIFICADOR:
+                        ident = m[grupo]
+                        if len(ident) > LIMITE_IDENTIFICADOR:
+                            ini = m.start(grupo) - inicio_linha + 1
+                            erros.reportar(IDENTIFICADOR_LONGO, num_linha, ini, ini + len(ident) - 1)
+                            continue
+                        ini = m.start(grupo) - inicio_linha + 1
+                        codigo = reservada.get(ident)
+                        if codigo is None:
+                            codigo = identificador
+                            if ident not in ids:
+                                ids[ident] = len(ids)
+                        yield (codigo, ident, num_linha, ini, ini + len(ident) - 1)
+
+                    elif grupo == G_SIMPLES:
+                        c = m[grupo]
+                        ini = m.start(grupo) - inicio_linha + 1
+                        yield (simples[c], c, num_linha, ini, ini)
+
+                    elif grupo == G_QUEBRA:
+                        num_linha += 1
+                        inicio_linha = m.end()
+
+                    elif grupo == G_INTEIRO:
+                        num = m[grupo]
+                        if len(num) >= 10 and int(num) > LIMITE_INTEIRO:
+                            ini = m.start(grupo) - inicio_linha + 1
+                            erros.reportar(OVERFLOW_INTEIRO, num_linha, ini, ini + len(num) - 1, num)
+                            continue
+                        ini = m.start(grupo) - inicio_linha + 1
+                        yield (inteiro, num, num_linha, ini, ini + len(num) - 1)
+
+                    elif grupo == G_DUPLO:
+                        d = m[grupo]
+                        ini = m.start(grupo) - inicio_linha + 1
+                        yield (duplo[d], d, num_linha, ini, ini + 1)
+
+                    elif grupo == G_REAL:
+                        num = m[grupo]
+                        ini = m.start(grupo) - inicio_linha + 1
+                        yield (real, num, num_linha, ini, ini + len(num) - 1)
+
+                    elif grupo == G_COMENTARIO_LINHA:
+                        continue
+
+                    elif grupo == G_FIM:
+                        pos = n
+                        break
+
+                    elif grupo == G_COMENTARIO_BLOCO:
+                        # O comentário pode atravessar linhas: avança a contagem
+                        for q in quebras(buf, m.start(grupo), m.end()):
+                            num_linha += 1
+                            inicio_linha = q.end()
+
+                    elif grupo == G_REAL_MAL_FORMADO:
+                        ini = m.start(grupo) - inicio_linha + 1
+                        erros.reportar(REAL_MAL_FORMADO, num_linha, ini, m.end(grupo) - inicio_linha)
+
+                    elif grupo == G_BLOCO_ABERTO:
+                        # Nenhum "*/" no que já foi lido: segue procurando
+                        # nos próximos blocos (ou reporta o erro no fim).
+                        estado = EM_COMENTARIO
+                        pos = m.end()
+                        break
+
+                    else:
+                        ini = m.start(grupo) - inicio_linha + 1
+                        erros.reportar(CARACTERE_INVALIDO, num_linha, ini, ini, m[grupo])
+
+                if estado != EM_COMENTARIO:
+                    break
+
+            if final:
+                return
@@ -0,0 +1,714 @@
+import io
+from array import array
+from functools import lru_cache
+
+from .analisador_lexico_texto import TAMANHO_BLOCO, AnalisadorLexicoTexto
+from .gramatica import ARQUIVO_GRAMATICA, PASTA_CACHE, carregar_tabela
+from .tabela_compilada import compilar
+from .tipos_token import TERMINAL_DO_TIPO
+
+# Níveis de rastro de analisar(): só validar, log compacto de ações ou a
+# lista de passos completa (pilha + entrada restante a cada passo)
+RASTRO_NENHUM = "nenhum"
+RASTRO_ACOES = "acoes"
+RASTRO_COMPLETO = "completo"
+RASTROS = (RASTRO_NENHUM, RASTRO_ACOES, RASTRO_COMPLETO)
+
+# Motores de analisar(): o laço com pilha sobre a tabela compilada ou o
+# analisador descendente recursivo gerado da mesma tabela (só valida)
+MOTOR_TABELA = "tabela"
+MOTOR_DESCENDENTE = "descendente"
+MOTORES = (MOTOR_TABELA, MOTOR_DESCENDENTE)
+
+# Códigos do log de ações; a expansão pela produção k é gravada como
+# PRIMEIRA_PRODUCAO + k
+CONSUMIR = 0
+REMOVER_EPSILON = 1
+PRIMEIRA_PRODUCAO = 2
+
+
+# A cada quantos passos o rastro guarda uma cópia da pilha
+INTERVALO_CHECKPOINT = 256
+
+# Tokens da entrada restante mostrados em cada passo (descrever_entrada)
+TOKENS_DESCRITOS = 20
+
+MENSAGEM_SUCESSO = "Análise sintática bem-sucedida!"
+
+# Lexema, linha e coluna do marcador de fim nas mensagens de erro
+FIM_SEM_POSICAO = ('$', 0, 0)
+
+
+@lru_cache(maxsize=None)
+def tabela_da_gramatica(caminho, pasta_cache=PASTA_CACHE):
+    """
+    Tabela da gramática em caminho, na forma de dicionário (a legível, para
+    mensagens e exportação) e compilada. Compartilhada entre os analisadores
+    do processo.
+    """
+    dados = carregar_tabela(caminho, TERMINAL_DO_TIPO, pasta_cache)
+    compilada = compilar(dados['terminais'], dados['nao_terminais'], dados['tabela'],
+                         TERMINAL_DO_TIPO, simbolo_inicial=dados['inicial'])
+    return dados, compilada
+
+
+@lru_cache(maxsize=None)
+def descendente_da_gramatica(caminho, pasta_cache=PASTA_CACHE):
+    """
+    Módulo do analisador descendente gerado da tabela da gramática em
+    caminho, ou None se não foi possível gravá-lo em pasta_cache.
+    """
+    from .gerador_descendente import carregar_modulo
+    return carregar_modulo(*tabela_da_gramatica(caminho, pasta_cache), pasta_cache)
+
+
+class ErroSintatico:
+    """
+    Um erro sintático de analisar_recuperando(): índice, linha e coluna do
+    token em que foi detectado (o fim da entrada tem linha e coluna 0) e a
+    mensagem, a mesma que analisar() devolveria. str(erro) é a mensagem.
+    """
+
+    __slots__ = ("indice", "linha", "coluna", "mensagem")
+
+    def __init__(self, indice, linha, coluna, mensagem):
+        self.indice = indice
+        self.linha = linha
+        self.coluna = coluna
+        self.mensagem = mensagem
+
+    def __str__(self):
+        return self.mensagem
+
+    def __repr__(self):
+        return f"<ErroSintatico linha {self.linha}, coluna {self.coluna}>"
+
+
+class RastroAcoes:
+    """
+    Rastro compacto de uma análise: um inteiro por passo (CONSUMIR,
+    REMOVER_EPSILON ou PRIMEIRA_PRODUCAO + id da produção expandida) num
+    array, mais o desfecho. Funciona como uma sequência de passos no formato
+    completo de analisar() ({'pilha', 'entrada', 'acao'}), com len(),
+    índices e fatias, sem guardar os passos: a pilha é copiada só a cada
+    `intervalo` passos (checkpoints, montados no primeiro acesso aleatório)
+    e o passo i é refeito a partir do checkpoint anterior em O(intervalo).
+    """
+
+    def __init__(self, tokens, compilada, acoes, sucesso, mensagem, intervalo=INTERVALO_CHECKPOINT):
+        self.tokens = tokens
+        self.producoes = compilada.producoes  # id -> (nao_terminal, producao)
+        # A pilha do primeiro passo: o marcador de fim e o símbolo inicial da gramática
+        self.pilha_inicial = (compilada.nomes[compilada.fim], compilada.nomes[compilada.inicio])
+        self.acoes = acoes
+        self.sucesso = sucesso
+        self.mensagem = mensagem
+        self.intervalo = intervalo
+        self.checkpoints = None  # checkpoints[k] = (pilha, idx) antes do passo k * intervalo
+
+    def __len__(self):
+        # Um passo por ação, mais o passo final (sucesso ou erro)
+        return len(self.acoes) + 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            inicio, fim, passo = i.indices(len(self))
+            if passo != 1:
+                raise ValueError("Fatias de passos não aceitam passo")
+            return list(self._gerar(inicio, fim))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Índice de passo fora do intervalo")
+        return next(self._gerar(i, i + 1))
+
+    def __iter__(self):
+        return self._gerar(0, len(self))
+
+    def __repr__(self):
+        return f"<RastroAcoes: {len(self)} passos>"
+
+    def passos(self):
+        """A lista de passos no formato completo de analisar()."""
+        return list(self)
+
+    def _aplicar(self, pilha, idx, acao):
+        """Aplica uma ação à pilha; devolve o novo índice na entrada."""
+        pilha.pop()
+        if acao == CONSUMIR:
+            return idx + 1
+        if acao != REMOVER_EPSILON:
+            _, producao = self.producoes[acao - PRIMEIRA_PRODUCAO]
+            pilha.extend(simbolo for simbolo in reversed(producao) if simbolo != 'ε')
+        return idx
+
+    def _montar_checkpoints(self):
+        # O que cada código de ação empilha depois de desempilhar o topo
+        empilha = [(), ()] + [tuple(s for s in reversed(producao) if s != 'ε') for _, producao in self.producoes]
+        intervalo = self.intervalo
+        pilha = list(self.pilha_inicial)
+        idx = 0
+        checkpoints = []
+        for passo, acao in enumerate(self.acoes):
+            if passo % intervalo == 0:
+                checkpoints.append((tuple(pilha), idx))
+            pilha.pop()
+            if acao == CONSUMIR:
+                idx += 1
+            else:
+                pilha.extend(empilha[acao])
+        if len(self.acoes) % intervalo == 0:
+            checkpoints.append((tuple(pilha), idx))
+        self.checkpoints = checkpoints
+
+    def _gerar(self, inicio, fim):
+        """Gera os passos inicio..fim-1, partindo do checkpoint mais próximo."""
+        if inicio >= fim:
+            return
+        if inicio < self.intervalo:
+            # Do começo não é preciso checkpoint: a pilha inicial é conhecida
+            primeiro, pilha, idx = 0, list(self.pilha_inicial), 0
+        else:
+            if self.checkpoints is None:
+                self._montar_checkpoints()
+            k = inicio // self.intervalo
+            pilha, idx = self.checkpoints[k]
+            primeiro, pilha = k * self.intervalo, list(pilha)
+
+        tokens = self.tokens
+        acoes = self.acoes
+        for passo in range(primeiro, fim):
+            if passo == len(acoes):
+                if self.sucesso:
+                    yield {'pilha': [], 'entrada': [], 'acao': "Análise concluída com sucesso!"}
+                else:
+                    yield {'pilha': pilha.copy(), 'entrada': tokens[idx:], 'acao': f"ERRO: {self.mensagem}"}
+                return
+            acao = acoes[passo]
+            if passo >= inicio:
+                if acao == CONSUMIR:
+                    descricao = f"Consumir {tokens.lexema(idx) if idx < len(tokens) else '$'}"
+                elif acao == REMOVER_EPSILON:
+                    descricao = "Remover ε"
+                else:
+                    topo, producao = self.producoes[acao - PRIMEIRA_PRODUCAO]
+                    descricao = f"Expandir {topo} -> {' '.join(producao)}"
+                yield {'pilha': pilha.copy(), 'entrada': tokens[idx:], 'acao': descricao}
+            idx = self._aplicar(pilha, idx, acao)
+
+
+class AnalisadorSintatico:
+    def __init__(self, gramatica=ARQUIVO_GRAMATICA, pasta_cache=PASTA_CACHE):
+        # Terminais, não-terminais e tabela LL(1) vêm de gramatica.bnf; a
+        # tabela é gerada uma vez e depois só lida do cache em disco, em
+        # pasta_cache (onde também fica o analisador descendente gerado)
+        self.gramatica = str(gramatica)
+        self.pasta_cache = pasta_cache
+        dados, self.compilada = tabela_da_gramatica(self.gramatica, pasta_cache)
+        self.terminais = dados['terminais']
+        self.nao_terminais = dados['nao_terminais']
+        self.tabela = dados['tabela']
+        self.conflitos = dados['conflitos']
+        self.producoes = self.compilada.producoes
+    
+    def tokenizar(self, entrada):
+        """
+        Executa o analisador léxico e devolve seus tokens num BufferTokens
+        (colunas de inteiros + offsets no texto), sem montar uma segunda lista.
+        O tipo de cada token (TipoToken) indexa TERMINAL_DO_TIPO, que dá o
+        terminal da gramática; o marcador de fim '$' fica implícito após o último token.
+        Só o primeiro erro léxico é usado, então a varredura para nele
+        (max_erros=1) e o erro volta como um Diagnostico.
+        """
+        analisador_lexico = AnalisadorLexicoTexto(entrada, motor="compilado", max_erros=1)
+        analisador_lexico.analisar()
+        
+        if analisador_lexico.erros:
+            return None, analisador_lexico.erros[0]
+        
+        return analisador_lexico.tokens, None
+    
+    def descrever_entrada(self, entrada, limite=TOKENS_DESCRITOS):
+        """
+        Texto "terminal:valor ..." da entrada restante de um passo: os
+        primeiros limite tokens e "…" se houver mais, ou até o marcador de
+        fim '$'. O custo não depende do tamanho da entrada, então descrever
+        cada passo de uma página (ou de uma exportação) fica linear nos passos.
+        Lê as colunas do buffer, sem montar tuplas.
+        """
+        if isinstance(entrada, list):
+            return ""  # passo final: a entrada já foi toda consumida
+        tokens = entrada.buffer
+        tipos = tokens.tipos
+        fim = min(entrada.fim, entrada.inicio + limite)
+        partes = [f"{TERMINAL_DO_TIPO[tipos[i]]}:{tokens.lexema(i)}" for i in range(entrada.inicio, fim)]
+        partes.append("…" if fim < entrada.fim else "$:$")
+        return ' '.join(partes)
+    
+    def analisar(self, tokens, rastro=RASTRO_COMPLETO, motor=MOTOR_TABELA):
+        """
+        Análise preditiva LL(1) dos tokens. Devolve (sucesso, mensagem, passos),
+        onde passos depende do nível de rastro:
+          RASTRO_NENHUM   - None: só valida, sem guardar nada por passo;
+          RASTRO_ACOES    - um RastroAcoes, com um inteiro por passo;
+          RASTRO_COMPLETO - a lista de passos {'pilha', 'entrada', 'acao'},
+                            refeita a partir do rastro de ações.
+        A análise em si é linear no número de passos em todos os níveis.
+        MOTOR_DESCENDENTE usa o analisador descendente recursivo gerado
+        (gerador_descendente.py), com o mesmo resultado do laço com pilha;
+        como não registra passos, só aceita RASTRO_NENHUM.
+        """
+        if rastro not in RASTROS:
+            raise ValueError(f"Nível de rastro desconhecido: {rastro}")
+        if motor not in MOTORES:
+            raise ValueError(f"Motor sintático desconhecido: {motor}")
+        
+        if motor == MOTOR_DESCENDENTE:
+            if rastro != RASTRO_NENHUM:
+                raise ValueError("O motor descendente só valida: use rastro=RASTRO_NENHUM")
+            return (*self._analisar_descendente(tokens), None)
+        
+        acoes = array('H') if rastro != RASTRO_NENHUM else None
+        sucesso, mensagem = self._analisar(tokens, acoes)
+        
+        if rastro == RASTRO_NENHUM:
+            return sucesso, mensagem, None
+        registro = RastroAcoes(tokens, self.compilada, acoes, sucesso, mensagem)
+        if rastro == RASTRO_ACOES:
+            return sucesso, mensagem, registro
+        return sucesso, mensagem, registro.passos()
+    
+    def _analisar(self, tokens, acoes):
+        """Laço da análise; grava uma ação por passo em acoes (se não for None)."""
+        c = self.compilada
+        n_terminais = c.n_terminais
+        limite_nao_terminais = c.limite_nao_terminais
+        deslocamento = n_terminais * n_terminais  # linha do não-terminal nt começa em nt*n - deslocamento
+        celulas = c.celulas
+        empilhar = c.empilhar
+        terminal_do_tipo = c.terminal_do_tipo
+        fim = c.fim
+        tipos = tokens.tipos
+        total = len(tokens)
+        registrar = acoes.append if acoes is not None else None
+        
+        # Inicializa a pilha com o símbolo de início e de fim
+        pilha = [fim, c.inicio]
+        token_atual_idx = 0
+        token_atual = terminal_do_tipo[tipos[0]] if total else fim
+        
+        while pilha:
+            # Em caso de erro a análise termina: não é preciso devolver o topo
+            topo = pilha.pop()
+            
+            # Se o topo da pilha é um terminal
+            if topo < n_terminais:
+                if topo != token_atual:
+                    return False, self._mensagem_erro(tokens, token_atual_idx, topo)
+                token_atual_idx += 1
+                token_atual = terminal_do_tipo[tipos[token_atual_idx]] if token_atual_idx < total else fim
+                if registrar:
+                    registrar(CONSUMIR)
+            
+            # Se o topo da pilha é um não-terminal
+            elif topo < limite_nao_terminais:
+                producao = celulas[topo * n_terminais + token_atual - deslocamento]
+                if producao < 0:
+                    return False, self._mensagem_erro(tokens, token_atual_idx, topo)
+                # A produção já está invertida e sem ε
+                pilha.extend(empilhar[producao])
+                if registrar:
+                    registrar(PRIMEIRA_PRODUCAO + producao)
+            else:
+                return False, self._mensagem_erro(tokens, token_atual_idx, topo)
+        
+        return self._desfecho(tokens, token_atual_idx)
+    
+    def analisar_fluxo(self, fonte, tamanho_bloco=None):
+        """
+        Léxico e sintático fundidos numa só passada, sem rastro: fonte é um
+        arquivo aberto em modo texto (ou uma str) e o laço da tabela puxa os
+        tokens um a um do gerador do léxico (AnalisadorLexicoTexto.iter_tokens,
+        que já dá o tipo de cada token), que lê a fonte em blocos. Nenhum token é guardado, então a memória
+        fica limitada ao bloco lido e à pilha, qualquer que seja o número de
+        tokens; num erro sintático a leitura e a varredura param ali mesmo.
+        Devolve (sucesso, mensagem, erro_lexico), com erro_lexico o
+        Diagnostico do primeiro erro léxico (e mensagem o seu texto) ou None.
+        As mensagens são as de tokenizar() + analisar(), exceto que um erro
+        léxico depois de um erro sintático não chega a ser visto.
+        """
+        if isinstance(fonte, str):
+            fonte = io.StringIO(fonte)
+        lexico = AnalisadorLexicoTexto(motor="compilado", max_erros=1)
+        proximo_token = lexico.iter_tokens(fonte, tamanho_bloco or TAMANHO_BLOCO, tipos=True).__next__
+        
+        c = self.compilada
+        n_terminais = c.n_terminais
+        limite_nao_terminais = c.limite_nao_terminais
+        deslocamento = n_terminais * n_terminais
+        celulas = c.celulas
+        empilhar = c.empilhar
+        fim = c.fim
+        terminal_do_tipo = c.terminal_do_tipo
+        
+        def avancar():
+            """O próximo token e seu terminal; (None, fim) quando o léxico acaba."""
+            try:
+                token = proximo_token()
+            except StopIteration:
+                return None, fim
+            return token, terminal_do_tipo[token[0]]
+        
+        def falha(simbolo):
+            # O léxico pode ter parado num erro antes do token esperado
+            if token is None and lexico.erros:
+                return False, str(lexico.erros[0]), lexico.erros[0]
+            _, valor, linha, coluna, _ = token if token is not None else (None, *FIM_SEM_POSICAO, None)
+            return False, self._formatar_erro(simbolo, valor, linha, coluna), None
+        
+        pilha = [fim, c.inicio]
+        token, token_atual = avancar()
+        
+        while pilha:
+            topo = pilha.pop()
+            if topo < n_terminais:
+                if topo != token_atual:
+                    return falha(topo)
+                token, token_atual = avancar()
+            elif topo < limite_nao_terminais:
+                producao = celulas[topo * n_terminais + token_atual - deslocamento]
+                if producao < 0:
+                    return falha(topo)
+                pilha.extend(empilhar[producao])
+            else:
+                return falha(topo)
+        
+        # O marcador de fim foi consumido: sobrou algum token?
+        if token is not None:
+            return False, self._mensagem_restante(token[1], token[2]), None
+        if lexico.erros:
+            return False, str(lexico.erros[0]), lexico.erros[0]
+        return True, MENSAGEM_SUCESSO, None
+    
+    def analisar_arvore(self, tokens):
+        """
+        Analisa os tokens montando a árvore sintática compacta
+        (arvore_sintatica.ArvoreSintatica) durante a análise. Devolve
+        (sucesso, mensagem, arvore), com arvore None se houve erro.
+        """
+        from .arvore_sintatica import FECHAR, FOLHA, ArvoreSintatica
+        
+        c = self.compilada
+        n_terminais = c.n_terminais
+        deslocamento = n_terminais * n_terminais
+        celulas = c.celulas
+        empilhar = c.empilhar
+        terminal_do_tipo = c.terminal_do_tipo
+        fim = c.fim
+        tipos = tokens.tipos
+        total = len(tokens)
+        
+        # Colunas da árvore, em pós-ordem. Ao expandir um não-terminal, seus
+        # dados vão para `abertos` e um FECHAR vai para a pilha abaixo da
+        # produção; quando o FECHAR chega ao topo os filhos já foram
+        # emitidos, e o nó só é emitido se tiver mais de um filho (sem filhos,
+        # tudo foi ε; com um só, o filho o representa).
+        arvore = ArvoreSintatica(c.nomes, n_terminais, tokens)
+        simbolos, producoes, indices, inicios = arvore.simbolos, arvore.producoes, arvore.tokens, arvore.inicios
+        novo_simbolo, nova_producao, novo_indice, novo_inicio = simbolos.append, producoes.append, indices.append, inicios.append
+        abertos = []
+        abrir, fechar = abertos.append, abertos.pop
+        
+        pilha = [fim, c.inicio]
+        token_atual_idx = 0
+        token_atual = terminal_do_tipo[tipos[0]] if total else fim
+        
+        while pilha:
+            topo = pilha.pop()
+            
+            if topo == FECHAR:
+                simbolo, producao, idx, inicio = fechar()
+                n = len(simbolos)
+                if n > inicio and inicios[n - 1] != inicio:
+                    novo_simbolo(simbolo)
+                    nova_producao(producao)
+                    novo_indice(idx)
+                    novo_inicio(inicio)
+            
+            elif topo < n_terminais:
+                if topo != token_atual:
+                    return False, self._mensagem_erro(tokens, token_atual_idx, topo), None
+                if token_atual_idx < total:  # o marcador de fim não vira folha
+                    novo_inicio(len(simbolos))
+                    novo_simbolo(topo)
+                    nova_producao(FOLHA)
+                    novo_indice(token_atual_idx)
+                token_atual_idx += 1
+                token_atual = terminal_do_tipo[tipos[token_atual_idx]] if token_atual_idx < total else fim
+            
+            elif topo < c.limite_nao_terminais:
+                producao = celulas[topo * n_terminais + token_atual - deslocamento]
+                if producao < 0:
+                    return False, self._mensagem_erro(tokens, token_atual_idx, topo), None
+                simbolos_producao = empilhar[producao]
+                if simbolos_producao:
+                    abrir((topo, producao, token_atual_idx, len(simbolos)))
+                    pilha.append(FECHAR)
+                    pilha.extend(simbolos_producao)
+            else:
+                return False, self._mensagem_erro(tokens, token_atual_idx, topo), None
+        
+        sucesso, mensagem = self._desfecho(tokens, token_atual_idx)
+        return sucesso, mensagem, arvore if sucesso else None
+    
+    def analisar_semantico(self, tokens):
+        """
+        Análise sintática com a verificação de declarações na mesma passada:
+        cada id consumido é declarado ou procurado numa TabelaSimbolos
+        (semantico.py), conforme o contexto em que aparece. Devolve
+        (sucesso, mensagem, erros, tabela): sucesso e mensagem são os de
+        analisar(), erros é a lista de ErroSemantico (ids não declarados e
+        declarados duas vezes no mesmo escopo) até o fim da análise ou o
+        primeiro erro sintático, e tabela fica com o escopo global.
+        O contexto vem de semantico.MODO_DO_NAO_TERMINAL: ao expandir um
+        desses não-terminais o modo muda e um marcador na pilha, abaixo da
+        produção, o restaura quando a subárvore termina (como o FECHAR de
+        analisar_arvore). O escopo de procedimentos e funções também fecha
+        por um marcador.
+        """
+        from .semantico import (CONSTANTE, FUNCAO, IGNORADO, JA_DECLARADO, NAO_DECLARADO, PARAMETRO, TIPO_DO_TERMINAL,
+                               USO, VARIAVEL, ErroSemantico, TabelaSimbolos, compilar_regras,
+                               mensagem_ja_declarado, mensagem_nao_declarado)
+        
+        c = self.compilada
+        n_terminais = c.n_terminais
+        limite_nao_terminais = c.limite_nao_terminais
+        deslocamento = n_terminais * n_terminais
+        celulas = c.celulas
+        empilhar = c.empilhar
+        terminal_do_tipo = c.terminal_do_tipo
+        fim = c.fim
+        tipos = tokens.tipos
+        total = len(tokens)
+        regras = compilar_regras(c)
+        terminal_id = c.ids['id']
+        tipo_do_terminal = {c.ids[t]: tipo for t, tipo in TIPO_DO_TERMINAL.items() if t in c.ids}
+        
+        # Marcadores na pilha (os símbolos são todos >= 0)
+        FECHAR_ESCOPO = -1
+        RESTAURAR_MODO = -2
+        
+        tabela = TabelaSimbolos(tokens.identificadores)
+        declarar = tabela.declarar
+        visiveis = tabela.simbolos  # id -> declarações visíveis (só ids com alguma)
+        simbolos = tokens.simbolos  # id de cada identificador, dado pelo léxico
+        erros = []
+        modo = USO
+        modos = []  # modos a restaurar, um por RESTAURAR_MODO na pilha
+        pendentes = []  # variáveis e parâmetros à espera do tipo (var a, b: integer)
+        declarado = None  # constante ou função à espera do tipo (do número ou de retorno)
+        
+        pilha = [fim, c.inicio]
+        token_atual_idx = 0
+        token_atual = terminal_do_tipo[tipos[0]] if total else fim
+        
+        while pilha:
+            topo = pilha.pop()
+            
+            if topo < 0:
+                if topo == RESTAURAR_MODO:
+                    modo = modos.pop()
+                else:
+                    tabela.fechar_escopo()
+            
+            elif topo < n_terminais:
+                if topo != token_atual:
+                    return False, self._mensagem_erro(tokens, token_atual_idx, topo), erros, tabela
+                if topo == terminal_id:
+                    if modo is USO:
+                        if simbolos[token_atual_idx] not in visiveis:
+                            linha, coluna = tokens.linha(token_atual_idx), tokens.coluna_ini(token_atual_idx)
+                            nome = tokens.lexema(token_atual_idx)
+                            erros.append(ErroSemantico(NAO_DECLARADO, token_atual_idx, linha, coluna,
+                                                       mensagem_nao_declarado(nome, linha, coluna)))
+                    elif modo is not IGNORADO:
+                        linha, coluna = tokens.linha(token_atual_idx), tokens.coluna_ini(token_atual_idx)
+                        simbolo, anterior = declarar(simbolos[token_atual_idx], modo, linha, coluna)
+                        if anterior is not None:
+                            nome = tokens.lexema(token_atual_idx)
+                            erros.append(ErroSemantico(JA_DECLARADO, token_atual_idx, linha, coluna,
+                                                       mensagem_ja_declarado(nome, anterior, linha, coluna)))
+                        elif modo is VARIAVEL or modo is PARAMETRO:
+                            pendentes.append(simbolo)
+                        elif modo is CONSTANTE or modo is FUNCAO:
+                            declarado = simbolo
+                elif topo in tipo_do_terminal and modo is not USO and modo is not IGNORADO:
+                    # O tipo de uma constante é o do número; o de retorno vem
+                    # direto em DC_FUNC; os de var e dos parâmetros, depois da
+                    # lista de nomes
+                    if modo is CONSTANTE or modo is FUNCAO:
+                        if declarado is not None:
+                            declarado.tipo = tipo_do_terminal[topo]
+                            declarado = None
+                    else:
+                        for simbolo in pendentes:
+                            simbolo.tipo = tipo_do_terminal[topo]
+                        pendentes.clear()
+                token_atual_idx += 1
+                token_atual = terminal_do_tipo[tipos[token_atual_idx]] if token_atual_idx < total else fim
+            
+            elif topo < limite_nao_terminais:
+                producao = celulas[topo * n_terminais + token_atual - deslocamento]
+                if producao < 0:
+                    return False, self._mensagem_erro(tokens, token_atual_idx, topo), erros, tabela
+                regra = regras[topo]
+                if regra is not None:
+                    novo_modo, abre, fecha = regra
+                    if fecha:
+                        pilha.append(FECHAR_ESCOPO)
+                    if novo_modo is not None and novo_modo is not modo:
+                        pilha.append(RESTAURAR_MODO)
+                        modos.append(modo)
+                        modo = novo_modo
+                    if abre:
+                        tabela.abrir_escopo()
+                pilha.extend(empilhar[producao])
+            else:
+                return False, self._mensagem_erro(tokens, token_atual_idx, topo), erros, tabela
+        
+        sucesso, mensagem = self._desfecho(tokens, token_atual_idx)
+        return sucesso, mensagem, erros, tabela
+    
+    def analisar_recuperando(self, tokens, max_erros=None):
+        """
+        Análise com recuperação de erros em modo pânico: em vez de parar no
+        primeiro erro, sincroniza e continua, numa só passada. Devolve
+        (sucesso, erros), com a lista de ErroSintatico em ordem; o primeiro
+        é o erro que analisar() devolveria. Ao atingir max_erros a análise
+        para.
+        A sincronização usa as entradas da própria tabela: depois de um erro,
+        a análise retoma no símbolo mais próximo do topo da pilha que aceita
+        o token atual (o terminal igual a ele, ou um não-terminal com
+        produção para ele), desempilhando os que estão acima; é o FOLLOW
+        real daquele ponto da análise. Se nenhum aceita, o token é
+        descartado. O '$' no fundo da pilha sempre aceita o fim da entrada.
+        Um erro no mesmo token do erro anterior é consequência dele e não é
+        reportado.
+        """
+        c = self.compilada
+        n_terminais = c.n_terminais
+        limite_nao_terminais = c.limite_nao_terminais
+        deslocamento = n_terminais * n_terminais
+        celulas = c.celulas
+        empilhar = c.empilhar
+        terminal_do_tipo = c.terminal_do_tipo
+        fim = c.fim
+        tipos = tokens.tipos
+        total = len(tokens)
+        
+        erros = []
+        ultimo_erro = -1
+        pilha = [fim, c.inicio]
+        token_atual_idx = 0
+        token_atual = terminal_do_tipo[tipos[0]] if total else fim
+        
+        while pilha:
+            topo = pilha.pop()
+            
+            if topo < n_terminais:
+                if topo == token_atual:
+                    token_atual_idx += 1
+                    token_atual = terminal_do_tipo[tipos[token_atual_idx]] if token_atual_idx < total else fim
+                    continue
+            elif topo < limite_nao_terminais:
+                producao = celulas[topo * n_terminais + token_atual - deslocamento]
+                if producao >= 0:
+                    pilha.extend(empilhar[producao])
+                    continue
+            
+            if token_atual_idx != ultimo_erro:
+                ultimo_erro = token_atual_idx
+                erros.append(self._erro(tokens, token_atual_idx, self._mensagem_erro(tokens, token_atual_idx, topo)))
+                if len(erros) == max_erros:
+                    return False, erros
+            
+            # Sincroniza no símbolo mais próximo do topo que aceita o token.
+            # O símbolo do erro volta para a pilha: depois de descartar
+            # tokens, ele pode ser o que aceita o novo token.
+            pilha.append(topo)
+            while True:
+                for posicao in range(len(pilha) - 1, -1, -1):
+                    simbolo = pilha[posicao]
+                    if simbolo == token_atual or (n_terminais <= simbolo < limite_nao_terminais and
+                                                  celulas[simbolo * n_terminais + token_atual - deslocamento] >= 0):
+                        break
+                else:
+                    posicao = -1
+                if posicao >= 0:
+                    break
+                # Ninguém aceita o token: descarta-o
+                token_atual_idx += 1
+                token_atual = terminal_do_tipo[tipos[token_atual_idx]] if token_atual_idx < total else fim
+            del pilha[posicao + 1:]
+        
+        sucesso, mensagem = self._desfecho(tokens, token_atual_idx)
+        if not sucesso and token_atual_idx != ultimo_erro:
+            erros.append(self._erro(tokens, token_atual_idx, mensagem))
+        return not erros, erros
+    
+    def _erro(self, tokens, idx, mensagem):
+        _, linha, coluna = self._posicao(tokens, idx)
+        return ErroSintatico(idx, linha, coluna, mensagem)
+    
+    def _analisar_descendente(self, tokens):
+        """
+        Análise pelo módulo descendente gerado. Entradas aninhadas além do
+        limite de recursão do Python são refeitas pelo laço com pilha
+        explícita, que não tem limite de profundidade; o mesmo laço atende
+        quando o módulo não pôde ser gravado na pasta do cache.
+        """
+        from .gerador_descendente import FIM_DA_ENTRADA
+        
+        descendente = descendente_da_gramatica(self.gramatica, self.pasta_cache)
+        if descendente is None:
+            return self._analisar(tokens, None)
+        # Um byte por token (uma lista custaria 8 e seria só ~5% mais rápida)
+        k = tokens.tipos.tobytes() + bytes((FIM_DA_ENTRADA,))
+        try:
+            idx = descendente.analisar(k)
+        except descendente.Falha as falha:
+            return False, self._mensagem_erro(tokens, *falha.args)
+        except RecursionError:
+            return self._analisar(tokens, None)
+        return self._desfecho(tokens, idx)
+    
+    def _desfecho(self, tokens, idx):
+        """Resultado depois de consumir o marcador de fim no token idx - 1."""
+        if idx >= len(tokens):
+            return True, MENSAGEM_SUCESSO
+        return False, self._mensagem_restante(tokens.lexema(idx), tokens.linha(idx))
+    
+    def _mensagem_restante(self, lexema, linha):
+        return f"Erro sintático: entrada não foi completamente analisada. Token restante: {lexema} na linha {linha}"
+    
+    def _mensagem_erro(self, tokens, idx, simbolo):
+        """Mensagem do erro ao esperar o símbolo (id compilado) no token idx."""
+        return self._formatar_erro(simbolo, *self._posicao(tokens, idx))
+    
+    def _formatar_erro(self, simbolo, token_valor, token_linha, token_coluna_ini):
+        """Mensagem do erro ao esperar o símbolo diante do token na posição dada."""
+        c = self.compilada
+        nome = c.nomes[simbolo]
+        if simbolo < c.n_terminais:
+            return f"Erro sintático: esperado '{nome}', encontrado '{token_valor}' na linha {token_linha}, coluna {token_coluna_ini}"
+        if simbolo < c.limite_nao_terminais:
+            # Verifica quais tokens são esperados para esse não-terminal
+            esperados = list(self.tabela.get(nome, {}).keys())
+            return f"Erro sintático na linha {token_linha}, coluna {token_coluna_ini}: não há produção para {nome} com entrada {token_valor}. Esperado: {', '.join(esperados)}"
+        return f"Erro sintático: símbolo desconhecido na pilha '{nome}'"
+    
+    def _posicao(self, tokens, idx):
+        """Lexema, linha e coluna do token idx ('$', 0, 0 no fim da entrada)."""
+        if idx >= len(tokens):
+            return FIM_SEM_POSICAO
+        return tokens.lexema(idx), tokens.linha(idx), tokens.coluna_ini(idx)
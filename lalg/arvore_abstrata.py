@@ -0,0 +1,505 @@
+# Tipos dos valores. char é guardado como inteiro (o código do caractere)
+INTEGER = "integer"
+REAL = "real"
+CHAR = "char"
+
+# Relações das condições e operadores das expressões, pelo lexema
+RELACOES = ("=", "<>", "<", "<=", ">", ">=")
+OPERADORES = ("+", "-", "*", "/")
+
+
+class ErroCompilacao(Exception):
+    """Programa que não pode ser compilado. str(erro) é a mensagem; linha e coluna são 0 se não houver."""
+
+    def __init__(self, mensagem, linha=0, coluna=0):
+        super().__init__(mensagem)
+        self.mensagem = mensagem
+        self.linha = linha
+        self.coluna = coluna
+
+
+class No:
+    """Base dos nós da árvore abstrata: cada subclasse lista seus campos em __slots__."""
+
+    __slots__ = ()
+
+    def __init__(self, *valores):
+        for campo, valor in zip(self.__slots__, valores):
+            setattr(self, campo, valor)
+
+    def __repr__(self):
+        campos = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.__slots__ if campo != "linha")
+        return f"{type(self).__name__}({campos})"
+
+
+# Declarações
+
+class Variavel(No):
+    """
+    Variável, constante, parâmetro ou resultado de função: nome, tipo, se é
+    local de uma rotina, índice entre as globais ou entre os locais da
+    rotina, valor inicial (o da constante, ou zero) e se é constante.
+    """
+
+    __slots__ = ("nome", "tipo", "local", "indice", "inicial", "constante")
+
+    def __repr__(self):
+        return f"<Variavel {self.nome}: {self.tipo}>"
+
+
+class Rotina(No):
+    """
+    Procedimento ou função: índice, parâmetros (os primeiros dos locais),
+    todos os locais, tipo de retorno (None num procedimento), a variável do
+    resultado (uma global com o nome da função) e os comandos do corpo.
+    """
+
+    __slots__ = ("nome", "indice", "parametros", "locais", "retorno", "resultado", "corpo", "linha")
+
+    def __repr__(self):
+        return f"<Rotina {self.nome}/{len(self.parametros)}>"
+
+
+class Programa(No):
+    """Raiz da árvore abstrata: nome, variáveis globais, rotinas e comandos do corpo principal."""
+
+    __slots__ = ("nome", "globais", "rotinas", "corpo")
+
+
+# Expressões: todas têm tipo
+
+class Constante(No):
+    __slots__ = ("valor", "tipo")
+
+
+class Acesso(No):
+    """Valor de uma Variavel."""
+
+    __slots__ = ("variavel", "tipo")
+
+
+class Negacao(No):
+    __slots__ = ("operando", "tipo")
+
+
+class Binaria(No):
+    """Operação aritmética; '/' entre inteiros é a divisão inteira (truncada em direção a zero)."""
+
+    __slots__ = ("operador", "esquerda", "direita", "tipo")
+
+
+class ParaReal(No):
+    """Conversão de um inteiro para real (atribuição ou argumento real)."""
+
+    __slots__ = ("operando", "tipo")
+
+
+class Condicao(No):
+    __slots__ = ("relacao", "esquerda", "direita")
+
+
+# Comandos: todos têm a linha do programa de onde vieram
+
+class Atribuicao(No):
+    __slots__ = ("destino", "valor", "linha")
+
+
+class Leitura(No):
+    __slots__ = ("destinos", "linha")
+
+
+class Escrita(No):
+    __slots__ = ("valores", "linha")
+
+
+class Se(No):
+    __slots__ = ("condicao", "entao", "senao", "linha")
+
+
+class Enquanto(No):
+    __slots__ = ("condicao", "corpo", "linha")
+
+
+class Repita(No):
+    __slots__ = ("corpo", "condicao", "linha")
+
+
+class Para(No):
+    """for variavel := inicio to limite: limite é o num_int, um int."""
+
+    __slots__ = ("variavel", "inicio", "limite", "corpo", "linha")
+
+
+class Chamada(No):
+    __slots__ = ("rotina", "argumentos", "linha")
+
+
+def dividir_inteiro(a, b):
+    """a / b entre inteiros, truncada em direção a zero (ZeroDivisionError se b = 0)."""
+    q = a // b
+    if q < 0 and q * b != a:
+        q += 1
+    return q
+
+
+def valor_inicial(tipo):
+    return 0.0 if tipo == REAL else 0
+
+
+def percorrer(comandos):
+    """Os comandos e todos os aninhados neles (corpos de laço, ramos do if), sem recursão."""
+    pendentes = list(reversed(comandos))
+    while pendentes:
+        c = pendentes.pop()
+        yield c
+        tipo = type(c)
+        if tipo is Se:
+            pendentes.extend(reversed(c.senao))
+            pendentes.extend(reversed(c.entao))
+        elif tipo is Enquanto or tipo is Repita or tipo is Para:
+            pendentes.extend(reversed(c.corpo))
+
+
+def atribuidas(comandos):
+    """Variáveis atribuídas pelos comandos, aninhados inclusive: atribuição, read ou for."""
+    for c in percorrer(comandos):
+        tipo = type(c)
+        if tipo is Atribuicao or tipo is Para:
+            yield c.destino if tipo is Atribuicao else c.variavel
+        elif tipo is Leitura:
+            yield from c.destinos
+
+
+class _Construtor:
+    """
+    Percorre a ArvoreSintatica compacta e monta a árvore abstrata, resolvendo
+    os nomes e os tipos. Como a árvore omite os nós que só derivaram ε e os
+    de um filho só, os comandos e expressões são reconhecidos pelo nome do
+    nó e pelos terminais dos filhos; declarações e listas de ids são lidas
+    direto da sequência de folhas (os tokens, em ordem).
+    """
+
+    def __init__(self, arvore):
+        self.arvore = arvore
+        self.globais = {}  # nome -> Variavel ou Rotina
+        self.locais = None  # idem, dentro de uma rotina
+        self.rotina = None
+        self.lista_globais = []
+        self.rotinas = []
+
+    # Acesso à árvore
+
+    def nome(self, n):
+        return self.arvore.nome(n)
+
+    def folha(self, n, terminal=None):
+        arvore = self.arvore
+        return arvore.eh_folha(n) and (terminal is None or arvore.nome(n) == terminal)
+
+    def lexema(self, n):
+        return self.arvore.lexema(n)
+
+    def filhos(self, n):
+        return self.arvore.filhos(n)
+
+    def folhas(self, n):
+        """Folhas da subárvore de n, na ordem dos tokens (a pós-ordem as mantém em ordem)."""
+        arvore = self.arvore
+        return [k for k in range(arvore.inicios[n], n + 1) if arvore.eh_folha(k)]
+
+    def posicao(self, n):
+        fonte, token = self.arvore.fonte, self.arvore.tokens[n]
+        return fonte.linha(token), fonte.coluna_ini(token)
+
+    def linha(self, n):
+        return self.arvore.fonte.linha(self.arvore.tokens[n])
+
+    def erro(self, texto, n):
+        linha, coluna = self.posicao(n)
+        return ErroCompilacao(f"Erro de compilação: {texto} na linha {linha}, coluna {coluna}", linha, coluna)
+
+    def cadeia(self, n, nome):
+        """n e os nós nome encadeados como último filho (DC_V ::= ... DC_V)."""
+        while n is not None:
+            yield n
+            ultimo = self.filhos(n)[-1]
+            n = ultimo if not self.folha(ultimo) and self.nome(ultimo) == nome else None
+
+    # Programa e declarações
+
+    def programa(self):
+        raiz = self.arvore.raiz
+        filhos = self.filhos(raiz)
+        nome = self.lexema(filhos[1])
+        corpo = self.corpo(filhos[3], self.globais, self.lista_globais)
+        return Programa(nome, self.lista_globais, self.rotinas, corpo)
+
+    def corpo(self, n, escopo, variaveis):
+        """CORPO ou CORPO_P: declarações até o begin, depois os comandos."""
+        filhos = self.filhos(n)
+        inicio = next(i for i, f in enumerate(filhos) if self.folha(f, "begin"))
+        for declaracao in filhos[:inicio]:
+            partes = self.filhos(declaracao) if self.nome(declaracao) in ("DC", "DC_LOC") else [declaracao]
+            for parte in partes:
+                self.declaracoes(parte, escopo, variaveis)
+        meio = filhos[inicio + 1]
+        return [] if self.folha(meio, "end") else self.comandos(meio)
+
+    def declaracoes(self, n, escopo, variaveis):
+        nome = self.nome(n)
+        if nome == "DC_C":
+            folhas = self.folhas(n)
+            for i in range(0, len(folhas), 5):  # const id = NUMERO ;
+                id_, numero = folhas[i + 1], folhas[i + 3]
+                constante = self.numero(numero)
+                self.declarar(id_, escopo, Variavel(self.lexema(id_), constante.tipo, escopo is self.locais,
+                                                      len(variaveis), constante.valor, True), variaveis)
+        elif nome == "DC_V":
+            self.variaveis(self.folhas(n), escopo, variaveis)
+        elif nome == "DC_P" or nome == "DC_FUNC":
+            for rotina in self.cadeia(n, nome):
+                self.declarar_rotina(rotina, nome == "DC_FUNC")
+
+    def variaveis(self, folhas, escopo, variaveis):
+        """Lê 'a, b : integer' (com 'var' e ';' em volta) das folhas; devolve as Variavel declaradas."""
+        declaradas = []
+        pendentes = []
+        for f in folhas:
+            terminal = self.nome(f)
+            if terminal == "id":
+                pendentes.append(f)
+            elif terminal in (INTEGER, REAL, CHAR):
+                for id_ in pendentes:
+                    variavel = Variavel(self.lexema(id_), terminal, escopo is self.locais, len(variaveis),
+                                        valor_inicial(terminal), False)
+                    self.declarar(id_, escopo, variavel, variaveis)
+                    declaradas.append(variavel)
+                pendentes = []
+        return declaradas
+
+    def declarar(self, id_, escopo, simbolo, lista=None):
+        nome = self.lexema(id_)
+        if nome in escopo:
+            raise self.erro(f"identificador '{nome}' já declarado neste escopo", id_)
+        escopo[nome] = simbolo
+        if lista is not None:
+            lista.append(simbolo)
+
+    def declarar_rotina(self, n, funcao):
+        # procedure id [PARAMETROS] ; CORPO_P [DC_P]
+        # function id [PARAMETROS] : TIPO_VAR ; CORPO_P [DC_FUNC]
+        filhos = self.filhos(n)
+        id_ = filhos[1]
+        parametros = filhos[2] if not self.folha(filhos[2]) and self.nome(filhos[2]) == "PARAMETROS" else None
+        resto = filhos[3:] if parametros is not None else filhos[2:]
+        retorno = self.nome(resto[1]) if funcao else None
+        corpo_p = next(f for f in resto if not self.folha(f) and self.nome(f) == "CORPO_P")
+
+        rotina = Rotina(self.lexema(id_), len(self.rotinas), [], [], retorno, None, [], self.linha(n))
+        self.declarar(id_, self.globais, rotina)
+        self.rotinas.append(rotina)
+
+        self.locais, self.rotina = {}, rotina
+        if parametros is not None:
+            rotina.parametros = self.variaveis(self.folhas(parametros), self.locais, rotina.locais)
+        if funcao:
+            # Como a gramática só chama rotinas como comando, o resultado fica
+            # numa global com o nome da função: atribuída dentro dela e lida
+            # por quem a chamou (e pela própria função, depois de uma chamada
+            # recursiva)
+            rotina.resultado = Variavel(rotina.nome, retorno, False, len(self.lista_globais),
+                                        valor_inicial(retorno), False)
+            self.lista_globais.append(rotina.resultado)
+            self.declarar(id_, self.locais, rotina.resultado)
+        rotina.corpo = self.corpo(corpo_p, self.locais, rotina.locais)
+        self.locais, self.rotina = None, None
+
+    # Nomes
+
+    def buscar(self, id_):
+        nome = self.lexema(id_)
+        if self.locais is not None and nome in self.locais:
+            return self.locais[nome]
+        if nome in self.globais:
+            return self.globais[nome]
+        raise self.erro(f"identificador '{nome}' não declarado", id_)
+
+    def variavel(self, id_, escrita):
+        simbolo = self.buscar(id_)
+        if isinstance(simbolo, Rotina):
+            if simbolo.resultado is None:
+                raise self.erro(f"'{simbolo.nome}' é um procedimento, não uma variável", id_)
+            if escrita:
+                raise self.erro(f"o resultado de '{simbolo.nome}' só é atribuído dentro dela", id_)
+            return simbolo.resultado  # o último resultado da função
+        if escrita and simbolo.constante:
+            raise self.erro(f"'{simbolo.nome}' é uma constante", id_)
+        return simbolo
+
+    def rotina_chamada(self, id_):
+        simbolo = self.buscar(id_)
+        if self.rotina is not None and simbolo is self.rotina.resultado:
+            return self.rotina  # chamada recursiva da função
+        if not isinstance(simbolo, Rotina):
+            raise self.erro(f"'{simbolo.nome}' não é um procedimento nem uma função", id_)
+        return simbolo
+
+    # Comandos
+
+    def comandos(self, n):
+        """COMANDOS (CMD ; COMANDOS), sem recursão: a lista pode ser longa."""
+        lista = []
+        for elo in self.cadeia(n, "COMANDOS"):
+            lista.extend(self.comando(self.filhos(elo)[0]))
+        return lista
+
+    def comando(self, n):
+        """Lista de comandos de um CMD (um begin ... end devolve os seus)."""
+        if self.folha(n, "id"):
+            return [self.chamada(n, None)]  # procedimento sem argumentos
+        filhos = self.filhos(n)
+        primeiro = filhos[0]
+        inicial = self.nome(primeiro) if self.folha(primeiro) else None
+        linha = self.linha(n)
+
+        if inicial == "id":
+            resto = filhos[1]
+            if self.nome(resto) == "CMD_CONT":  # id := EXPRESSAO
+                destino = self.variavel(primeiro, True)
+                valor = self.expressao(self.filhos(resto)[1])
+                return [Atribuicao(destino, self.converter(valor, destino.tipo, primeiro), linha)]
+            return [self.chamada(primeiro, resto)]
+        if inicial == "read":
+            destinos = [self.variavel(f, True) for f in self.folhas(n) if self.folha(f, "id")]
+            return [Leitura(destinos, linha)]
+        if inicial == "write":
+            valores = []
+            for f in self.folhas(n):
+                if self.folha(f, "id"):
+                    variavel = self.variavel(f, False)
+                    valores.append(Acesso(variavel, variavel.tipo))
+            return [Escrita(valores, linha)]
+        if inicial == "while":  # while ( CONDICAO ) do CMD
+            return [Enquanto(self.condicao(filhos[2]), self.comando(filhos[5]), linha)]
+        if inicial == "if":  # if CONDICAO then CMD [PFALSA]
+            senao = self.comando(self.filhos(filhos[4])[1]) if len(filhos) > 4 else []
+            return [Se(self.condicao(filhos[1]), self.comando(filhos[3]), senao, linha)]
+        if inicial == "begin":  # begin [COMANDOS] end
+            return self.comandos(filhos[1]) if len(filhos) > 2 else []
+        if inicial == "repeat":  # repeat [COMANDOS] until CONDICAO
+            corpo = self.comandos(filhos[1]) if len(filhos) > 3 else []
+            return [Repita(corpo, self.condicao(filhos[-1]), linha)]
+        if inicial == "for":  # for id := EXPRESSAO to num_int do begin [COMANDOS] end
+            variavel = self.variavel(filhos[1], True)
+            if variavel.tipo != INTEGER:
+                raise self.erro(f"a variável do for, '{variavel.nome}', deve ser integer", filhos[1])
+            inicio = self.expressao(filhos[3])
+            if inicio.tipo == REAL:
+                raise self.erro("o início do for deve ser inteiro", filhos[3])
+            limite = self.numero(filhos[5]).valor
+            corpo = self.comandos(filhos[8]) if len(filhos) > 9 else []
+            return [Para(variavel, inicio, limite, corpo, linha)]
+        raise self.erro("comando não reconhecido", n)
+
+    def chamada(self, id_, lista_arg):
+        rotina = self.rotina_chamada(id_)
+        argumentos = [] if lista_arg is None else [f for f in self.folhas(lista_arg) if self.folha(f, "id")]
+        if len(argumentos) != len(rotina.parametros):
+            raise self.erro(f"'{rotina.nome}' espera {len(rotina.parametros)} argumento(s), "
+                            f"recebeu {len(argumentos)}", id_)
+        valores = []
+        for argumento, parametro in zip(argumentos, rotina.parametros):
+            variavel = self.variavel(argumento, False)
+            valores.append(self.converter(Acesso(variavel, variavel.tipo), parametro.tipo, argumento))
+        return Chamada(rotina, valores, self.linha(id_))
+
+    def converter(self, valor, tipo, n):
+        """valor como tipo: inteiro vira real; real não vira inteiro (erro)."""
+        if tipo == REAL:
+            return valor if valor.tipo == REAL else ParaReal(valor, REAL)
+        if valor.tipo == REAL:
+            raise self.erro(f"valor real atribuído a {tipo}", n)
+        return valor
+
+    # Expressões
+
+    def condicao(self, n):
+        esquerda, relacao, direita = self.filhos(n)
+        return Condicao(self.nome(relacao), self.expressao(esquerda), self.expressao(direita))
+
+    def numero(self, n):
+        if self.nome(n) == "num_int":
+            return Constante(int(self.lexema(n)), INTEGER)
+        return Constante(float(self.lexema(n)), REAL)
+
+    def expressao(self, n):
+        """EXPRESSAO, TERMO ou FATOR (ou um nó que os representa, depois da compactação)."""
+        if self.folha(n):
+            if self.nome(n) == "id":
+                variavel = self.variavel(n, False)
+                return Acesso(variavel, variavel.tipo)
+            return self.numero(n)
+        nome = self.nome(n)
+        filhos = self.filhos(n)
+        if nome == "FATOR":  # ( EXPRESSAO )
+            return self.expressao(filhos[1])
+        if nome == "EXPRESSAO":  # [OP_UN] TERMO [OUTROS_TERMOS]
+            if self.folha(filhos[0]) and self.nome(filhos[0]) in ("+", "-"):
+                valor = self.expressao(filhos[1])
+                if self.nome(filhos[0]) == "-":
+                    valor = Negacao(valor, REAL if valor.tipo == REAL else INTEGER)
+                filhos = filhos[1:]
+            else:
+                valor = self.expressao(filhos[0])
+            return self.operacoes(valor, filhos[1] if len(filhos) > 1 else None, "OUTROS_TERMOS")
+        if nome == "TERMO":  # FATOR MAIS_FATORES
+            return self.operacoes(self.expressao(filhos[0]), filhos[1], "MAIS_FATORES")
+        if nome in ("OUTROS_TERMOS", "MAIS_FATORES"):
+            raise self.erro("expressão incompleta", n)
+        raise self.erro(f"expressão não reconhecida ({nome})", n)
+
+    def operacoes(self, valor, n, nome):
+        """Aplica, da esquerda para a direita, os 'op operando' da cadeia nome (OUTROS_TERMOS ou MAIS_FATORES)."""
+        if n is None:
+            return valor
+        for elo in self.cadeia(n, nome):
+            operador, operando = self.filhos(elo)[:2]
+            direita = self.expressao(operando)
+            tipo = REAL if REAL in (valor.tipo, direita.tipo) else INTEGER
+            valor = Binaria(self.nome(operador), valor, direita, tipo)
+        return valor
+
+
+def construir(arvore):
+    """
+    Árvore abstrata (Programa) de uma ArvoreSintatica com fonte, de um
+    programa sem erros sintáticos. Levanta ErroCompilacao para nomes não
+    declarados ou usados fora da sua categoria e tipos incompatíveis.
+    """
+    return _Construtor(arvore).programa()
+
+
+def programa_dos_tokens(tokens, sintatico):
+    """
+    Árvore abstrata de um BufferTokens sem erro léxico: análise sintática
+    com a tabela de símbolos (analisar_semantico) e árvore. O primeiro erro
+    sintático ou semântico vira ErroCompilacao.
+    """
+    sucesso, mensagem, erros, _ = sintatico.analisar_semantico(tokens)
+    if erros:
+        raise ErroCompilacao(erros[0].mensagem, erros[0].linha, erros[0].coluna)
+    if not sucesso:
+        raise ErroCompilacao(mensagem)
+    _, _, arvore = sintatico.analisar_arvore(tokens)
+    return construir(arvore)
+
+
+def programa_do_texto(texto, sintatico=None):
+    """Árvore abstrata de um texto LALG; o erro léxico também vira ErroCompilacao."""
+    if sintatico is None:
+        from .analisador_sintatico import AnalisadorSintatico
+        sintatico = AnalisadorSintatico()
+    tokens, erro = sintatico.tokenizar(texto)
+    if erro is not None:
+        raise ErroCompilacao(str(erro), erro.linha, erro.coluna)
+    return programa_dos_tokens(tokens, sintatico)
@@ -0,0 +1,115 @@
+import struct
+from array import array
+
+# Produção dos nós-folha (tokens)
+FOLHA = -1
+
+# Marca na pilha do analisador: o nó aberto mais recente termina aqui
+FECHAR = -1
+
+# Cabeçalho de para_bytes(): marca, versão, número de nós, número de
+# terminais e tamanho dos nomes dos símbolos
+_CABECALHO = struct.Struct("<4sHIiI")
+_MARCA = b"LALG"
+_VERSAO = 2
+
+
+class ArvoreSintatica:
+    """
+    Árvore sintática compacta, em arrays paralelos indexados pelo nó, em
+    pós-ordem (os filhos vêm antes do pai; a raiz é o último nó):
+      simbolos[n]  - id do símbolo na tabela compilada (terminal = folha);
+      producoes[n] - id da produção expandida no nó, ou FOLHA;
+      tokens[n]    - índice do token da folha, ou do primeiro token do nó;
+      inicios[n]   - primeiro nó da subárvore de n (n, numa folha).
+    A subárvore de n ocupa inicios[n]..n; o último filho é n - 1 e o irmão
+    anterior de cada filho f é inicios[f] - 1. Não há ponteiros nem objetos
+    por nó: são 12 bytes por nó. A árvore é compacta: não-terminais que só
+    derivaram ε não viram nós e um não-terminal com um filho só é
+    representado pelo filho, então o número de nós fica perto do de tokens.
+    """
+
+    __slots__ = ("nomes", "n_terminais", "simbolos", "producoes", "tokens", "inicios", "fonte")
+
+    def __init__(self, nomes, n_terminais, fonte=None):
+        self.nomes = nomes
+        self.n_terminais = n_terminais
+        self.simbolos = array("h")
+        self.producoes = array("h")
+        self.tokens = array("i")
+        self.inicios = array("i")
+        self.fonte = fonte  # BufferTokens de onde vêm os tokens das folhas
+
+    def __len__(self):
+        return len(self.simbolos)
+
+    def __repr__(self):
+        return f"<ArvoreSintatica: {len(self)} nós>"
+
+    @property
+    def raiz(self):
+        return len(self.simbolos) - 1
+
+    def nome(self, n):
+        return self.nomes[self.simbolos[n]]
+
+    def eh_folha(self, n):
+        return self.simbolos[n] < self.n_terminais
+
+    def lexema(self, n):
+        """Texto do token da folha n (precisa de fonte)."""
+        return self.fonte.lexema(self.tokens[n])
+
+    def filhos(self, n):
+        """Lista dos filhos de n, em ordem."""
+        inicios = self.inicios
+        inicio = inicios[n]
+        filhos = []
+        filho = n - 1
+        while filho >= inicio:
+            filhos.append(filho)
+            filho = inicios[filho] - 1
+        filhos.reverse()
+        return filhos
+
+    def percorrer(self):
+        """(nó, profundidade) de todos os nós, em pré-ordem, sem recursão."""
+        if not self.simbolos:
+            return
+        pendentes = [(self.raiz, 0)]
+        while pendentes:
+            n, profundidade = pendentes.pop()
+            yield n, profundidade
+            pendentes.extend((filho, profundidade + 1) for filho in reversed(self.filhos(n)))
+
+    def formatar(self):
+        """Texto da árvore, um nó por linha, indentado pela profundidade."""
+        linhas = []
+        for n, profundidade in self.percorrer():
+            texto = self.nome(n)
+            if self.eh_folha(n) and self.fonte is not None:
+                texto = f"{texto} {self.lexema(n)!r}"
+            linhas.append("  " * profundidade + texto)
+        return "\n".join(linhas)
+
+    def para_bytes(self):
+        """Serializa a árvore (sem os tokens de origem) em bytes."""
+        nomes = "\n".join(self.nomes).encode("utf-8")
+        partes = [_CABECALHO.pack(_MARCA, _VERSAO, len(self), self.n_terminais, len(nomes)), nomes]
+        partes += [coluna.tobytes() for coluna in (self.simbolos, self.producoes, self.tokens, self.inicios)]
+        return b"".join(partes)
+
+    @classmethod
+    def de_bytes(cls, dados, fonte=None):
+        """Árvore gravada por para_bytes(); fonte é o BufferTokens de origem, se houver."""
+        marca, versao, n_nos, n_terminais, tamanho_nomes = _CABECALHO.unpack_from(dados, 0)
+        if marca != _MARCA or versao != _VERSAO:
+            raise ValueError("Dados não são uma árvore sintática serializada")
+        pos = _CABECALHO.size
+        arvore = cls(bytes(dados[pos:pos + tamanho_nomes]).decode("utf-8").split("\n"), n_terminais, fonte)
+        pos += tamanho_nomes
+        for coluna in (arvore.simbolos, arvore.producoes, arvore.tokens, arvore.inicios):
+            tamanho = n_nos * coluna.itemsize
+            coluna.frombytes(dados[pos:pos + tamanho])
+            pos += tamanho
+        return arvore
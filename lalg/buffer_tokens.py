@@ -0,0 +1,236 @@
+from array import array
+
+from .identificadores import SEM_SIMBOLO, TabelaIdentificadores
+from .tipos_token import CODIGO_DO_TIPO
+
+
+class BufferTokens:
+    """
+    Sequência de tokens guardada em colunas, uma por campo, em vez de uma
+    lista de 5-tuplas (codigo, lexema, linha, coluna_ini, coluna_fim).
+
+    Tipos (TipoToken), linhas e colunas ficam em arrays de inteiros; o lexema
+    não é copiado: guarda-se apenas o intervalo [inicio, fim) dele no texto fonte.
+    A coluna final é derivada (coluna_ini + tamanho do lexema - 1), pois todo
+    token cabe numa única linha.
+
+    simbolos dá o id de cada identificador em identificadores (uma
+    TabelaIdentificadores, que pode ser compartilhada entre buffers do
+    mesmo texto) e SEM_SIMBOLO para os demais tokens.
+    """
+
+    __slots__ = ("fonte", "tipos", "linhas", "colunas", "inicios", "fins", "simbolos", "identificadores")
+
+    def __init__(self, fonte="", identificadores=None):
+        self.fonte = fonte
+        self.tipos = array("B")
+        self.linhas = array("I")
+        self.colunas = array("I")
+        self.inicios = array("Q")
+        self.fins = array("Q")
+        self.simbolos = array("i")
+        self.identificadores = identificadores if identificadores is not None else TabelaIdentificadores()
+
+    def adicionar(self, tipo, inicio, fim, linha, coluna, simbolo=SEM_SIMBOLO):
+        self.tipos.append(tipo)
+        self.inicios.append(inicio)
+        self.fins.append(fim)
+        self.linhas.append(linha)
+        self.colunas.append(coluna)
+        self.simbolos.append(simbolo)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return VisaoTokens(self, 0, len(self))[i]
+        if i < 0:
+            i += len(self)
+        return self.token(i)
+
+    def __iter__(self):
+        return self.iter_tuplas(0, len(self))
+
+    def __repr__(self):
+        return f"<BufferTokens: {len(self)} tokens>"
+
+    # Acesso por campo (sem montar tuplas)
+
+    def tipo(self, i):
+        return self.tipos[i]
+
+    def codigo(self, i):
+        return CODIGO_DO_TIPO[self.tipos[i]]
+
+    def lexema(self, i):
+        return self.fonte[self.inicios[i]:self.fins[i]]
+
+    def linha(self, i):
+        return self.linhas[i]
+
+    def coluna_ini(self, i):
+        return self.colunas[i]
+
+    def coluna_fim(self, i):
+        return self.colunas[i] + self.fins[i] - self.inicios[i] - 1
+
+    def simbolo(self, i):
+        return self.simbolos[i]
+
+    def token(self, i):
+        """Monta a 5-tupla do token i, no formato da lista de tokens clássica."""
+        coluna = self.colunas[i]
+        inicio = self.inicios[i]
+        fim = self.fins[i]
+        return (CODIGO_DO_TIPO[self.tipos[i]], self.fonte[inicio:fim], self.linhas[i], coluna, coluna + fim - inicio - 1)
+
+    def iter_tuplas(self, inicio, fim):
+        for i in range(inicio, fim):
+            yield self.token(i)
+
+
+class VisaoTokens:
+    """
+    Fatia [inicio, fim) de um BufferTokens. Não copia as colunas: criar uma
+    visão custa O(1), independentemente do número de tokens.
+    """
+
+    __slots__ = ("buffer", "inicio", "fim")
+
+    def __init__(self, buffer, inicio, fim):
+        self.buffer = buffer
+        self.inicio = inicio
+        self.fim = fim
+
+    def __len__(self):
+        return self.fim - self.inicio
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            a, b, passo = i.indices(len(self))
+            if passo != 1:
+                raise ValueError("Fatias de tokens não aceitam passo")
+            return VisaoTokens(self.buffer, self.inicio + a, self.inicio + max(a, b))
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Índice de token fora do intervalo")
+        return self.buffer.token(self.inicio + i)
+
+    def __iter__(self):
+        return self.buffer.iter_tuplas(self.inicio, self.fim)
+
+    def __repr__(self):
+        return f"<VisaoTokens: tokens {self.inicio}..{self.fim}>"
+
+    def indices(self):
+        """Índices (no buffer) dos tokens da visão, para acesso por coluna."""
+        return range(self.inicio, self.fim)
+
+
+class BufferTokensBytes(BufferTokens):
+    """
+    BufferTokens sobre uma fonte em bytes (bytes ou mmap de um arquivo UTF-8).
+    inicios/fins e colunas são contados em bytes; o lexema só é decodificado
+    quando pedido. Os nomes da tabela de identificadores também são bytes.
+    """
+
+    __slots__ = ()
+
+    def lexema(self, i):
+        return self.fonte[self.inicios[i]:self.fins[i]].decode("utf-8")
+
+    def token(self, i):
+        coluna = self.colunas[i]
+        inicio = self.inicios[i]
+        fim = self.fins[i]
+        lexema = self.fonte[inicio:fim].decode("utf-8")
+        return (CODIGO_DO_TIPO[self.tipos[i]], lexema, self.linhas[i], coluna, coluna + fim - inicio - 1)
+
+
+class BufferTokensEditavel(BufferTokens):
+    """
+    BufferTokens de um texto que vai sendo editado (AnalisadorSintaticoIncremental).
+    Os tokens de índice >= lacuna guardam inicios/fins contados do fim do
+    texto (len(fonte) - offset) e linhas contadas para trás a partir de
+    linha_referencia, a última linha do texto. Assim uma edição antes deles
+    não muda nenhum dos seus valores: basta trocar fonte e somar à
+    linha_referencia as linhas inseridas. Só os tokens entre a lacuna e o
+    ponto da próxima edição são convertidos (mover_lacuna), como num gap
+    buffer de editor. O acesso deve ser pelos métodos (inicio, fim, linha,
+    lexema...), não pelas colunas inicios/fins/linhas.
+    """
+
+    __slots__ = ("lacuna", "linha_referencia")
+
+    def __init__(self, fonte="", identificadores=None):
+        super().__init__(fonte, identificadores)
+        self.lacuna = 0
+        self.linha_referencia = 0
+
+    @classmethod
+    def de_buffer(cls, tokens, linha_referencia):
+        """Adota as colunas de um BufferTokens (sem copiá-las), com a lacuna no fim."""
+        editavel = cls(tokens.fonte, tokens.identificadores)
+        editavel.tipos, editavel.linhas, editavel.colunas = tokens.tipos, tokens.linhas, tokens.colunas
+        editavel.inicios, editavel.fins, editavel.simbolos = tokens.inicios, tokens.fins, tokens.simbolos
+        editavel.lacuna = len(tokens)
+        editavel.linha_referencia = linha_referencia
+        return editavel
+
+    def inicio(self, i):
+        return self.inicios[i] if i < self.lacuna else len(self.fonte) - self.inicios[i]
+
+    def fim(self, i):
+        return self.fins[i] if i < self.lacuna else len(self.fonte) - self.fins[i]
+
+    def lexema(self, i):
+        return self.fonte[self.inicio(i):self.fim(i)]
+
+    def linha(self, i):
+        return self.linhas[i] if i < self.lacuna else self.linha_referencia - self.linhas[i]
+
+    def coluna_fim(self, i):
+        return self.colunas[i] + self.fim(i) - self.inicio(i) - 1
+
+    def token(self, i):
+        coluna = self.colunas[i]
+        inicio = self.inicio(i)
+        fim = self.fim(i)
+        return (CODIGO_DO_TIPO[self.tipos[i]], self.fonte[inicio:fim], self.linha(i), coluna, coluna + fim - inicio - 1)
+
+    def mover_lacuna(self, i):
+        """Põe a lacuna antes do token i, convertendo os tokens entre ela e i."""
+        a, b = sorted((i, self.lacuna))
+        n = len(self.fonte)
+        referencia = self.linha_referencia
+        self.inicios[a:b] = array("Q", [n - x for x in self.inicios[a:b]])
+        self.fins[a:b] = array("Q", [n - x for x in self.fins[a:b]])
+        self.linhas[a:b] = array("I", [referencia - x for x in self.linhas[a:b]])
+        self.lacuna = i
+
+    def substituir(self, i, j, novos, fonte, linhas_a_mais, colunas_a_mais):
+        """
+        Troca os tokens [i, j) pelos de novos (BufferTokens com offsets do
+        texto fonte, já editado, e a mesma tabela de identificadores) e
+        passa a usar fonte. Os tokens seguintes
+        descem linhas_a_mais linhas, e os que estavam na linha do token j
+        andam colunas_a_mais colunas. A lacuna fica depois dos tokens novos.
+        """
+        self.mover_lacuna(j)
+        if j < len(self) and colunas_a_mais:
+            linha_j = self.linhas[j]
+            k = j
+            while k < len(self) and self.linhas[k] == linha_j:
+                k += 1
+            self.colunas[j:k] = array("I", [x + colunas_a_mais for x in self.colunas[j:k]])
+        self.tipos[i:j] = novos.tipos
+        self.inicios[i:j] = novos.inicios
+        self.fins[i:j] = novos.fins
+        self.linhas[i:j] = novos.linhas
+        self.colunas[i:j] = novos.colunas
+        self.simbolos[i:j] = novos.simbolos
+        self.lacuna = i + len(novos)
+        self.fonte = fonte
+        self.linha_referencia += linhas_a_mais
@@ -0,0 +1,301 @@
+from array import array
+from bisect import bisect_right
+
+from .arvore_abstrata import (CHAR, INTEGER, REAL, RELACOES, Acesso, Atribuicao, Binaria, Chamada, Constante,
+                             Enquanto, Escrita, Leitura, Negacao, Para, ParaReal, Repita, Se)
+
+# Instruções da máquina virtual, as mais executadas primeiro (é a ordem do
+# despacho em maquina_virtual). Os operandos vêm logo depois do código, no
+# mesmo array: l/g = índice de local/global, k = índice na tabela de
+# constantes, a = endereço de destino, r = índice da rotina.
+(CARREGAR_LOCAL,        # l        empilha locais[l]
+ CONST,                 # k        empilha constantes[k]
+ GUARDAR_LOCAL,         # l        locais[l] = desempilha
+ SOMAR,
+ SUBTRAIR,
+ MULTIPLICAR,
+ SALTAR_SE_MENOR,       # a        desempilha b, a; salta se a < b
+ SALTAR_SE_MENOR_IGUAL,
+ SALTAR_SE_MAIOR,
+ SALTAR_SE_MAIOR_IGUAL,
+ SALTAR_SE_IGUAL,
+ SALTAR_SE_DIFERENTE,
+ SALTAR_SE_NAO_MENOR,   # a        desempilha b, a; salta se não a < b
+ SALTAR_SE_NAO_MENOR_IGUAL,
+ SALTAR_SE_NAO_MAIOR,
+ SALTAR_SE_NAO_MAIOR_IGUAL,
+ SALTAR_SE_NAO_IGUAL,
+ SALTAR_SE_NAO_DIFERENTE,
+ PARA_PASSO_LOCAL,      # l lim a  soma 1 ao contador do for (no topo); se <= lim, locais[l] = contador e salta
+ SALTAR,                # a
+ CARREGAR_GLOBAL,       # g
+ GUARDAR_GLOBAL,        # g
+ DIVIDIR_INTEIRO,
+ DIVIDIR_REAL,
+ NEGAR,
+ PARA_REAL,
+ PARA_PASSO_GLOBAL,     # g lim a
+ PARA_INICIO_LOCAL,     # l lim a  contador no topo; se > lim, desempilha e salta; senão locais[l] = contador
+ PARA_INICIO_GLOBAL,    # g lim a
+ CHAMAR,                # r        os argumentos viram os primeiros locais da rotina
+ RETORNAR,
+ LER,                   # t        empilha o próximo valor da entrada, do tipo TIPOS[t]
+ ESCREVER,              # n        desempilha n valores e os escreve numa linha
+ CARACTERE,             # troca o código no topo pelo caractere
+ PARAR) = range(35)
+
+NOMES = ("CARREGAR_LOCAL", "CONST", "GUARDAR_LOCAL", "SOMAR", "SUBTRAIR", "MULTIPLICAR",
+         "SALTAR_SE_MENOR", "SALTAR_SE_MENOR_IGUAL", "SALTAR_SE_MAIOR", "SALTAR_SE_MAIOR_IGUAL",
+         "SALTAR_SE_IGUAL", "SALTAR_SE_DIFERENTE", "SALTAR_SE_NAO_MENOR", "SALTAR_SE_NAO_MENOR_IGUAL",
+         "SALTAR_SE_NAO_MAIOR", "SALTAR_SE_NAO_MAIOR_IGUAL", "SALTAR_SE_NAO_IGUAL", "SALTAR_SE_NAO_DIFERENTE",
+         "PARA_PASSO_LOCAL", "SALTAR", "CARREGAR_GLOBAL", "GUARDAR_GLOBAL", "DIVIDIR_INTEIRO", "DIVIDIR_REAL",
+         "NEGAR", "PARA_REAL", "PARA_PASSO_GLOBAL", "PARA_INICIO_LOCAL", "PARA_INICIO_GLOBAL", "CHAMAR",
+         "RETORNAR", "LER", "ESCREVER", "CARACTERE", "PARAR")
+
+# Número de operandos de cada instrução
+OPERANDOS = (1, 1, 1, 0, 0, 0) + (1,) * 12 + (3, 1, 1, 1, 0, 0, 0, 0, 3, 3, 3, 1, 0, 1, 1, 0, 0)
+
+# Instruções que mudam o fluxo: terminam um trecho em linha reta do código
+CONTROLE = frozenset(range(SALTAR_SE_MENOR, PARA_PASSO_LOCAL + 2)) | {
+    PARA_PASSO_GLOBAL, PARA_INICIO_LOCAL, PARA_INICIO_GLOBAL, CHAMAR, RETORNAR, PARAR}
+
+# Salto condicional de cada relação, quando ela vale e quando não vale
+SALTAR_SE = dict(zip(("<", "<=", ">", ">=", "=", "<>"), range(SALTAR_SE_MENOR, SALTAR_SE_DIFERENTE + 1)))
+SALTAR_SE_NAO = dict(zip(("<", "<=", ">", ">=", "=", "<>"), range(SALTAR_SE_NAO_MENOR, SALTAR_SE_NAO_DIFERENTE + 1)))
+assert set(SALTAR_SE) == set(RELACOES)
+
+OPERACAO = {"+": SOMAR, "-": SUBTRAIR, "*": MULTIPLICAR}
+
+# Tipos lidos por LER, pelo operando
+TIPOS = (INTEGER, REAL, CHAR)
+
+
+class CodigoObjeto:
+    """
+    Programa compilado para a máquina virtual:
+      codigo     - array de ints: instruções e operandos, o corpo principal
+                   a partir do endereço 0 e depois as rotinas;
+      constantes - valores dos CONST;
+      globais    - valores iniciais das variáveis globais (as constantes
+                   declaradas já com o seu valor);
+      rotinas    - (nome, entrada, n_parametros, valores iniciais dos locais)
+                   de cada rotina, pelo índice de CHAMAR;
+      enderecos/linhas - a linha do programa de cada trecho do código, para
+                   as mensagens de erro de execução.
+    """
+
+    __slots__ = ("nome", "codigo", "constantes", "globais", "rotinas", "enderecos", "linhas")
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.codigo = array("i")
+        self.constantes = []
+        self.globais = []
+        self.rotinas = []
+        self.enderecos = array("i")
+        self.linhas = array("i")
+
+    def __len__(self):
+        return len(self.codigo)
+
+    def __repr__(self):
+        return f"<CodigoObjeto {self.nome}: {len(self)} ints, {len(self.constantes)} constantes>"
+
+    def linha(self, pc):
+        """Linha do programa da instrução em pc (0 se não houver)."""
+        i = bisect_right(self.enderecos, pc) - 1
+        return self.linhas[i] if i >= 0 else 0
+
+    def instrucoes(self):
+        """(endereço, código, operandos) de cada instrução, em ordem."""
+        codigo = self.codigo
+        pc = 0
+        while pc < len(codigo):
+            op = codigo[pc]
+            n = OPERANDOS[op]
+            yield pc, op, tuple(codigo[pc + 1:pc + 1 + n])
+            pc += 1 + n
+
+    def comprimentos(self):
+        """
+        comprimento[pc]: instruções executadas a partir de pc até a próxima
+        instrução de controle, inclusive. A máquina virtual soma o do destino
+        a cada salto em vez de contar instrução por instrução.
+        """
+        comprimento = [0] * (len(self.codigo) + 1)
+        seguinte = 0
+        for pc, op, _ in reversed(list(self.instrucoes())):
+            seguinte = 1 if op in CONTROLE else seguinte + 1
+            comprimento[pc] = seguinte
+        return comprimento
+
+    def desmontar(self):
+        """Texto do código, uma instrução por linha, com o nome das rotinas e as constantes."""
+        entradas = {entrada: nome for nome, entrada, _, _ in self.rotinas}
+        linhas = []
+        for pc, op, operandos in self.instrucoes():
+            if pc in entradas:
+                linhas.append(f"{entradas[pc]}:")
+            texto = f"{pc:6}  {NOMES[op]:<26}{' '.join(map(str, operandos))}"
+            if op == CONST:
+                texto += f"  ({self.constantes[operandos[0]]!r})"
+            elif op == CHAMAR:
+                texto += f"  ({self.rotinas[operandos[0]][0]})"
+            linhas.append(texto)
+        return "\n".join(linhas)
+
+
+class _Compilador:
+    def __init__(self, programa):
+        self.programa = programa
+        self.objeto = CodigoObjeto(programa.nome)
+        self.codigo = self.objeto.codigo
+        self.indice_constante = {}
+        self.rotina = None
+
+    def emitir(self, op, *operandos):
+        self.codigo.append(op)
+        self.codigo.extend(operandos)
+
+    def saltar(self, op, *operandos):
+        """Emite um salto com destino ainda desconhecido; devolve a posição do operando a corrigir."""
+        self.emitir(op, *operandos, 0)
+        return len(self.codigo) - 1
+
+    def corrigir(self, posicao, destino=None):
+        self.codigo[posicao] = len(self.codigo) if destino is None else destino
+
+    def marcar_linha(self, linha):
+        objeto = self.objeto
+        if objeto.enderecos and objeto.enderecos[-1] == len(self.codigo):
+            objeto.linhas[-1] = linha
+        elif not objeto.linhas or objeto.linhas[-1] != linha:
+            objeto.enderecos.append(len(self.codigo))
+            objeto.linhas.append(linha)
+
+    def constante(self, valor):
+        # O tipo entra na chave: 1 e 1.0 são iguais como chaves de dict
+        chave = (type(valor), repr(valor))
+        indice = self.indice_constante.get(chave)
+        if indice is None:
+            indice = self.indice_constante[chave] = len(self.objeto.constantes)
+            self.objeto.constantes.append(valor)
+        return indice
+
+    def eh_local(self, variavel):
+        # No corpo principal, os locais são as próprias globais
+        return self.rotina is None or variavel.local
+
+    def compilar(self):
+        programa, objeto = self.programa, self.objeto
+        objeto.globais = [variavel.inicial for variavel in programa.globais]
+        self.comandos(programa.corpo)
+        self.emitir(PARAR)
+        for rotina in programa.rotinas:
+            self.rotina = rotina
+            objeto.rotinas.append((rotina.nome, len(self.codigo), len(rotina.parametros),
+                                   [variavel.inicial for variavel in rotina.locais]))
+            self.marcar_linha(rotina.linha)
+            self.comandos(rotina.corpo)
+            self.emitir(RETORNAR)
+        return objeto
+
+    # Comandos
+
+    def comandos(self, comandos):
+        for comando in comandos:
+            self.marcar_linha(comando.linha)
+            self.comando(comando)
+
+    def comando(self, c):
+        tipo = type(c)
+        if tipo is Atribuicao:
+            self.expressao(c.valor)
+            self.guardar(c.destino)
+        elif tipo is Se:
+            falso = self.condicao(c.condicao, False)
+            self.comandos(c.entao)
+            if c.senao:
+                fim = self.saltar(SALTAR)
+                self.corrigir(falso)
+                self.comandos(c.senao)
+                self.corrigir(fim)
+            else:
+                self.corrigir(falso)
+        elif tipo is Enquanto:
+            # O teste fica depois do corpo: um salto condicional por volta
+            teste = self.saltar(SALTAR)
+            corpo = len(self.codigo)
+            self.comandos(c.corpo)
+            self.corrigir(teste)
+            self.marcar_linha(c.linha)
+            self.corrigir(self.condicao(c.condicao, True), corpo)
+        elif tipo is Repita:
+            corpo = len(self.codigo)
+            self.comandos(c.corpo)
+            self.marcar_linha(c.linha)
+            self.corrigir(self.condicao(c.condicao, False), corpo)
+        elif tipo is Para:
+            local = self.eh_local(c.variavel)
+            self.expressao(c.inicio)
+            fim = self.saltar(PARA_INICIO_LOCAL if local else PARA_INICIO_GLOBAL, c.variavel.indice, c.limite)
+            corpo = len(self.codigo)
+            self.comandos(c.corpo)
+            self.marcar_linha(c.linha)
+            self.emitir(PARA_PASSO_LOCAL if local else PARA_PASSO_GLOBAL, c.variavel.indice, c.limite, corpo)
+            self.corrigir(fim)
+        elif tipo is Chamada:
+            for argumento in c.argumentos:
+                self.expressao(argumento)
+            self.emitir(CHAMAR, c.rotina.indice)
+        elif tipo is Leitura:
+            for destino in c.destinos:
+                self.emitir(LER, TIPOS.index(destino.tipo))
+                self.guardar(destino)
+        elif tipo is Escrita:
+            for valor in c.valores:
+                self.expressao(valor)
+                if valor.tipo == CHAR:
+                    self.emitir(CARACTERE)
+            self.emitir(ESCREVER, len(c.valores))
+        else:
+            raise TypeError(f"Comando desconhecido: {c!r}")
+
+    def guardar(self, variavel):
+        self.emitir(GUARDAR_LOCAL if self.eh_local(variavel) else GUARDAR_GLOBAL, variavel.indice)
+
+    def condicao(self, condicao, quando):
+        """Compara os lados e salta se a relação for igual a quando; devolve a posição do destino a corrigir."""
+        self.expressao(condicao.esquerda)
+        self.expressao(condicao.direita)
+        saltos = SALTAR_SE if quando else SALTAR_SE_NAO
+        return self.saltar(saltos[condicao.relacao])
+
+    # Expressões
+
+    def expressao(self, e):
+        tipo = type(e)
+        if tipo is Acesso:
+            self.emitir(CARREGAR_LOCAL if self.eh_local(e.variavel) else CARREGAR_GLOBAL, e.variavel.indice)
+        elif tipo is Constante:
+            self.emitir(CONST, self.constante(e.valor))
+        elif tipo is Binaria:
+            self.expressao(e.esquerda)
+            self.expressao(e.direita)
+            if e.operador == "/":
+                self.emitir(DIVIDIR_REAL if e.tipo == REAL else DIVIDIR_INTEIRO)
+            else:
+                self.emitir(OPERACAO[e.operador])
+        elif tipo is Negacao:
+            self.expressao(e.operando)
+            self.emitir(NEGAR)
+        elif tipo is ParaReal:
+            self.expressao(e.operando)
+            self.emitir(PARA_REAL)
+        else:
+            raise TypeError(f"Expressão desconhecida: {e!r}")
+
+
+def compilar(programa):
+    """CodigoObjeto da árvore abstrata (arvore_abstrata.Programa) de um programa."""
+    return _Compilador(programa).compilar()
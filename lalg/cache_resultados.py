@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from .analisador_sintatico import RASTRO_ACOES, AnalisadorSintatico, RastroAcoes
+from .buffer_tokens import BufferTokens
+from .diagnosticos import Diagnostico
+from .gramatica import chave_cache
+from .identificadores import TabelaIdentificadores
+from .tipos_token import TERMINAL_DO_TIPO
+
+# Entra na chave de cada resultado: mudar o léxico, o sintático ou o
+# formato gravado em disco invalida os resultados já guardados
+VERSAO_RESULTADO = 3
+
+# Limite padrão da memória ocupada pelos resultados guardados
+MAX_BYTES_PADRAO = 128 * 1024 * 1024
+
+# Caracteres do texto codificados de cada vez para o hash
+FATIA_HASH = 1024 * 1024
+
+# Cabeçalho de para_bytes(): marca, versão, número de tokens, número de
+# ações, sucesso e tamanho dos metadados (mensagem, erro léxico e nomes dos
+# identificadores, em JSON)
+_CABECALHO = struct.Struct("<4sHQQBI")
+_MARCA = b"LALR"
+
+
+class ResultadoAnalise:
+    """
+    Resultado de tokenizar() + analisar() com RASTRO_ACOES sobre um texto:
+    tokens (BufferTokens, ou None se houve erro léxico), acoes (log do
+    sintático, vazio se houve erro léxico), sucesso, mensagem e erro_lexico
+    (Diagnostico ou None). É compartilhado por quem pede o mesmo texto ao
+    cache: não deve ser alterado.
+    """
+
+    __slots__ = ("tokens", "acoes", "sucesso", "mensagem", "erro_lexico", "compilada")
+
+    def __init__(self, tokens, acoes, sucesso, mensagem, erro_lexico, compilada):
+        self.tokens = tokens
+        self.acoes = acoes
+        self.sucesso = sucesso
+        self.mensagem = mensagem
+        self.erro_lexico = erro_lexico
+        self.compilada = compilada  # tabela compilada da gramática, para o rastro
+
+    def __repr__(self):
+        return f"<ResultadoAnalise: {len(self.tokens) if self.tokens is not None else 0} tokens, sucesso={self.sucesso}>"
+
+    def _colunas(self):
+        tokens = self.tokens if self.tokens is not None else BufferTokens()
+        return tokens.tipos, tokens.linhas, tokens.colunas, tokens.inicios, tokens.fins, tokens.simbolos, self.acoes
+
+    @property
+    def tamanho(self):
+        """Bytes ocupados pelas colunas (o que conta para o limite do cache)."""
+        return sum(len(coluna) * coluna.itemsize for coluna in self._colunas()) + len(self.mensagem)
+
+    def rastro(self):
+        """O RastroAcoes da análise (None se houve erro léxico)."""
+        if self.tokens is None:
+            return None
+        return RastroAcoes(self.tokens, self.compilada, self.acoes, self.sucesso, self.mensagem)
+
+    def para_bytes(self):
+        """Serializa o resultado (sem o texto fonte) em bytes."""
+        erro = self.erro_lexico
+        metadados = json.dumps({
+            'mensagem': self.mensagem,
+            'erro_lexico': None if erro is None else
+            [erro.codigo, erro.linha, erro.coluna, erro.coluna_fim, erro.detalhe],
+            'identificadores': self.tokens.identificadores.nomes if self.tokens is not None else [],
+        }, ensure_ascii=False).encode("utf-8")
+        n_tokens = len(self.tokens) if self.tokens is not None else 0
+        partes = [_CABECALHO.pack(_MARCA, VERSAO_RESULTADO, n_tokens, len(self.acoes), self.sucesso, len(metadados)), metadados]
+        partes += [coluna.tobytes() for coluna in self._colunas()]
+        return b"".join(partes)
+
+    @classmethod
+    def de_bytes(cls, dados, fonte, compilada):
+        """Resultado gravado por para_bytes(); fonte é o texto analisado."""
+        marca, versao, n_tokens, n_acoes, sucesso, tamanho_metadados = _CABECALHO.unpack_from(dados, 0)
+        if marca != _MARCA or versao != VERSAO_RESULTADO:
+            raise ValueError("Dados não são um resultado de análise serializado")
+        pos = _CABECALHO.size
+        metadados = json.loads(bytes(dados[pos:pos + tamanho_metadados]).decode("utf-8"))
+        pos += tamanho_metadados
+        erro = metadados['erro_lexico']
+        tokens = BufferTokens(fonte, TabelaIdentificadores(metadados['identificadores']))
+        acoes = array("H")
+        colunas = (tokens.tipos, tokens.linhas, tokens.colunas, tokens.inicios, tokens.fins, tokens.simbolos, acoes)
+        for coluna, n in zip(colunas, (n_tokens,) * 6 + (n_acoes,)):
+            tamanho = n * coluna.itemsize
+            if pos + tamanho > len(dados):
+                raise ValueError("Resultado de análise truncado")
+            coluna.frombytes(dados[pos:pos + tamanho])
+            pos += tamanho
+        return cls(None if erro is not None else tokens, acoes, bool(sucesso), metadados['mensagem'],
+                   None if erro is None else Diagnostico(*erro), compilada)
+
+
+class CacheAnalise:
+    """
+    Cache de resultados de análise endereçado pelo conteúdo: a chave é o
+    hash do texto, da gramática (a mesma chave do cache da tabela) e de
+    VERSAO_RESULTADO, então um texto já analisado custa só o hash, não
+    importa de onde veio. Os resultados ficam na memória numa LRU limitada
+    a max_bytes (os menos usados saem primeiro; um resultado maior que o
+    limite não fica na memória) e, se pasta for dada, também em disco, um
+    arquivo por chave, para valerem entre execuções.
+    """
+
+    def __init__(self, analisador=None, max_bytes=MAX_BYTES_PADRAO, pasta=None):
+        self.analisador = analisador if analisador is not None else AnalisadorSintatico()
+        self.max_bytes = max_bytes
+        self.pasta = Path(pasta) if pasta is not None else None
+        self.resultados = OrderedDict()  # chave -> ResultadoAnalise, do menos ao mais usado
+        self.bytes = 0
+        # Estatísticas
+        self.acertos = 0
+        self.acertos_disco = 0
+        self.falhas = 0
+        texto_gramatica = Path(self.analisador.gramatica).read_text(encoding="utf-8")
+        self._prefixo = f"{VERSAO_RESULTADO}\n{chave_cache(texto_gramatica, TERMINAL_DO_TIPO)}\n".encode("utf-8")
+
+    def __len__(self):
+        return len(self.resultados)
+
+    def __repr__(self):
+        return f"<CacheAnalise: {len(self)} resultados, {self.bytes} bytes>"
+
+    def chave(self, texto):
+        h = hashlib.sha256(self._prefixo)
+        # Em fatias, para não montar uma cópia codificada do texto inteiro
+        for i in range(0, len(texto), FATIA_HASH):
+            h.update(texto[i:i + FATIA_HASH].encode("utf-8", "surrogatepass"))
+        return h.hexdigest()
+
+    def analisar(self, texto):
+        """ResultadoAnalise de tokenizar() + analisar() sobre texto, do cache se possível."""
+        chave = self.chave(texto)
+        resultado = self.resultados.get(chave)
+        if resultado is not None:
+            self.resultados.move_to_end(chave)
+            self.acertos += 1
+            # O texto é o mesmo; o buffer passa a apontar para o do chamador
+            if resultado.tokens is not None:
+                resultado.tokens.fonte = texto
+            return resultado
+
+        resultado = self._ler(chave, texto)
+        if resultado is not None:
+            self.acertos_disco += 1
+        else:
+            self.falhas += 1
+            resultado = self._calcular(texto)
+            self._gravar(chave, resultado)
+        self._guardar(chave, resultado)
+        return resultado
+
+    def limpar(self):
+        """Esvazia a memória (os arquivos em disco ficam)."""
+        self.resultados.clear()
+        self.bytes = 0
+
+    def _calcular(self, texto):
+        analisador = self.analisador
+        tokens, erro = analisador.tokenizar(texto)
+        if erro:
+            return ResultadoAnalise(None, array("H"), False, str(erro), erro, analisador.compilada)
+        sucesso, mensagem, rastro = analisador.analisar(tokens, rastro=RASTRO_ACOES)
+        return ResultadoAnalise(tokens, rastro.acoes, sucesso, mensagem, None, analisador.compilada)
+
+    def _guardar(self, chave, resultado):
+        tamanho = resultado.tamanho
+        if tamanho > self.max_bytes:
+            return
+        self.resultados[chave] = resultado
+        self.bytes += tamanho
+        while self.bytes > self.max_bytes:
+            _, antigo = self.resultados.popitem(last=False)
+            self.bytes -= antigo.tamanho
+
+    def _arquivo(self, chave):
+        return self.pasta / f"resultado-{chave[:32]}.bin"
+
+    def _ler(self, chave, texto):
+        if self.pasta is None:
+            return None
+        try:
+            dados = self._arquivo(chave).read_bytes()
+            return ResultadoAnalise.de_bytes(dados, texto, self.analisador.compilada)
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            return None
+
+    def _gravar(self, chave, resultado):
+        # Como em gramatica.carregar_tabela: grava num temporário e troca, e
+        # uma pasta sem permissão de escrita só deixa de guardar o resultado
+        if self.pasta is None:
+            return
+        arquivo = self._arquivo(chave)
+        try:
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            temporario = arquivo.with_suffix(f".{os.getpid()}.tmp")
+            temporario.write_bytes(resultado.para_bytes())
+            os.replace(temporario, arquivo)
+        except OSError:
+            pass
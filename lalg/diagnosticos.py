@@ -0,0 +1,76 @@
+# Códigos dos erros léxicos
+IDENTIFICADOR_LONGO = "L001"
+OVERFLOW_INTEIRO = "L002"
+REAL_MAL_FORMADO = "L003"
+CARACTERE_INVALIDO = "L004"
+COMENTARIO_NAO_FECHADO = "L005"
+INTEIRO_MAL_FORMADO = "L006"
+
+# Código -> mensagem exibida (o texto de sempre das listas de erros)
+MENSAGENS = {
+    IDENTIFICADOR_LONGO: "Erro Léxico - Identificador muito longo - linha {linha}",
+    OVERFLOW_INTEIRO: "Erro Léxico - Overflow de inteiro: {detalhe} - linha {linha}",
+    REAL_MAL_FORMADO: "Erro Léxico - Número real mal formado - linha {linha}",
+    CARACTERE_INVALIDO: "Erro Léxico: Caractere inválido '{detalhe}' - linha {linha}",
+    COMENTARIO_NAO_FECHADO: "Erro Léxico - Comentário não fechado - linha {linha}",
+    INTEIRO_MAL_FORMADO: "Erro Léxico - Inteiro mal formado: {detalhe} - linha {linha}",
+}
+
+
+class Diagnostico:
+    """
+    Um erro léxico: código (L001...), linha e intervalo de colunas
+    [coluna, coluna_fim] do trecho com problema, como nos tokens, e o
+    detalhe que entra na mensagem (número estourado, caractere inválido).
+    str(diagnostico) devolve a mensagem de sempre. Um comentário não fechado
+    não tem trecho: a linha é a seguinte à última do texto e as colunas são 0.
+    """
+
+    __slots__ = ("codigo", "linha", "coluna", "coluna_fim", "detalhe")
+
+    def __init__(self, codigo, linha, coluna=0, coluna_fim=0, detalhe=""):
+        self.codigo = codigo
+        self.linha = linha
+        self.coluna = coluna
+        self.coluna_fim = coluna_fim
+        self.detalhe = detalhe
+
+    @property
+    def mensagem(self):
+        return MENSAGENS[self.codigo].format(linha=self.linha, detalhe=self.detalhe)
+
+    def __str__(self):
+        return self.mensagem
+
+    def __repr__(self):
+        return f"<Diagnostico {self.codigo} linha {self.linha}, colunas {self.coluna}-{self.coluna_fim}>"
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Diagnostico):
+            return NotImplemented
+        return (self.codigo, self.linha, self.coluna, self.coluna_fim, self.detalhe) == \
+               (outro.codigo, outro.linha, outro.coluna, outro.coluna_fim, outro.detalhe)
+
+    __hash__ = None
+
+
+class LimiteDeErros(Exception):
+    """Levantada por ListaDiagnosticos.reportar quando o limite de erros é atingido."""
+
+
+class ListaDiagnosticos(list):
+    """
+    Lista de Diagnostico com um limite opcional (max_erros). Os motores
+    reportam erros por reportar(); ao atingir o limite ela levanta
+    LimiteDeErros, que interrompe a varredura no ponto do erro.
+    Com max_erros=1 a análise para no primeiro erro.
+    """
+
+    def __init__(self, max_erros=None):
+        super().__init__()
+        self.max_erros = max_erros
+
+    def reportar(self, codigo, linha, coluna=0, coluna_fim=0, detalhe=""):
+        self.append(Diagnostico(codigo, linha, coluna, coluna_fim, detalhe))
+        if len(self) == self.max_erros:
+            raise LimiteDeErros()
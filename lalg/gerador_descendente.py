@@ -0,0 +1,169 @@
+import hashlib
+import importlib.util
+import os
+import sys
+
+from .gramatica import EPSILON, PASTA_CACHE
+
+# Tipo de token fictício colocado após o último token: o marcador de fim '$'.
+# Cabe num byte, como os tipos de BufferTokens.tipos (array 'B')
+FIM_DA_ENTRADA = 255
+
+# Entra no hash do módulo gerado, como VERSAO_GERADOR em gramatica.py
+VERSAO_DESCENDENTE = 1
+
+CABECALHO = '''\
+# Analisador descendente recursivo gerado por gerador_descendente.py a
+# partir da tabela LL(1). Não edite: gere de novo.
+#
+# k são os tipos de token (TipoToken) da entrada, um por byte, terminados
+# por {fim}; cada função p_X reconhece o não-terminal X a partir de k[i] e
+# devolve o índice do primeiro token depois dele.
+
+
+class Falha(Exception):
+    """Erro sintático: args = (índice do token, id do símbolo esperado)."""
+'''
+
+
+def _nome_funcao(nao_terminal):
+    return f"p_{nao_terminal}"
+
+
+def _condicao(tipos, negada=False):
+    """Teste de k[i]/t contra um conjunto de tipos de token."""
+    if len(tipos) == 1:
+        return f"{'!=' if negada else '=='} {tipos[0]}"
+    return f"{'not in' if negada else 'in'} {{{', '.join(map(str, tipos))}}}"
+
+
+def gerar_codigo(dados, compilada):
+    """
+    Fonte Python de um analisador descendente recursivo equivalente à
+    tabela dados['tabela'] (o formato de gramatica.gerar) compilada em
+    compilada: uma função por não-terminal, escolhendo a produção por
+    if/elif sobre o tipo do token. Os erros levantam Falha com os mesmos ids
+    de símbolo da tabela compilada, para as mensagens saírem iguais às do
+    laço com pilha. Recursão à direita de um não-terminal nele mesmo
+    (COMANDOS, DC_V, OUTROS_TERMOS...) vira laço.
+    """
+    ids = compilada.ids
+    n_terminais = compilada.n_terminais
+    nao_terminais = dados['nao_terminais']
+
+    # Terminal -> tipos de token que o representam
+    tipos_do_terminal = {}
+    for tipo, terminal in enumerate(compilada.terminal_do_tipo):
+        tipos_do_terminal.setdefault(compilada.nomes[terminal], []).append(tipo)
+    tipos_do_terminal.setdefault(compilada.nomes[compilada.fim], []).append(FIM_DA_ENTRADA)
+
+    def consumir(simbolo, recuo, linhas):
+        """Linhas que reconhecem simbolo; False se o resto do corpo é inalcançável."""
+        if simbolo in nao_terminais:
+            linhas.append(f"{recuo}i = {_nome_funcao(simbolo)}(k, i)")
+            return True
+        tipos = tipos_do_terminal.get(simbolo)
+        if simbolo not in ids or ids[simbolo] >= n_terminais or not tipos:
+            # Símbolo não declarado ou terminal que nenhum token produz
+            linhas.append(f"{recuo}raise Falha(i, {ids.get(simbolo, -1)})  # {simbolo}")
+            return False
+        linhas.append(f"{recuo}if k[i] {_condicao(tipos, negada=True)}:  # {simbolo}")
+        linhas.append(f"{recuo}    raise Falha(i, {ids[simbolo]})")
+        linhas.append(f"{recuo}i += 1")
+        return True
+
+    linhas = [CABECALHO.format(fim=FIM_DA_ENTRADA).rstrip("\n")]
+    for nt in nao_terminais:
+        linha_tabela = dados['tabela'].get(nt, {})
+        # Terminais agrupados por produção, na ordem da tabela
+        grupos = {}
+        for terminal, producao in linha_tabela.items():
+            tipos = tipos_do_terminal.get(terminal, [])
+            grupos.setdefault(tuple(producao), []).extend(tipos)
+        com_laco = any(p and p[-1] == nt for p in grupos)
+        recuo = "        " if com_laco else "    "
+
+        linhas.append(f"\n\ndef {_nome_funcao(nt)}(k, i):")
+        if com_laco:
+            linhas.append("    while True:")
+        linhas.append(f"{recuo}t = k[i]")
+        primeiro = True
+        for producao, tipos in grupos.items():
+            if not tipos:
+                continue  # nenhum token seleciona esta produção
+            linhas.append(f"{recuo}{'if' if primeiro else 'elif'} t {_condicao(tipos)}:  # {' '.join(producao)}")
+            primeiro = False
+            corpo = [s for s in producao if s != EPSILON]
+            cauda = com_laco and corpo and corpo[-1] == nt
+            if cauda:
+                corpo = corpo[:-1]
+            alcancavel = True
+            for j, simbolo in enumerate(corpo):
+                if j == 0 and simbolo not in nao_terminais and set(tipos) <= set(tipos_do_terminal.get(simbolo, ())):
+                    # O despacho já conferiu este terminal
+                    linhas.append(f"{recuo}    i += 1  # {simbolo}")
+                    continue
+                alcancavel = consumir(simbolo, recuo + "    ", linhas)
+                if not alcancavel:
+                    break
+            if alcancavel:
+                linhas.append(f"{recuo}    {'continue' if cauda else 'return i'}")
+        linhas.append(f"{recuo}raise Falha(i, {ids[nt]})  # {nt}")
+
+    inicial = dados['inicial']
+    linhas.append(f'''
+
+def analisar(k):
+    """Reconhece {inicial} seguido do marcador de fim; devolve o índice depois dele."""
+    i = {_nome_funcao(inicial)}(k, 0)''')
+    consumir(compilada.nomes[compilada.fim], "    ", linhas)
+    linhas.append("    return i\n")
+    return "\n".join(linhas)
+
+
+def carregar_modulo(dados, compilada, pasta_cache=PASTA_CACHE):
+    """
+    Gera o analisador descendente, grava-o em pasta_cache (o nome leva o
+    hash do código) e o importa, para o Python reaproveitar o bytecode nas
+    próximas vezes. Devolve None se a pasta não aceita escrita; quem chama
+    usa então o laço com pilha, como faria sem o módulo.
+    """
+    codigo = gerar_codigo(dados, compilada)
+    chave = hashlib.sha256(f"{VERSAO_DESCENDENTE}\n{codigo}".encode("utf-8")).hexdigest()[:32]
+    nome = f"descendente_{chave}"
+    arquivo = os.path.join(pasta_cache, f"{nome}.py")
+    try:
+        if not os.path.exists(arquivo):
+            # Grava num temporário e troca, como o cache da tabela: um
+            # processo concorrente nunca importa um arquivo pela metade
+            os.makedirs(pasta_cache, exist_ok=True)
+            temporario = f"{arquivo[:-len('.py')]}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                f.write(codigo)
+            os.replace(temporario, arquivo)
+    except OSError:
+        return None
+    especificacao = importlib.util.spec_from_file_location(nome, arquivo)
+    modulo = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(modulo)
+    return modulo
+
+
+def main(argv):
+    """python -m lalg.gerador_descendente [saida.py]: grava (ou mostra) o módulo gerado."""
+    from .analisador_sintatico import tabela_da_gramatica
+    from .gramatica import ARQUIVO_GRAMATICA
+
+    dados, compilada = tabela_da_gramatica(ARQUIVO_GRAMATICA)
+    codigo = gerar_codigo(dados, compilada)
+    if len(argv) > 1:
+        with open(argv[1], "w", encoding="utf-8") as f:
+            f.write(codigo)
+        print(f"Analisador descendente gravado em {argv[1]}")
+    else:
+        print(codigo)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,222 @@
+import math
+import sys
+
+from .arvore_abstrata import (CHAR, REAL, Acesso, Atribuicao, Binaria, Chamada, Constante, Enquanto, ErroCompilacao,
+                             Escrita, Leitura, Negacao, Para, ParaReal, Repita, Se, atribuidas, dividir_inteiro)
+from .maquina_virtual import ERROS_PYTHON, LIMITE_CHAMADAS, Entrada, ErroExecucao
+
+CABECALHO = '''\
+# Programa {nome} traduzido por gerador_python.py a partir da árvore
+# abstrata. Globais, rotinas e locais ganham os prefixos g_, r_ e l_; as
+# globais são locais de programa(), e as rotinas, funções dentro dela.
+'''
+
+# Precedência das expressões geradas, para só pôr os parênteses necessários
+# (o compilador do Python limita o aninhamento deles)
+ATOMO, UNARIO, MULTIPLICATIVO, ADITIVO = 4, 3, 2, 1
+PRECEDENCIA = {"+": ADITIVO, "-": ADITIVO, "*": MULTIPLICATIVO, "/": MULTIPLICATIVO}
+
+COMPARACAO = {"=": "==", "<>": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+class CodigoPython:
+    """
+    Programa traduzido para Python: fonte, o code object compilado dela e,
+    para cada linha da fonte, a linha do programa LALG de onde veio (para
+    as mensagens de erro de execução).
+    """
+
+    __slots__ = ("nome", "fonte", "codigo", "linhas")
+
+    def __init__(self, nome, fonte, codigo, linhas):
+        self.nome = nome
+        self.fonte = fonte
+        self.codigo = codigo
+        self.linhas = linhas
+
+    def __repr__(self):
+        return f"<CodigoPython {self.nome}: {len(self.linhas)} linhas>"
+
+    def linha(self, linha_python):
+        """Linha do programa LALG da linha linha_python (contada de 1) da fonte."""
+        return self.linhas[linha_python - 1] if 0 < linha_python <= len(self.linhas) else 0
+
+
+def literal(valor):
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return f"float('{valor!r}')"
+    return repr(valor)
+
+
+class _Gerador:
+    def __init__(self, programa):
+        self.programa = programa
+        self.linhas = []  # linhas da fonte
+        self.origem = []  # linha LALG de cada uma
+        self.linha_atual = 0
+
+    def emitir(self, recuo, texto):
+        self.linhas.append("    " * recuo + texto)
+        self.origem.append(self.linha_atual)
+
+    @staticmethod
+    def nome(variavel):
+        return f"{'l' if variavel.local else 'g'}_{variavel.nome}"
+
+    def gerar(self):
+        programa = self.programa
+        for linha in CABECALHO.format(nome=programa.nome).splitlines():
+            self.emitir(0, linha)
+        self.emitir(0, "")
+        self.emitir(0, "def programa(ler, escrever, dividir):")
+        for variavel in programa.globais:
+            self.emitir(1, f"{self.nome(variavel)} = {literal(variavel.inicial)}")
+        for rotina in programa.rotinas:
+            self.rotina(rotina)
+        self.comandos(programa.corpo, 1)
+        self.linha_atual = 0
+        self.emitir(1, f"return [{', '.join(self.nome(v) for v in programa.globais)}]")
+        return "\n".join(self.linhas) + "\n", self.origem
+
+    def rotina(self, rotina):
+        self.linha_atual = rotina.linha
+        parametros = ", ".join(self.nome(p) for p in rotina.parametros)
+        self.emitir(1, f"def r_{rotina.nome}({parametros}):")
+        # As globais que a rotina atribui são variáveis da função de fora
+        globais = sorted({self.nome(v) for v in atribuidas(rotina.corpo) if not v.local})
+        if globais:
+            self.emitir(2, f"nonlocal {', '.join(globais)}")
+        for variavel in rotina.locais[len(rotina.parametros):]:
+            self.emitir(2, f"{self.nome(variavel)} = {literal(variavel.inicial)}")
+        self.comandos(rotina.corpo, 2)
+
+    # Comandos
+
+    def comandos(self, comandos, recuo):
+        if not comandos:
+            self.emitir(recuo, "pass")
+        for comando in comandos:
+            self.linha_atual = comando.linha
+            self.comando(comando, recuo)
+
+    def comando(self, c, recuo):
+        tipo = type(c)
+        if tipo is Atribuicao:
+            self.emitir(recuo, f"{self.nome(c.destino)} = {self.expressao(c.valor)}")
+        elif tipo is Se:
+            self.emitir(recuo, f"if {self.condicao(c.condicao)}:")
+            self.comandos(c.entao, recuo + 1)
+            if c.senao:
+                self.linha_atual = c.linha
+                self.emitir(recuo, "else:")
+                self.comandos(c.senao, recuo + 1)
+        elif tipo is Enquanto:
+            self.emitir(recuo, f"while {self.condicao(c.condicao)}:")
+            self.comandos(c.corpo, recuo + 1)
+        elif tipo is Repita:
+            self.emitir(recuo, "while True:")
+            self.comandos(c.corpo, recuo + 1)
+            self.linha_atual = c.linha
+            self.emitir(recuo + 1, f"if {self.condicao(c.condicao)}:")
+            self.emitir(recuo + 2, "break")
+        elif tipo is Para:
+            # range() avalia o início uma vez e ignora atribuições à variável
+            # no corpo, como o contador escondido da máquina virtual
+            self.emitir(recuo, f"for {self.nome(c.variavel)} in range({self.expressao(c.inicio)}, {c.limite + 1}):")
+            self.comandos(c.corpo, recuo + 1)
+        elif tipo is Chamada:
+            argumentos = ", ".join(self.expressao(a) for a in c.argumentos)
+            self.emitir(recuo, f"r_{c.rotina.nome}({argumentos})")
+        elif tipo is Leitura:
+            for destino in c.destinos:
+                self.emitir(recuo, f"{self.nome(destino)} = ler({destino.tipo!r})")
+        elif tipo is Escrita:
+            valores = " ".join("{" + self.valor_escrito(v) + "}" for v in c.valores)
+            self.emitir(recuo, f'escrever(f"{valores}\\n")')
+        else:
+            raise TypeError(f"Comando desconhecido: {c!r}")
+
+    def valor_escrito(self, valor):
+        texto = self.expressao(valor)
+        return f"chr({texto})" if valor.tipo == CHAR else texto
+
+    def condicao(self, condicao):
+        esquerda = self.expressao(condicao.esquerda, ADITIVO)
+        direita = self.expressao(condicao.direita, ADITIVO)
+        return f"{esquerda} {COMPARACAO[condicao.relacao]} {direita}"
+
+    # Expressões
+
+    def expressao(self, e, minima=0):
+        """Texto de e, entre parênteses se a sua precedência for menor que minima."""
+        texto, precedencia = self.termo(e)
+        return f"({texto})" if precedencia < minima else texto
+
+    def termo(self, e):
+        """(texto, precedência) de e."""
+        tipo = type(e)
+        if tipo is Acesso:
+            return self.nome(e.variavel), ATOMO
+        if tipo is Constante:
+            texto = literal(e.valor)
+            return texto, UNARIO if texto.startswith("-") else ATOMO
+        if tipo is Binaria:
+            if e.operador == "/" and e.tipo != REAL:
+                return f"dividir({self.expressao(e.esquerda)}, {self.expressao(e.direita)})", ATOMO
+            precedencia = PRECEDENCIA[e.operador]
+            # Associativos à esquerda: o lado direito com a mesma precedência precisa de parênteses
+            esquerda = self.expressao(e.esquerda, precedencia)
+            direita = self.expressao(e.direita, precedencia + 1)
+            return f"{esquerda} {e.operador} {direita}", precedencia
+        if tipo is Negacao:
+            return f"-{self.expressao(e.operando, UNARIO)}", UNARIO
+        if tipo is ParaReal:
+            return f"float({self.expressao(e.operando)})", ATOMO
+        raise TypeError(f"Expressão desconhecida: {e!r}")
+
+
+def gerar_python(programa):
+    """
+    CodigoPython da árvore abstrata (arvore_abstrata.Programa) de um
+    programa: as rotinas viram funções, for e while viram laços do Python e
+    as variáveis, variáveis locais. Levanta ErroCompilacao se a fonte
+    passar dos limites do compilador do Python (blocos aninhados demais).
+    """
+    fonte, linhas = _Gerador(programa).gerar()
+    try:
+        codigo = compile(fonte, f"<lalg {programa.nome}>", "exec")
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        raise ErroCompilacao(f"Erro de compilação: programa grande demais para o gerador Python ({e})") from None
+    return CodigoPython(programa.nome, fonte, codigo, linhas)
+
+
+def executar_python(objeto, entrada=None, saida=None):
+    """
+    Executa um CodigoPython, com read e write como os da máquina virtual;
+    devolve as globais no fim do programa. Os erros viram ErroExecucao com
+    a linha do programa LALG.
+    """
+    ambiente = {"__name__": f"lalg_{objeto.nome}"}
+    exec(objeto.codigo, ambiente)
+    saida = sys.stdout if saida is None else saida
+    # Cada chamada LALG é uma chamada Python: o limite é o da máquina virtual
+    limite = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limite, LIMITE_CHAMADAS + 100))
+    try:
+        return ambiente["programa"](Entrada(entrada).ler, saida.write, dividir_inteiro)
+    except (ErroExecucao, *ERROS_PYTHON) as e:
+        mensagem = e.mensagem if isinstance(e, ErroExecucao) else ERROS_PYTHON[type(e)]
+        raise ErroExecucao(mensagem, objeto.linha(_linha_python(e, objeto.codigo.co_filename))) from None
+    finally:
+        sys.setrecursionlimit(limite)
+
+
+def _linha_python(excecao, arquivo):
+    """Linha, na fonte gerada, do último quadro do traceback que é dela."""
+    linha = 0
+    quadro = excecao.__traceback__
+    while quadro is not None:
+        if quadro.tb_frame.f_code.co_filename == arquivo:
+            linha = quadro.tb_lineno
+        quadro = quadro.tb_next
+    return linha
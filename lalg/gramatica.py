@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import sys
+
+EPSILON = 'ε'
+MARCADOR_FIM = '$'
+
+# Caminhos com os.path: pathlib (e o urllib que ele importa) pesaria na
+# partida de quem só quer analisar
+ARQUIVO_GRAMATICA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gramatica.bnf")
+# Pasta dos arquivos gerados (tabela, analisador descendente); a variável de
+# ambiente LALG_CACHE troca a pasta padrão, para não escrever junto do código
+PASTA_CACHE = os.environ.get("LALG_CACHE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+
+# Entra no hash do cache: mudar a construção da tabela ou o formato do
+# arquivo de cache invalida as tabelas já geradas
+VERSAO_GERADOR = 1
+
+
+class Gramatica:
+    """
+    Gramática lida de um arquivo BNF: `regras` vai de cada não-terminal às
+    suas alternativas (tuplas de símbolos; a produção vazia é (ε,)), na ordem
+    do arquivo. `terminais` está na ordem da primeira ocorrência.
+    """
+
+    def __init__(self, inicial, regras, terminais):
+        self.inicial = inicial
+        self.regras = regras
+        self.terminais = terminais
+
+    @property
+    def nao_terminais(self):
+        return list(self.regras)
+
+
+class Conflito:
+    """Duas produções de um não-terminal disputando a mesma célula da tabela."""
+
+    def __init__(self, nao_terminal, terminal, mantida, descartada):
+        self.nao_terminal = nao_terminal
+        self.terminal = terminal
+        self.mantida = mantida
+        self.descartada = descartada
+
+    def __str__(self):
+        return (f"Conflito LL(1) em {self.nao_terminal} com '{self.terminal}': "
+                f"{' '.join(self.mantida)} | {' '.join(self.descartada)} "
+                f"(mantida a primeira)")
+
+
+def ler_gramatica(texto):
+    """
+    Lê a gramática no formato de gramatica.bnf:
+        NAO_TERMINAL ::= simbolo simbolo ...
+                       | outra alternativa
+    com comentários de linha iniciados por '#'. Os não-terminais são os
+    nomes à esquerda de '::='; qualquer outro símbolo é terminal.
+    """
+    regras = {}
+    atual = None
+    for numero, linha in enumerate(texto.splitlines(), start=1):
+        linha = linha.strip()
+        if not linha or linha.startswith('#'):
+            continue
+        if '::=' in linha:
+            atual, corpo = (parte.strip() for parte in linha.split('::=', 1))
+            if not atual or ' ' in atual:
+                raise ValueError(f"Linha {numero}: nome de regra inválido '{atual}'")
+            if atual in regras:
+                raise ValueError(f"Linha {numero}: regra {atual} definida duas vezes")
+            regras[atual] = []
+        elif linha.startswith('|') and atual is not None:
+            corpo = linha[1:]
+        else:
+            raise ValueError(f"Linha {numero}: esperado 'NOME ::= ...' ou '| ...'")
+        simbolos = tuple(corpo.split())
+        if not simbolos:
+            raise ValueError(f"Linha {numero}: alternativa vazia (use {EPSILON})")
+        if EPSILON in simbolos and len(simbolos) > 1:
+            raise ValueError(f"Linha {numero}: {EPSILON} deve aparecer sozinho na alternativa")
+        regras[atual].append(simbolos)
+
+    if not regras:
+        raise ValueError("Gramática vazia")
+    terminais = []
+    for alternativas in regras.values():
+        for producao in alternativas:
+            for simbolo in producao:
+                if simbolo != EPSILON and simbolo not in regras and simbolo not in terminais:
+                    terminais.append(simbolo)
+    return Gramatica(next(iter(regras)), regras, terminais)
+
+
+def first_da_sequencia(simbolos, first):
+    """FIRST de uma sequência de símbolos; inclui ε se toda ela for anulável."""
+    resultado = set()
+    for simbolo in simbolos:
+        if simbolo == EPSILON:
+            continue
+        if simbolo not in first:  # terminal
+            resultado.add(simbolo)
+            return resultado
+        resultado |= first[simbolo] - {EPSILON}
+        if EPSILON not in first[simbolo]:
+            return resultado
+    resultado.add(EPSILON)
+    return resultado
+
+
+def calcular_first(gramatica):
+    """FIRST de cada não-terminal, por ponto fixo."""
+    first = {nt: set() for nt in gramatica.regras}
+    mudou = True
+    while mudou:
+        mudou = False
+        for nt, alternativas in gramatica.regras.items():
+            for producao in alternativas:
+                novos = first_da_sequencia(producao, first) - first[nt]
+                if novos:
+                    first[nt] |= novos
+                    mudou = True
+    return first
+
+
+def calcular_follow(gramatica, first):
+    """FOLLOW de cada não-terminal, por ponto fixo; o inicial é seguido de '$'."""
+    follow = {nt: set() for nt in gramatica.regras}
+    follow[gramatica.inicial].add(MARCADOR_FIM)
+    mudou = True
+    while mudou:
+        mudou = False
+        for nt, alternativas in gramatica.regras.items():
+            for producao in alternativas:
+                for i, simbolo in enumerate(producao):
+                    if simbolo not in follow:
+                        continue
+                    resto = first_da_sequencia(producao[i + 1:], first)
+                    novos = resto - {EPSILON}
+                    if EPSILON in resto:
+                        novos |= follow[nt]
+                    novos -= follow[simbolo]
+                    if novos:
+                        follow[simbolo] |= novos
+                        mudou = True
+    return follow
+
+
+def gerar_tabela(gramatica):
+    """
+    Monta a tabela preditiva {nao_terminal: {terminal: producao}} a partir de
+    FIRST/FOLLOW. Devolve (tabela, conflitos): quando duas alternativas caem
+    na mesma célula, fica a que vem primeiro na gramática e o conflito é
+    registrado. As células de cada linha seguem a ordem dos terminais.
+    """
+    first = calcular_first(gramatica)
+    follow = calcular_follow(gramatica, first)
+    ordem = {t: i for i, t in enumerate(gramatica.terminais + [MARCADOR_FIM])}
+
+    tabela = {}
+    conflitos = []
+    for nt, alternativas in gramatica.regras.items():
+        linha = {}
+        for producao in alternativas:
+            seleciona = first_da_sequencia(producao, first)
+            if EPSILON in seleciona:
+                seleciona = (seleciona - {EPSILON}) | follow[nt]
+            for terminal in sorted(seleciona, key=ordem.__getitem__):
+                if terminal in linha:
+                    conflitos.append(Conflito(nt, terminal, linha[terminal], producao))
+                else:
+                    linha[terminal] = producao
+        tabela[nt] = {t: list(linha[t]) for t in sorted(linha, key=ordem.__getitem__)}
+    return tabela, conflitos
+
+
+def chave_cache(texto, terminais_extra=()):
+    """Hash do texto da gramática (e do que mais muda a tabela gerada)."""
+    h = hashlib.sha256()
+    h.update(f"{VERSAO_GERADOR}\n{' '.join(terminais_extra)}\n".encode("utf-8"))
+    h.update(texto.encode("utf-8"))
+    return h.hexdigest()
+
+
+def gerar(texto, terminais_extra=()):
+    """
+    Gera a tabela de uma gramática em texto, no formato guardado no cache:
+    {'inicial', 'terminais', 'nao_terminais', 'tabela', 'conflitos'}.
+    terminais_extra entram na lista de terminais mesmo sem aparecer na
+    gramática (ex.: todos os tipos de token do léxico), sempre antes de '$'.
+    """
+    gramatica = ler_gramatica(texto)
+    tabela, conflitos = gerar_tabela(gramatica)
+    terminais = list(gramatica.terminais)
+    for terminal in terminais_extra:
+        if terminal not in terminais and terminal != MARCADOR_FIM:
+            terminais.append(terminal)
+    terminais.append(MARCADOR_FIM)
+    return {
+        'inicial': gramatica.inicial,
+        'terminais': terminais,
+        'nao_terminais': gramatica.nao_terminais,
+        'tabela': tabela,
+        'conflitos': [str(c) for c in conflitos],
+    }
+
+
+def carregar_tabela(caminho=ARQUIVO_GRAMATICA, terminais_extra=(), pasta_cache=PASTA_CACHE):
+    """
+    Tabela da gramática em caminho, lida do cache em disco quando já foi
+    gerada para esse mesmo texto (o nome do arquivo é o hash da gramática).
+    Se o cache não existe, gera a tabela e tenta gravá-lo; uma pasta sem
+    permissão de escrita só faz a tabela ser gerada de novo na próxima vez.
+    """
+    with open(caminho, encoding="utf-8") as f:
+        texto = f.read()
+    arquivo_cache = os.path.join(pasta_cache, f"gramatica-{chave_cache(texto, terminais_extra)[:32]}.json")
+    try:
+        with open(arquivo_cache, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    dados = gerar(texto, terminais_extra)
+    try:
+        os.makedirs(pasta_cache, exist_ok=True)
+        temporario = f"{arquivo_cache[:-len('.json')]}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(json.dumps(dados, ensure_ascii=False))
+        os.replace(temporario, arquivo_cache)
+    except OSError:
+        pass
+    return dados
+
+
+def main(argv):
+    """python -m lalg.gramatica [arquivo.bnf]: mostra FIRST/FOLLOW e os conflitos LL(1)."""
+    caminho = argv[1] if len(argv) > 1 else ARQUIVO_GRAMATICA
+    with open(caminho, encoding="utf-8") as f:
+        gramatica = ler_gramatica(f.read())
+    first = calcular_first(gramatica)
+    follow = calcular_follow(gramatica, first)
+    tabela, conflitos = gerar_tabela(gramatica)
+
+    largura = max(len(nt) for nt in gramatica.regras)
+    print(f"{len(gramatica.nao_terminais)} não-terminais, {len(gramatica.terminais)} terminais, "
+          f"{sum(len(linha) for linha in tabela.values())} células")
+    print("\nFIRST")
+    for nt in gramatica.regras:
+        print(f"  {nt:<{largura}}  {' '.join(sorted(first[nt]))}")
+    print("\nFOLLOW")
+    for nt in gramatica.regras:
+        print(f"  {nt:<{largura}}  {' '.join(sorted(follow[nt]))}")
+    print()
+    if not conflitos:
+        print("Gramática LL(1): nenhum conflito")
+    for conflito in conflitos:
+        print(conflito)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
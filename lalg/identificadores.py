@@ -0,0 +1,62 @@
+from itertools import islice
+
+# Símbolo dos tokens que não são identificadores
+SEM_SIMBOLO = -1
+
+
+class TabelaIdentificadores:
+    """
+    Nomes de identificadores internados numa análise: cada nome distinto
+    ganha um id (0, 1, 2... na ordem em que aparece) e é guardado uma vez
+    só, por mais que se repita no texto. As fases seguintes comparam e
+    hasheiam os ids em vez dos lexemas.
+
+    ids é o dicionário nome -> id; os motores do léxico o preenchem
+    direto, e a lista nomes (id -> nome) é completada quando consultada.
+    Sobre fontes em bytes (lexico_mmap), os nomes são bytes.
+    """
+
+    __slots__ = ("ids", "_nomes")
+
+    def __init__(self, nomes=()):
+        self.ids = {}
+        self._nomes = []
+        for nome in nomes:
+            self.internar(nome)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, nome):
+        return nome in self.ids
+
+    def __repr__(self):
+        return f"<TabelaIdentificadores: {len(self)} nomes>"
+
+    def internar(self, nome):
+        """Id de nome, criado se ele ainda não existir."""
+        ids = self.ids
+        simbolo = ids.get(nome)
+        if simbolo is None:
+            simbolo = ids[nome] = len(ids)
+        return simbolo
+
+    def canonico(self, nome):
+        """A cópia guardada de nome (igual a ele), internando-o se preciso."""
+        self.internar(nome)
+        return self.nome(self.ids[nome])
+
+    @property
+    def nomes(self):
+        """Lista id -> nome."""
+        nomes = self._nomes
+        if len(nomes) < len(self.ids):
+            # dict preserva a ordem de inserção, que é a dos ids
+            nomes.extend(islice(self.ids, len(nomes), None))
+        return nomes
+
+    def nome(self, simbolo):
+        nomes = self._nomes
+        if simbolo >= len(nomes):
+            nomes = self.nomes
+        return nomes[simbolo]
@@ -0,0 +1,163 @@
+from .analisador_lexico_texto import (CODIGO_DUPLO, CODIGO_IDENTIFICADOR, CODIGO_INTEIRO, CODIGO_REAL,
+                                     CODIGO_RESERVADA, CODIGO_SIMPLES, G_BLOCO_ABERTO, G_COMENTARIO_BLOCO,
+                                     G_COMENTARIO_LINHA, G_DUPLO, G_FIM, G_IDENTIFICADOR, G_INTEIRO, G_QUEBRA, G_REAL,
+                                     G_REAL_MAL_FORMADO, G_SIMPLES, LIMITE_IDENTIFICADOR, LIMITE_INTEIRO,
+                                     PADRAO_MESTRE)
+from .diagnosticos import (CARACTERE_INVALIDO, COMENTARIO_NAO_FECHADO, IDENTIFICADOR_LONGO, OVERFLOW_INTEIRO,
+                          REAL_MAL_FORMADO, Diagnostico)
+
+
+def varrer_linha(linha, em_comentario):
+    """
+    Analisa uma única linha partindo do estado dado (True = a linha começa
+    dentro de um comentário /* */). Devolve (tokens, erros, em_comentario no
+    fim da linha). Os tokens saem sem o número da linha, como
+    (codigo, lexema, coluna_ini, coluna_fim), e os erros como
+    (codigo_erro, coluna, coluna_fim, detalhe): o número da linha muda
+    quando linhas são inseridas acima.
+    """
+    tokens = []
+    erros = []
+
+    if em_comentario:
+        # Fechado o comentário, o motor clássico ignora o resto da linha
+        return tokens, erros, "*/" not in linha
+
+    for m in PADRAO_MESTRE.finditer(linha):
+        grupo = m.lastindex
+
+        if grupo == G_IDENTIFICADOR:
+            ident = m[grupo]
+            ini = m.start(grupo) + 1
+            if len(ident) > LIMITE_IDENTIFICADOR:
+                erros.append((IDENTIFICADOR_LONGO, ini, ini + len(ident) - 1, ""))
+                continue
+            tokens.append((CODIGO_RESERVADA.get(ident, CODIGO_IDENTIFICADOR), ident, ini, ini + len(ident) - 1))
+
+        elif grupo == G_SIMPLES:
+            c = m[grupo]
+            ini = m.start(grupo) + 1
+            tokens.append((CODIGO_SIMPLES[c], c, ini, ini))
+
+        elif grupo == G_INTEIRO:
+            num = m[grupo]
+            ini = m.start(grupo) + 1
+            if len(num) >= 10 and int(num) > LIMITE_INTEIRO:
+                erros.append((OVERFLOW_INTEIRO, ini, ini + len(num) - 1, num))
+                continue
+            tokens.append((CODIGO_INTEIRO, num, ini, ini + len(num) - 1))
+
+        elif grupo == G_DUPLO:
+            d = m[grupo]
+            ini = m.start(grupo) + 1
+            tokens.append((CODIGO_DUPLO[d], d, ini, ini + 1))
+
+        elif grupo == G_REAL:
+            num = m[grupo]
+            ini = m.start(grupo) + 1
+            tokens.append((CODIGO_REAL, num, ini, ini + len(num) - 1))
+
+        elif grupo == G_COMENTARIO_LINHA or grupo == G_COMENTARIO_BLOCO or grupo == G_FIM or grupo == G_QUEBRA:
+            continue
+
+        elif grupo == G_REAL_MAL_FORMADO:
+            erros.append((REAL_MAL_FORMADO, m.start(grupo) + 1, m.end(grupo), ""))
+
+        elif grupo == G_BLOCO_ABERTO:
+            # Comentário aberto e não fechado nesta linha
+            return tokens, erros, True
+
+        else:
+            ini = m.start(grupo) + 1
+            erros.append((CARACTERE_INVALIDO, ini, ini, m[grupo]))
+
+    return tokens, erros, False
+
+
+class AnalisadorLexicoIncremental:
+    """
+    Analisador léxico para buffers de editor. Guarda, para cada linha, os
+    tokens, os erros e o estado no início da linha (dentro ou fora de um
+    comentário /* */). Uma edição reanalisa só as linhas editadas e as
+    seguintes cujo estado inicial mudou, e encaixa o resultado no lugar das
+    linhas antigas. O resultado é sempre igual ao do motor clássico de
+    AnalisadorLexicoTexto sobre as mesmas linhas (self.linhas).
+    """
+
+    def __init__(self, texto=""):
+        self.linhas = []
+        self.tokens_linha = []
+        self.erros_linha = []
+        # estado[i] = linha i começa dentro de um comentário; estado[-1] é o
+        # estado ao fim do texto (comentário não fechado)
+        self.estado = [False]
+        self.linhas_reanalisadas = 0
+        self.aplicar_edicao(1, 0, texto)
+
+    def aplicar_edicao(self, linha_ini, linha_fim, texto):
+        """
+        Substitui as linhas linha_ini..linha_fim (1-based, inclusive) pelas
+        linhas de texto. Com linha_fim = linha_ini - 1 apenas insere; com
+        texto vazio apenas remove. Devolve quantas linhas foram reanalisadas.
+        """
+        if not 1 <= linha_ini <= linha_fim + 1 <= len(self.linhas) + 1:
+            raise IndexError(f"Intervalo de linhas inválido: {linha_ini}..{linha_fim}")
+        return self.substituir_linhas(linha_ini - 1, linha_fim, texto.splitlines())
+
+    def sincronizar(self, texto):
+        """
+        Atualiza o analisador para o conteúdo completo do editor, localizando
+        o trecho alterado pelas linhas iguais no começo e no fim.
+        """
+        novas = texto.splitlines()
+        antigas = self.linhas
+        limite = min(len(antigas), len(novas))
+        ini = 0
+        while ini < limite and antigas[ini] == novas[ini]:
+            ini += 1
+        fim = 0
+        while fim < limite - ini and antigas[-1 - fim] == novas[-1 - fim]:
+            fim += 1
+        return self.substituir_linhas(ini, len(antigas) - fim, novas[ini:len(novas) - fim])
+
+    def substituir_linhas(self, a, b, novas):
+        """Troca self.linhas[a:b] por novas e reanalisa o necessário."""
+        k = len(novas)
+        s = self.estado[a]  # o estado no início da linha a não muda
+
+        self.linhas[a:b] = novas
+        self.tokens_linha[a:b] = [None] * k
+        self.erros_linha[a:b] = [None] * k
+        self.estado[a:b] = [None] * k
+
+        # Segue reanalisando enquanto o estado inicial de uma linha não
+        # editada for diferente do que foi usado para analisá-la.
+        total = len(self.linhas)
+        i = a
+        while i < total:
+            if i >= a + k and self.estado[i] == s:
+                break
+            self.estado[i] = s
+            self.tokens_linha[i], self.erros_linha[i], s = varrer_linha(self.linhas[i], s)
+            i += 1
+        else:
+            self.estado[total] = s
+
+        self.linhas_reanalisadas = i - a
+        return self.linhas_reanalisadas
+
+    def tokens(self):
+        """Gera os tokens de todas as linhas como 5-tuplas, já numeradas."""
+        for num_linha, tokens in enumerate(self.tokens_linha, 1):
+            for codigo, lexema, coluna_ini, coluna_fim in tokens:
+                yield (codigo, lexema, num_linha, coluna_ini, coluna_fim)
+
+    def erros(self):
+        """Lista de Diagnostico de todas as linhas, já numerados."""
+        erros = [Diagnostico(codigo, num_linha, coluna, coluna_fim, detalhe)
+                 for num_linha, erros_linha in enumerate(self.erros_linha, 1)
+                 for codigo, coluna, coluna_fim, detalhe in erros_linha]
+        if self.estado[-1]:
+            erros.append(Diagnostico(COMENTARIO_NAO_FECHADO, len(self.linhas) + 1))
+        return erros
+
@@ -0,0 +1,183 @@
+import mmap
+import re
+
+from .analisador_lexico_texto import (G_BLOCO_ABERTO, G_COMENTARIO_BLOCO, G_COMENTARIO_LINHA, G_DUPLO, G_FIM,
+                                     G_IDENTIFICADOR, G_INTEIRO, G_QUEBRA, G_REAL, G_REAL_MAL_FORMADO, G_SIMPLES,
+                                     LIMITE_IDENTIFICADOR, LIMITE_INTEIRO, TIPO_IDENTIFICADOR, TIPO_INTEIRO,
+                                     TIPO_REAL)
+from .buffer_tokens import BufferTokensBytes
+from .diagnosticos import (CARACTERE_INVALIDO, COMENTARIO_NAO_FECHADO, IDENTIFICADOR_LONGO, OVERFLOW_INTEIRO,
+                          REAL_MAL_FORMADO, LimiteDeErros, ListaDiagnosticos)
+from .identificadores import SEM_SIMBOLO
+from .tipos_token import TIPO_DUPLO, TIPO_RESERVADA, TIPO_SIMPLES
+
+# Tabelas do motor compilado com chaves em bytes (o índice de um byte é int)
+TIPO_SIMPLES_BYTES = {ord(c): int(t) for c, t in TIPO_SIMPLES.items()}
+TIPO_DUPLO_BYTES = {s.encode(): int(t) for s, t in TIPO_DUPLO.items()}
+TIPO_RESERVADA_BYTES = {p.encode(): int(t) for p, t in TIPO_RESERVADA.items()}
+
+# As quebras de str.splitlines() codificadas em UTF-8 (\x85, \u2028 e
+# \u2029 ocupam mais de um byte)
+QUEBRA_BYTES = rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]"
+NAO_QUEBRA_BYTES = rb"(?:[^\n\r\x0b\x0c\x1c\x1d\x1e\xc2\xe2]|\xc2(?!\x85)|\xe2(?!\x80[\xa8\xa9]))"
+
+# Mesmo padrão mestre (e mesmos grupos) de analisador_lexico_texto, em bytes.
+# Um caractere inválido fora do ASCII ocupa a sequência UTF-8 inteira.
+PADRAO_MESTRE_BYTES = re.compile(
+    rb"[ \t]*(?:"
+    rb"(" + QUEBRA_BYTES + rb")"
+    rb"|(//" + NAO_QUEBRA_BYTES + rb"*)"
+    rb"|(/\*.*?\*/" + NAO_QUEBRA_BYTES + rb"*)"
+    rb"|(/\*)"
+    rb"|(<>|>=|<=|:=)"
+    rb"|([0-9]+\.[0-9]+)"
+    rb"|([0-9]+\.)"
+    rb"|([0-9]+)"
+    rb"|([A-Za-z][A-Za-z0-9_]*)"
+    rb"|([()*/+\-><=$;:,.])"
+    rb"|([\xc0-\xff][\x80-\xbf]*|.)"
+    rb"|(\Z))",
+    re.DOTALL,
+)
+PADRAO_QUEBRA_BYTES = re.compile(QUEBRA_BYTES)
+
+
+def varrer_bytes(fonte, tokens, erros):
+    """
+    Versão em bytes de varrer_colunar: varre a fonte inteira (bytes ou mmap)
+    gravando em tokens (BufferTokensBytes) offsets e colunas em bytes; os
+    identificadores são internados como bytes.
+    Devolve None, ou (linha, offset do início da linha) de um comentário /*
+    que não foi fechado.
+    """
+    tipos = tokens.tipos.append
+    inicios = tokens.inicios.append
+    fins = tokens.fins.append
+    linhas = tokens.linhas.append
+    colunas = tokens.colunas.append
+    simbolos = tokens.simbolos.append
+    ids = tokens.identificadores.ids
+    buscar_id = ids.get
+
+    num_linha = 1
+    inicio_linha = 0
+    simbolo = SEM_SIMBOLO
+
+    for m in PADRAO_MESTRE_BYTES.finditer(fonte):
+        grupo = m.lastindex
+
+        if grupo == G_IDENTIFICADOR:
+            ini, fim = m.span(grupo)
+            if fim - ini > LIMITE_IDENTIFICADOR:
+                erros.reportar(IDENTIFICADOR_LONGO, num_linha, ini - inicio_linha + 1, fim - inicio_linha)
+                continue
+            ident = m[grupo]
+            tipo = TIPO_RESERVADA_BYTES.get(ident)
+            if tipo is None:
+                tipos(TIPO_IDENTIFICADOR)
+                simbolo = buscar_id(ident)
+                if simbolo is None:
+                    simbolo = ids[ident] = len(ids)
+            else:
+                tipos(tipo)
+
+        elif grupo == G_SIMPLES:
+            ini, fim = m.span(grupo)
+            tipos(TIPO_SIMPLES_BYTES[fonte[ini]])
+
+        elif grupo == G_QUEBRA:
+            num_linha += 1
+            inicio_linha = m.end()
+            continue
+
+        elif grupo == G_INTEIRO:
+            ini, fim = m.span(grupo)
+            if fim - ini >= 10 and int(m[grupo]) > LIMITE_INTEIRO:
+                erros.reportar(OVERFLOW_INTEIRO, num_linha, ini - inicio_linha + 1, fim - inicio_linha,
+                               m[grupo].decode())
+                continue
+            tipos(TIPO_INTEIRO)
+
+        elif grupo == G_DUPLO:
+            ini, fim = m.span(grupo)
+            tipos(TIPO_DUPLO_BYTES[m[grupo]])
+
+        elif grupo == G_REAL:
+            ini, fim = m.span(grupo)
+            tipos(TIPO_REAL)
+
+        elif grupo == G_COMENTARIO_LINHA or grupo == G_FIM:
+            continue
+
+        elif grupo == G_COMENTARIO_BLOCO:
+            for q in PADRAO_QUEBRA_BYTES.finditer(fonte, m.start(grupo), m.end()):
+                num_linha += 1
+                inicio_linha = q.end()
+            continue
+
+        elif grupo == G_REAL_MAL_FORMADO:
+            ini, fim = m.span(grupo)
+            erros.reportar(REAL_MAL_FORMADO, num_linha, ini - inicio_linha + 1, fim - inicio_linha)
+            continue
+
+        elif grupo == G_BLOCO_ABERTO:
+            return num_linha, inicio_linha
+
+        else:
+            ini = m.start(grupo) - inicio_linha + 1
+            erros.reportar(CARACTERE_INVALIDO, num_linha, ini, m.end(grupo) - inicio_linha,
+                           m[grupo].decode("utf-8", errors="replace"))
+            continue
+
+        inicios(ini)
+        fins(fim)
+        linhas(num_linha)
+        colunas(ini - inicio_linha + 1)
+        simbolos(simbolo)
+        simbolo = SEM_SIMBOLO
+
+    return None
+
+
+def abrir_mmap(caminho):
+    """
+    Mapeia o arquivo em memória, somente leitura. O descritor pode ser
+    fechado logo em seguida: o mapeamento continua válido. Arquivos vazios
+    não podem ser mapeados e viram b"".
+    """
+    with open(caminho, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+def analisar_arquivo_mmap(caminho, max_erros=None):
+    """
+    Análise léxica direto sobre o mmap do arquivo (ASCII/UTF-8), sem
+    decodificá-lo para str nem quebrá-lo em linhas: a memória residente do
+    texto fica por conta do cache de páginas do sistema. Devolve (tokens,
+    erros), com tokens num BufferTokensBytes que mantém o mapeamento aberto.
+    Tipos, linhas e erros são os mesmos do motor compilado; inícios, fins e
+    colunas são contados em bytes (iguais aos de caracteres em linhas ASCII).
+    max_erros limita os erros como em AnalisadorLexicoTexto.
+    """
+    fonte = abrir_mmap(caminho)
+    tokens = BufferTokensBytes(fonte)
+    erros = ListaDiagnosticos(max_erros)
+
+    try:
+        aberto = varrer_bytes(fonte, tokens, erros)
+        if aberto is not None:
+            # Conta as linhas restantes como str.splitlines(): a última só
+            # existe se não estiver vazia.
+            num_linha, inicio_linha = aberto
+            for q in PADRAO_QUEBRA_BYTES.finditer(fonte, inicio_linha):
+                num_linha += 1
+                inicio_linha = q.end()
+            total = num_linha if inicio_linha < len(fonte) else num_linha - 1
+            erros.reportar(COMENTARIO_NAO_FECHADO, total + 1)
+    except LimiteDeErros:
+        pass
+
+    return tokens, erros
@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from .analisador_lexico_texto import PADRAO_QUEBRA, AnalisadorLexicoTexto, contar_linhas, contar_quebras, varrer_colunar
+from .buffer_tokens import BufferTokens
+from .diagnosticos import COMENTARIO_NAO_FECHADO, ListaDiagnosticos
+from .identificadores import SEM_SIMBOLO
+
+# Abaixo disso o custo de subir os processos supera o ganho
+TAMANHO_MINIMO_PARALELO = 1024 * 1024
+
+# Pedaços por processo: mais pedaços equilibram melhor a carga
+PEDACOS_POR_PROCESSO = 4
+
+# Texto completo, herdado pelos processos de trabalho (ver _iniciar_processo)
+_texto = None
+
+
+def dividir_em_pedacos(texto, quantidade):
+    """
+    Divide o texto em até quantidade pedaços [inicio, fim) alinhados ao início
+    de uma linha. Devolve (inicio, fim, num_linha) de cada pedaço, onde
+    num_linha é o número (1-based) da primeira linha do pedaço.
+    """
+    pedacos = []
+    inicio = 0
+    num_linha = 1
+    alvo = max(1, len(texto) // quantidade)
+    while inicio < len(texto):
+        q = PADRAO_QUEBRA.search(texto, min(inicio + alvo, len(texto)))
+        fim = q.end() if q else len(texto)
+        pedacos.append((inicio, fim, num_linha))
+        num_linha += contar_quebras(texto, inicio, fim)
+        inicio = fim
+    return pedacos
+
+
+def _iniciar_processo(texto):
+    global _texto
+    _texto = texto
+
+
+def _varrer_pedaco(pedaco):
+    """
+    Varre um pedaço supondo que ele começa fora de comentário (especulação
+    confirmada ou refeita por quem junta os resultados).
+    """
+    inicio, fim, num_linha = pedaco
+    tokens = BufferTokens()
+    erros = ListaDiagnosticos()
+    em_comentario = varrer_colunar(_texto, inicio, fim, num_linha, tokens, erros)
+    return _colunas(tokens) + (erros, em_comentario)
+
+
+def _colunas(tokens):
+    # Os ids dos identificadores são os da tabela do pedaço, que vai junto
+    return (tokens.tipos, tokens.inicios, tokens.fins, tokens.linhas, tokens.colunas, tokens.simbolos,
+            tokens.identificadores.nomes)
+
+
+def _revarrer_em_comentario(texto, pedaco):
+    """
+    Refaz um pedaço que na verdade começa dentro de um comentário /* aberto
+    num pedaço anterior: pula até o "*/" e o resto daquela linha, como o
+    motor clássico, e varre normalmente a partir da linha seguinte.
+    """
+    inicio, fim, num_linha = pedaco
+    tokens = BufferTokens()
+    erros = ListaDiagnosticos()
+    fecha = texto.find("*/", inicio, fim)
+    if fecha < 0:
+        return _colunas(tokens) + (erros, True)
+    q = PADRAO_QUEBRA.search(texto, fecha + 2, fim)
+    em_comentario = False
+    if q:
+        # A varredura começa na própria quebra, que avança a linha
+        num_linha += contar_quebras(texto, inicio, q.start())
+        em_comentario = varrer_colunar(texto, q.start(), fim, num_linha, tokens, erros)
+    return _colunas(tokens) + (erros, em_comentario)
+
+
+def analisar_paralelo(texto, processos=None, identificadores=None):
+    """
+    Análise léxica de um texto grande em vários processos. O texto é dividido
+    em pedaços alinhados por linha, cada um varrido pelo motor compilado num
+    ProcessPoolExecutor supondo que começa fora de comentário. Ao juntar os
+    resultados, em ordem, um pedaço que na verdade começa dentro de um
+    comentário /* */ é varrido de novo a partir do estado correto, e os ids
+    dos identificadores de cada pedaço são traduzidos para os da tabela do
+    texto inteiro (identificadores, se dada, ou uma tabela nova).
+    Devolve (tokens, erros) idênticos aos de AnalisadorLexicoTexto.analisar().
+    """
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(texto) < TAMANHO_MINIMO_PARALELO:
+        analisador = AnalisadorLexicoTexto(texto, motor="compilado")
+        if identificadores is not None:
+            analisador.identificadores = identificadores
+        analisador.analisar()
+        return analisador.tokens, analisador.erros
+
+    pedacos = dividir_em_pedacos(texto, processos * PEDACOS_POR_PROCESSO)
+    tokens = BufferTokens(texto, identificadores)
+    internar = tokens.identificadores.internar
+    erros = ListaDiagnosticos()
+    em_comentario = False
+
+    # Com fork, o texto passado ao initializer é herdado sem cópia
+    with ProcessPoolExecutor(processos, initializer=_iniciar_processo, initargs=(texto,)) as executor:
+        for pedaco, resultado in zip(pedacos, executor.map(_varrer_pedaco, pedacos)):
+            if em_comentario:
+                resultado = _revarrer_em_comentario(texto, pedaco)
+            tipos, inicios, fins, linhas, colunas, simbolos, nomes, erros_pedaco, em_comentario = resultado
+            tokens.tipos.extend(tipos)
+            tokens.inicios.extend(inicios)
+            tokens.fins.extend(fins)
+            tokens.linhas.extend(linhas)
+            tokens.colunas.extend(colunas)
+            # mapa[id no pedaço] = id no texto; o último item atende SEM_SIMBOLO (-1)
+            mapa = [internar(nome) for nome in nomes]
+            if mapa == list(range(len(mapa))):
+                tokens.simbolos.extend(simbolos)
+            else:
+                mapa.append(SEM_SIMBOLO)
+                tokens.simbolos.extend(array("i", map(mapa.__getitem__, simbolos)))
+            erros.extend(erros_pedaco)
+
+    if em_comentario:
+        erros.reportar(COMENTARIO_NAO_FECHADO, contar_linhas(texto) + 1)
+    return tokens, erros
+
+
+# Comparação com o motor sequencial: python -m lalg.lexico_paralelo arquivo.lalg [processos]
+if __name__ == "__main__":
+    with open(sys.argv[1], encoding="utf-8") as f:
+        fonte = f.read()
+    n_processos = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    t0 = time.perf_counter()
+    sequencial = AnalisadorLexicoTexto(fonte, motor="compilado")
+    sequencial.analisar()
+    t1 = time.perf_counter()
+    paralelo, erros_paralelo = analisar_paralelo(fonte, n_processos)
+    t2 = time.perf_counter()
+
+    iguais = (sequencial.tokens.tipos == paralelo.tipos and sequencial.tokens.inicios == paralelo.inicios
+              and sequencial.tokens.linhas == paralelo.linhas and sequencial.tokens.colunas == paralelo.colunas
+              and sequencial.tokens.simbolos == paralelo.simbolos
+              and sequencial.erros == erros_paralelo)
+    print(f"{len(paralelo)} tokens, {len(erros_paralelo)} erros, resultados idênticos: {iguais}")
+    print(f"sequencial: {t1 - t0:.3f}s   paralelo ({n_processos or os.cpu_count()} processos): {t2 - t1:.3f}s"
+          f"   aceleração: {(t1 - t0) / (t2 - t1):.2f}x")
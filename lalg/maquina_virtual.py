@@ -0,0 +1,279 @@
+import sys
+
+from .arvore_abstrata import CHAR, INTEGER
+from .bytecode import (CARACTERE, CARREGAR_GLOBAL, CARREGAR_LOCAL, CHAMAR, CONST, DIVIDIR_INTEIRO, DIVIDIR_REAL,
+                      ESCREVER, GUARDAR_GLOBAL, GUARDAR_LOCAL, LER, MULTIPLICAR, NEGAR, PARA_INICIO_GLOBAL,
+                      PARA_INICIO_LOCAL, PARA_PASSO_GLOBAL, PARA_PASSO_LOCAL, PARA_REAL, PARAR, RETORNAR, SALTAR,
+                      SALTAR_SE_DIFERENTE, SALTAR_SE_IGUAL, SALTAR_SE_MAIOR, SALTAR_SE_MAIOR_IGUAL, SALTAR_SE_MENOR,
+                      SALTAR_SE_MENOR_IGUAL, SALTAR_SE_NAO_DIFERENTE, SALTAR_SE_NAO_IGUAL, SALTAR_SE_NAO_MAIOR,
+                      SALTAR_SE_NAO_MAIOR_IGUAL, SALTAR_SE_NAO_MENOR, SALTAR_SE_NAO_MENOR_IGUAL, SOMAR, SUBTRAIR, TIPOS)
+
+# Chamadas aninhadas (recursão) antes de "estouro da pilha de chamadas"
+LIMITE_CHAMADAS = 100_000
+
+
+class ErroExecucao(Exception):
+    """Erro ao executar um programa: divisão por zero, entrada inválida... linha é a do programa."""
+
+    def __init__(self, mensagem, linha=0):
+        super().__init__(f"Erro de execução: {mensagem} na linha {linha}")
+        self.mensagem = mensagem
+        self.linha = linha
+
+
+# Exceções do Python que um programa pode causar, e a mensagem de cada uma
+ERROS_PYTHON = {
+    ZeroDivisionError: "divisão por zero",
+    OverflowError: "valor real fora do intervalo",
+    ValueError: "valor fora do intervalo em write",  # chr() de char, str() de inteiro enorme
+    RecursionError: "estouro da pilha de chamadas",
+}
+
+
+def palavras(entrada):
+    """Palavras (separadas por espaço ou quebra de linha) de um arquivo de texto, sob demanda."""
+    for linha in entrada:
+        yield from linha.split()
+
+
+class Entrada:
+    """Valores de read: as palavras de um arquivo de texto, convertidas para o tipo pedido."""
+
+    def __init__(self, arquivo=None):
+        self.palavras = palavras(sys.stdin if arquivo is None else arquivo)
+
+    def ler(self, tipo):
+        """Próximo valor do tipo (char vira o código do caractere); ErroExecucao sem linha se não houver."""
+        palavra = next(self.palavras, None)
+        if palavra is None:
+            raise ErroExecucao("fim da entrada em read")
+        try:
+            if tipo == CHAR:
+                return ord(palavra[0])
+            return int(palavra) if tipo == INTEGER else float(palavra)
+        except ValueError:
+            raise ErroExecucao(f"'{palavra}' não é um valor {tipo}") from None
+
+
+class MaquinaVirtual:
+    """
+    Máquina de pilha que executa um CodigoObjeto. read consome as palavras
+    da entrada (um arquivo de texto: stdin, por padrão); write escreve os
+    valores separados por espaço, uma linha por comando, na saída.
+
+    executar() devolve as globais no fim do programa; executadas conta as
+    instruções executadas (para medir instruções por segundo).
+    """
+
+    def __init__(self, objeto, entrada=None, saida=None):
+        self.objeto = objeto
+        self.entrada = Entrada(entrada)
+        self.saida = sys.stdout if saida is None else saida
+        self.executadas = 0
+        self.globais = None
+
+    def executar(self):
+        objeto = self.objeto
+        # Ler um item de uma lista não cria objeto novo; de um array, sim
+        codigo = objeto.codigo.tolist()
+        constantes = objeto.constantes
+        # (entrada, nº de parâmetros, valores iniciais dos outros locais)
+        rotinas = [(entrada, n, modelo[n:]) for _, entrada, n, modelo in objeto.rotinas]
+        comprimento = objeto.comprimentos()
+        escrever = self.saida.write
+        ler = self.entrada.ler
+
+        globais = list(objeto.globais)
+        locais = globais  # no corpo principal, os locais são as globais
+        pilha = []
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        quadros = []  # (endereço de retorno, locais) de cada chamada em curso
+        pc = 0
+        executadas = comprimento[0]
+
+        # A cadeia de ifs segue a ordem dos códigos, das instruções mais
+        # executadas para as menos; as de controle somam a executadas o
+        # comprimento do trecho em linha reta que começa no destino.
+        try:
+            while True:
+                op = codigo[pc]
+                if op == CARREGAR_LOCAL:
+                    empilhar(locais[codigo[pc + 1]])
+                    pc += 2
+                elif op == CONST:
+                    empilhar(constantes[codigo[pc + 1]])
+                    pc += 2
+                elif op == GUARDAR_LOCAL:
+                    locais[codigo[pc + 1]] = desempilhar()
+                    pc += 2
+                elif op == SOMAR:
+                    b = desempilhar()
+                    empilhar(desempilhar() + b)
+                    pc += 1
+                elif op == SUBTRAIR:
+                    b = desempilhar()
+                    empilhar(desempilhar() - b)
+                    pc += 1
+                elif op == MULTIPLICAR:
+                    b = desempilhar()
+                    empilhar(desempilhar() * b)
+                    pc += 1
+                elif op == SALTAR_SE_MENOR:
+                    b = desempilhar()
+                    pc = codigo[pc + 1] if desempilhar() < b else pc + 2
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_MENOR_IGUAL:
+                    b = desempilhar()
+                    pc = codigo[pc + 1] if desempilhar() <= b else pc + 2
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_MAIOR:
+                    b = desempilhar()
+                    pc = codigo[pc + 1] if desempilhar() > b else pc + 2
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_MAIOR_IGUAL:
+                    b = desempilhar()
+                    pc = codigo[pc + 1] if desempilhar() >= b else pc + 2
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_IGUAL:
+                    b = desempilhar()
+                    pc = codigo[pc + 1] if desempilhar() == b else pc + 2
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_DIFERENTE:
+                    b = desempilhar()
+                    pc = codigo[pc + 1] if desempilhar() != b else pc + 2
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_NAO_MENOR:
+                    b = desempilhar()
+                    pc = pc + 2 if desempilhar() < b else codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_NAO_MENOR_IGUAL:
+                    b = desempilhar()
+                    pc = pc + 2 if desempilhar() <= b else codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_NAO_MAIOR:
+                    b = desempilhar()
+                    pc = pc + 2 if desempilhar() > b else codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_NAO_MAIOR_IGUAL:
+                    b = desempilhar()
+                    pc = pc + 2 if desempilhar() >= b else codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_NAO_IGUAL:
+                    b = desempilhar()
+                    pc = pc + 2 if desempilhar() == b else codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == SALTAR_SE_NAO_DIFERENTE:
+                    b = desempilhar()
+                    pc = pc + 2 if desempilhar() != b else codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == PARA_PASSO_LOCAL:
+                    v = pilha[-1] + 1
+                    if v <= codigo[pc + 2]:
+                        pilha[-1] = locais[codigo[pc + 1]] = v
+                        pc = codigo[pc + 3]
+                    else:
+                        desempilhar()
+                        pc += 4
+                    executadas += comprimento[pc]
+                elif op == SALTAR:
+                    pc = codigo[pc + 1]
+                    executadas += comprimento[pc]
+                elif op == CARREGAR_GLOBAL:
+                    empilhar(globais[codigo[pc + 1]])
+                    pc += 2
+                elif op == GUARDAR_GLOBAL:
+                    globais[codigo[pc + 1]] = desempilhar()
+                    pc += 2
+                elif op == DIVIDIR_INTEIRO:
+                    b = desempilhar()
+                    a = desempilhar()
+                    q = a // b  # arvore_abstrata.dividir_inteiro, em linha
+                    empilhar(q + 1 if q < 0 and q * b != a else q)
+                    pc += 1
+                elif op == DIVIDIR_REAL:
+                    b = desempilhar()
+                    empilhar(desempilhar() / b)
+                    pc += 1
+                elif op == NEGAR:
+                    empilhar(-desempilhar())
+                    pc += 1
+                elif op == PARA_REAL:
+                    empilhar(float(desempilhar()))
+                    pc += 1
+                elif op == PARA_PASSO_GLOBAL:
+                    v = pilha[-1] + 1
+                    if v <= codigo[pc + 2]:
+                        pilha[-1] = globais[codigo[pc + 1]] = v
+                        pc = codigo[pc + 3]
+                    else:
+                        desempilhar()
+                        pc += 4
+                    executadas += comprimento[pc]
+                elif op == PARA_INICIO_LOCAL:
+                    v = pilha[-1]
+                    if v > codigo[pc + 2]:
+                        desempilhar()
+                        pc = codigo[pc + 3]
+                    else:
+                        locais[codigo[pc + 1]] = v
+                        pc += 4
+                    executadas += comprimento[pc]
+                elif op == PARA_INICIO_GLOBAL:
+                    v = pilha[-1]
+                    if v > codigo[pc + 2]:
+                        desempilhar()
+                        pc = codigo[pc + 3]
+                    else:
+                        globais[codigo[pc + 1]] = v
+                        pc += 4
+                    executadas += comprimento[pc]
+                elif op == CHAMAR:
+                    if len(quadros) >= LIMITE_CHAMADAS:
+                        raise ErroExecucao("estouro da pilha de chamadas", objeto.linha(pc))
+                    entrada, n, resto = rotinas[codigo[pc + 1]]
+                    quadros.append((pc + 2, locais))
+                    if n:
+                        # Os argumentos, no topo da pilha, são os primeiros locais
+                        locais = pilha[-n:]
+                        del pilha[-n:]
+                        locais += resto
+                    else:
+                        locais = resto.copy()
+                    pc = entrada
+                    executadas += comprimento[pc]
+                elif op == RETORNAR:
+                    pc, locais = quadros.pop()
+                    executadas += comprimento[pc]
+                elif op == LER:
+                    empilhar(ler(TIPOS[codigo[pc + 1]]))
+                    pc += 2
+                elif op == ESCREVER:
+                    n = codigo[pc + 1]
+                    valores = pilha[len(pilha) - n:]
+                    del pilha[len(pilha) - n:]
+                    escrever(" ".join(map(str, valores)) + "\n")
+                    pc += 2
+                elif op == CARACTERE:
+                    empilhar(chr(desempilhar()))
+                    pc += 1
+                elif op == PARAR:
+                    self.globais = globais
+                    return globais
+                else:
+                    raise ErroExecucao(f"instrução inválida {op} no endereço {pc}", objeto.linha(pc))
+        except ErroExecucao as e:
+            if e.linha:
+                raise
+            raise ErroExecucao(e.mensagem, objeto.linha(pc)) from None
+        except tuple(ERROS_PYTHON) as e:
+            raise ErroExecucao(ERROS_PYTHON[type(e)], objeto.linha(pc)) from None
+        finally:
+            self.executadas = executadas
+
+
+def executar(objeto, entrada=None, saida=None):
+    """Executa um CodigoObjeto; devolve a MaquinaVirtual (globais no fim e instruções executadas)."""
+    maquina = MaquinaVirtual(objeto, entrada, saida)
+    maquina.executar()
+    return maquina
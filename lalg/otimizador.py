@@ -0,0 +1,585 @@
+from .arvore_abstrata import (INTEGER, REAL, Acesso, Atribuicao, Binaria, Chamada, Constante, Enquanto, Escrita,
+                             Leitura, Negacao, Para, ParaReal, Repita, Se, Variavel, atribuidas, dividir_inteiro,
+                             percorrer, valor_inicial)
+from .bytecode import (CARREGAR_GLOBAL, CARREGAR_LOCAL, CONST, GUARDAR_GLOBAL, GUARDAR_LOCAL, NEGAR, OPERANDOS,
+                      PARA_INICIO_GLOBAL, PARA_INICIO_LOCAL, PARA_PASSO_GLOBAL, PARA_PASSO_LOCAL, PARA_REAL, SALTAR,
+                      SALTAR_SE_MENOR, SALTAR_SE_NAO_DIFERENTE)
+
+# Passos, na ordem em que rodam. Os quatro primeiros reescrevem a árvore
+# abstrata (a representação intermediária entre a análise e os dois
+# motores); peephole reescreve o bytecode da máquina virtual.
+PASSOS = ("constantes", "propagacao", "codigo_morto", "invariantes", "peephole")
+
+# Passos de cada nível de -O
+NIVEIS = {
+    0: (),
+    1: ("constantes", "codigo_morto", "peephole"),
+    2: PASSOS,
+}
+
+# Instruções com endereço de destino, e a posição dele entre os operandos
+DESTINO = {op: 0 for op in range(SALTAR_SE_MENOR, SALTAR_SE_NAO_DIFERENTE + 1)}
+DESTINO.update({SALTAR: 0, PARA_INICIO_LOCAL: 2, PARA_INICIO_GLOBAL: 2, PARA_PASSO_LOCAL: 2, PARA_PASSO_GLOBAL: 2})
+
+COMPARAR = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+class Efeito:
+    """O que um passo fez: nome do passo e quantas mudanças de que tipo."""
+
+    __slots__ = ("passo", "quantidade", "descricao")
+
+    def __init__(self, passo, quantidade, descricao):
+        self.passo = passo
+        self.quantidade = quantidade
+        self.descricao = descricao
+
+    def __str__(self):
+        return f"{self.passo}: {self.quantidade} {self.descricao}"
+
+    def __repr__(self):
+        return f"<Efeito {self}>"
+
+
+def passos_do_nivel(nivel):
+    """Passos do nível de -O; ValueError se o nível não existir."""
+    if nivel not in NIVEIS:
+        raise ValueError(f"nível de otimização inválido: {nivel} (entre {min(NIVEIS)} e {max(NIVEIS)})")
+    return NIVEIS[nivel]
+
+
+# Expressões
+
+def calcular(operador, a, b, tipo):
+    """a operador b como na execução; ArithmeticError (divisão por zero...) se ela falharia."""
+    if operador == "+":
+        return a + b
+    if operador == "-":
+        return a - b
+    if operador == "*":
+        return a * b
+    return a / b if tipo == REAL else dividir_inteiro(a, b)
+
+
+def constante(e, valor=None):
+    return type(e) is Constante and (valor is None or mesmo_valor(e.valor, valor))
+
+
+def mesmo_valor(a, b):
+    # 1 == 1.0 e 0.0 == -0.0, mas escritos são diferentes
+    return type(a) is type(b) and repr(a) == repr(b)
+
+
+def pura(e):
+    """
+    Se avaliar e nunca levanta erro de execução, para poder tirá-la de onde
+    estava. Divisão só com divisor constante não nulo; misturar inteiro e
+    real (ou converter) pode estourar com um inteiro enorme.
+    """
+    tipo = type(e)
+    if tipo is Constante or tipo is Acesso:
+        return True
+    if tipo is Negacao:
+        return pura(e.operando)
+    if tipo is ParaReal:
+        return type(e.operando) is Constante
+    if tipo is Binaria:
+        if e.esquerda.tipo != e.direita.tipo or not (pura(e.esquerda) and pura(e.direita)):
+            return False
+        return e.operador != "/" or (constante(e.direita) and e.direita.valor != 0)
+    return False
+
+
+def dobrar(e, contador, valores=None):
+    """
+    e com as constantes declaradas (e as variáveis de valor conhecido em
+    valores: Variavel -> valor) trocadas pelo valor, e as operações entre
+    constantes calculadas. Soma em contador[0] os nós eliminados.
+    """
+    tipo = type(e)
+    if tipo is Acesso:
+        variavel = e.variavel
+        if variavel.constante:
+            contador[0] += 1
+            return Constante(variavel.inicial, e.tipo)
+        if valores is not None and variavel in valores:
+            contador[0] += 1
+            return Constante(valores[variavel], e.tipo)
+        return e
+    if tipo is Binaria:
+        esquerda, direita = dobrar(e.esquerda, contador, valores), dobrar(e.direita, contador, valores)
+        if type(esquerda) is Constante and type(direita) is Constante:
+            try:
+                valor = calcular(e.operador, esquerda.valor, direita.valor, e.tipo)
+            except ArithmeticError:
+                pass  # fica para a execução, que dá o erro na linha certa
+            else:
+                contador[0] += 1
+                return Constante(valor, e.tipo)
+        if e.tipo == INTEGER and esquerda.tipo == INTEGER and direita.tipo == INTEGER:
+            # Identidades exatas entre inteiros: x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1
+            neutro = 1 if e.operador in ("*", "/") else 0
+            if constante(direita, neutro):
+                contador[0] += 1
+                return esquerda
+            if e.operador in ("+", "*") and constante(esquerda, neutro):
+                contador[0] += 1
+                return direita
+        return Binaria(e.operador, esquerda, direita, e.tipo)
+    if tipo is Negacao:
+        operando = dobrar(e.operando, contador, valores)
+        if type(operando) is Constante:
+            contador[0] += 1
+            return Constante(-operando.valor, e.tipo)
+        return Negacao(operando, e.tipo)
+    if tipo is ParaReal:
+        operando = dobrar(e.operando, contador, valores)
+        if type(operando) is Constante:
+            try:
+                valor = float(operando.valor)
+            except OverflowError:
+                pass
+            else:
+                contador[0] += 1
+                return Constante(valor, REAL)
+        return ParaReal(operando, REAL)
+    return e
+
+
+def variaveis_lidas(e, lidas):
+    tipo = type(e)
+    if tipo is Acesso:
+        lidas.add(e.variavel)
+    elif tipo is Binaria:
+        variaveis_lidas(e.esquerda, lidas)
+        variaveis_lidas(e.direita, lidas)
+    elif tipo is Negacao or tipo is ParaReal:
+        variaveis_lidas(e.operando, lidas)
+
+
+def expressoes(c):
+    """Expressões lidas diretamente pelo comando c (sem as dos comandos aninhados)."""
+    tipo = type(c)
+    if tipo is Atribuicao:
+        return [c.valor]
+    if tipo is Se or tipo is Enquanto or tipo is Repita:
+        return [c.condicao.esquerda, c.condicao.direita]
+    if tipo is Para:
+        return [c.inicio]
+    if tipo is Chamada:
+        return c.argumentos
+    if tipo is Escrita:
+        return c.valores
+    return []
+
+
+def mapear(c, f):
+    """Troca cada expressão e lida diretamente por c por f(e)."""
+    tipo = type(c)
+    if tipo is Atribuicao:
+        c.valor = f(c.valor)
+    elif tipo is Se or tipo is Enquanto or tipo is Repita:
+        c.condicao.esquerda = f(c.condicao.esquerda)
+        c.condicao.direita = f(c.condicao.direita)
+    elif tipo is Para:
+        c.inicio = f(c.inicio)
+    elif tipo is Chamada or tipo is Escrita:
+        lista = c.argumentos if tipo is Chamada else c.valores
+        lista[:] = [f(e) for e in lista]
+
+
+def condicao_constante(condicao):
+    """True/False se os dois lados da condição são constantes; None se não."""
+    if type(condicao.esquerda) is Constante and type(condicao.direita) is Constante:
+        return COMPARAR[condicao.relacao](condicao.esquerda.valor, condicao.direita.valor)
+    return None
+
+
+def chave(e):
+    """Forma comparável de uma expressão, para achar repetições."""
+    tipo = type(e)
+    if tipo is Constante:
+        return (type(e.valor), repr(e.valor))
+    if tipo is Acesso:
+        return id(e.variavel)
+    if tipo is Binaria:
+        return (e.operador, chave(e.esquerda), chave(e.direita))
+    return (tipo.__name__, chave(e.operando))
+
+
+# Passos sobre a árvore abstrata
+
+class _Otimizador:
+    def __init__(self, programa):
+        self.programa = programa
+        self.efeitos = self.globais_atribuidas()
+        self.temporarias = 0
+
+    def globais_atribuidas(self):
+        """Rotina -> globais que uma chamada dela pode atribuir, contando as rotinas que ela chama."""
+        diretas, chamadas = {}, {}
+        for rotina in self.programa.rotinas:
+            diretas[rotina] = {v for v in atribuidas(rotina.corpo) if not v.local}
+            chamadas[rotina] = {c.rotina for c in percorrer(rotina.corpo) if type(c) is Chamada}
+        mudou = True
+        while mudou:
+            mudou = False
+            for rotina in self.programa.rotinas:
+                for chamada in chamadas[rotina]:
+                    if not diretas[chamada] <= diretas[rotina]:
+                        diretas[rotina] |= diretas[chamada]
+                        mudou = True
+        return diretas
+
+    def modificadas(self, comandos):
+        """Variáveis que os comandos podem mudar, pelas rotinas que chamam inclusive."""
+        modificadas = set(atribuidas(comandos))
+        for c in percorrer(comandos):
+            if type(c) is Chamada:
+                modificadas |= self.efeitos[c.rotina]
+        return modificadas
+
+    def corpos(self):
+        """(rotina ou None, corpo) do programa principal e de cada rotina."""
+        yield None, self.programa.corpo
+        for rotina in self.programa.rotinas:
+            yield rotina, rotina.corpo
+
+    def trocar_corpo(self, rotina, corpo):
+        if rotina is None:
+            self.programa.corpo = corpo
+        else:
+            rotina.corpo = corpo
+
+    # constantes
+
+    def constantes(self):
+        contador = [0]
+        for rotina, corpo in self.corpos():
+            for c in percorrer(corpo):
+                mapear(c, lambda e: dobrar(e, contador))
+        return Efeito("constantes", contador[0], "expressões dobradas")
+
+    # propagacao
+
+    def propagacao(self):
+        contador = [0]
+        for rotina, corpo in self.corpos():
+            if rotina is None:
+                valores = {v: v.inicial for v in self.programa.globais}
+            else:
+                parametros = len(rotina.parametros)
+                valores = {v: v.inicial for v in rotina.locais[parametros:]}
+            self.propagar(corpo, valores, contador)
+        return Efeito("propagacao", contador[0], "usos de variável trocados pelo valor")
+
+    def propagar(self, comandos, valores, contador):
+        """Propaga os valores conhecidos (Variavel -> valor) pelos comandos; valores fica com os do fim."""
+        def substituir(e):
+            return dobrar(e, contador, valores)
+
+        for c in comandos:
+            tipo = type(c)
+            if tipo is Se:
+                mapear(c, substituir)
+                senao = dict(valores)
+                self.propagar(c.entao, valores, contador)
+                self.propagar(c.senao, senao, contador)
+                # Depois do if, só vale o que os dois ramos concordam
+                for variavel in list(valores):
+                    if variavel not in senao or not mesmo_valor(valores[variavel], senao[variavel]):
+                        del valores[variavel]
+            elif tipo is Enquanto or tipo is Repita or tipo is Para:
+                # Nada do que o laço muda é conhecido dentro dele nem depois
+                modificadas = self.modificadas(c.corpo)
+                if tipo is Para:
+                    c.inicio = substituir(c.inicio)
+                    modificadas.add(c.variavel)
+                for variavel in modificadas:
+                    valores.pop(variavel, None)
+                corpo = dict(valores)
+                if tipo is Enquanto:
+                    mapear(c, substituir)
+                self.propagar(c.corpo, corpo, contador)
+                if tipo is Repita:
+                    # A condição é avaliada no fim do corpo, e o laço só sai depois dela
+                    mapear(c, lambda e: dobrar(e, contador, corpo))
+                    valores.clear()
+                    valores.update(corpo)
+            else:
+                mapear(c, substituir)
+                if tipo is Atribuicao:
+                    if type(c.valor) is Constante:
+                        valores[c.destino] = c.valor.valor
+                    else:
+                        valores.pop(c.destino, None)
+                elif tipo is Leitura:
+                    for destino in c.destinos:
+                        valores.pop(destino, None)
+                elif tipo is Chamada:
+                    for variavel in self.efeitos[c.rotina]:
+                        valores.pop(variavel, None)
+
+    # codigo_morto
+
+    def codigo_morto(self):
+        contador = [0]
+        for rotina, corpo in self.corpos():
+            lidas = set()
+            if rotina is not None:
+                for c in percorrer(corpo):
+                    for e in expressoes(c):
+                        variaveis_lidas(e, lidas)
+            self.trocar_corpo(rotina, self.podar(corpo, rotina, lidas, contador))
+        return Efeito("codigo_morto", contador[0], "comandos removidos")
+
+    def podar(self, comandos, rotina, lidas, contador):
+        """
+        Comandos sem os que nunca rodam (if, while e for de condição
+        constante), sem x := x e, numa rotina, sem as atribuições puras a
+        locais que nunca são lidos. As globais ficam: são o estado final.
+        """
+        resultado = []
+        for c in comandos:
+            tipo = type(c)
+            if tipo is Se:
+                valor = condicao_constante(c.condicao)
+                if valor is not None:
+                    contador[0] += 1
+                    resultado.extend(self.podar(c.entao if valor else c.senao, rotina, lidas, contador))
+                    continue
+                c.entao = self.podar(c.entao, rotina, lidas, contador)
+                c.senao = self.podar(c.senao, rotina, lidas, contador)
+            elif tipo is Enquanto:
+                if condicao_constante(c.condicao) is False:
+                    contador[0] += 1
+                    continue
+                c.corpo = self.podar(c.corpo, rotina, lidas, contador)
+            elif tipo is Repita:
+                c.corpo = self.podar(c.corpo, rotina, lidas, contador)
+                if condicao_constante(c.condicao) is True:
+                    contador[0] += 1
+                    resultado.extend(c.corpo)  # roda uma vez só
+                    continue
+            elif tipo is Para:
+                if type(c.inicio) is Constante and c.inicio.valor > c.limite:
+                    contador[0] += 1
+                    continue
+                c.corpo = self.podar(c.corpo, rotina, lidas, contador)
+            elif tipo is Atribuicao:
+                destino = c.destino
+                if type(c.valor) is Acesso and c.valor.variavel is destino:
+                    contador[0] += 1
+                    continue
+                if rotina is not None and destino.local and destino not in lidas and pura(c.valor):
+                    contador[0] += 1
+                    continue
+            resultado.append(c)
+        return resultado
+
+    # invariantes
+
+    def invariantes(self):
+        contador = [0]
+        for rotina, corpo in self.corpos():
+            self.trocar_corpo(rotina, self.mover(corpo, rotina, contador))
+        return Efeito("invariantes", contador[0], "expressões tiradas de laços")
+
+    def temporaria(self, rotina, tipo):
+        """Nova variável para o valor de uma expressão invariante: local da rotina, ou global."""
+        self.temporarias += 1
+        lista = self.programa.globais if rotina is None else rotina.locais
+        # '_' não começa identificador da LALG: não colide com os do programa
+        variavel = Variavel(f"_inv{self.temporarias}", tipo, rotina is not None, len(lista),
+                            valor_inicial(tipo), False)
+        lista.append(variavel)
+        return variavel
+
+    def mover(self, comandos, rotina, contador):
+        """Comandos com as expressões invariantes de cada while e for calculadas antes do laço."""
+        resultado = []
+        for c in comandos:
+            tipo = type(c)
+            if tipo is Se:
+                c.entao = self.mover(c.entao, rotina, contador)
+                c.senao = self.mover(c.senao, rotina, contador)
+            elif tipo is Repita:
+                c.corpo = self.mover(c.corpo, rotina, contador)
+            elif tipo is Enquanto or tipo is Para:
+                # Os laços de dentro primeiro: o que sai deles pode sair deste também
+                c.corpo = self.mover(c.corpo, rotina, contador)
+                resultado.extend(self.invariantes_do_laco(c, rotina, contador))
+            resultado.append(c)
+        return resultado
+
+    def invariantes_do_laco(self, laco, rotina, contador):
+        """Atribuições a temporárias, a pôr antes do laço, com as expressões invariantes dele."""
+        antes = []
+        # Temporárias de um laço de dentro cujo valor não depende deste laço
+        # saem inteiras (cada temporária só é atribuída uma vez)
+        modificadas = self.modificadas(laco.corpo)
+        if type(laco) is Para:
+            modificadas.add(laco.variavel)
+        corpo = []
+        for c in laco.corpo:
+            if type(c) is Atribuicao and c.destino.nome.startswith("_") and self.invariante(c.valor, modificadas):
+                antes.append(c)
+                modificadas.discard(c.destino)
+            else:
+                corpo.append(c)
+        laco.corpo = corpo
+
+        # Expressões invariantes puras (avaliadas antes mesmo de um laço que
+        # não roda nenhuma vez): cada uma numa temporária, repetições juntas
+        vistas = {}
+
+        def trocar(e):
+            if type(e) is Constante or type(e) is Acesso:
+                return e
+            if self.invariante(e, modificadas) and pura(e):
+                k = chave(e)
+                temporaria = vistas.get(k)
+                if temporaria is None:
+                    temporaria = vistas[k] = self.temporaria(rotina, e.tipo)
+                    antes.append(Atribuicao(temporaria, e, laco.linha))
+                contador[0] += 1
+                return Acesso(temporaria, e.tipo)
+            if type(e) is Binaria:
+                return Binaria(e.operador, trocar(e.esquerda), trocar(e.direita), e.tipo)
+            return type(e)(trocar(e.operando), e.tipo)
+
+        if type(laco) is Enquanto:
+            mapear(laco, trocar)
+        for c in percorrer(laco.corpo):
+            mapear(c, trocar)
+        return antes
+
+    def invariante(self, e, modificadas):
+        tipo = type(e)
+        if tipo is Constante:
+            return True
+        if tipo is Acesso:
+            return e.variavel not in modificadas
+        if tipo is Binaria:
+            return self.invariante(e.esquerda, modificadas) and self.invariante(e.direita, modificadas)
+        return self.invariante(e.operando, modificadas)
+
+
+def otimizar(programa, passos):
+    """
+    Roda na árvore abstrata programa (que é alterada) os passos pedidos,
+    na ordem de PASSOS; devolve um Efeito por passo. "peephole" é
+    ignorado aqui: ele roda no bytecode (otimizar_bytecode).
+    """
+    desconhecidos = set(passos) - set(PASSOS)
+    if desconhecidos:
+        raise ValueError(f"passo de otimização desconhecido: {', '.join(sorted(desconhecidos))}")
+    otimizador = _Otimizador(programa)
+    return [getattr(otimizador, passo)() for passo in PASSOS if passo in passos and passo != "peephole"]
+
+
+# Passo sobre o bytecode
+
+def otimizar_bytecode(objeto, passos):
+    """Roda o peephole no CodigoObjeto, se pedido (ele é alterado); devolve os Efeitos."""
+    if "peephole" not in passos:
+        return []
+    return [peephole(objeto)]
+
+
+def peephole(objeto):
+    """
+    Simplificações locais no bytecode: saltos para saltos vão direto ao
+    destino final; somem os saltos para a instrução seguinte e os pares
+    CARREGAR x; GUARDAR x; CONST seguido de NEGAR ou PARA_REAL vira uma
+    constante só. Os endereços (saltos, rotinas, linhas) são refeitos.
+    """
+    instrucoes = [[pc, op, list(operandos)] for pc, op, operandos in objeto.instrucoes()]
+    indice = {pc: i for i, (pc, _, _) in enumerate(instrucoes)}
+    alvos = {operandos[DESTINO[op]] for _, op, operandos in instrucoes if op in DESTINO}
+    alvos.update(entrada for _, entrada, _, _ in objeto.rotinas)
+    removidas = [False] * len(instrucoes)
+    mudancas = 0
+
+    def indice_constante(valor):
+        for k, existente in enumerate(objeto.constantes):
+            if mesmo_valor(existente, valor):
+                return k
+        objeto.constantes.append(valor)
+        return len(objeto.constantes) - 1
+
+    for i, (pc, op, operandos) in enumerate(instrucoes):
+        if op in DESTINO:
+            # Segue a cadeia de SALTARs (com limite, contra laços vazios infinitos)
+            destino = operandos[DESTINO[op]]
+            for _ in range(len(instrucoes)):
+                j = indice.get(destino)
+                if j is None or instrucoes[j][1] != SALTAR or instrucoes[j][2][0] == destino:
+                    break
+                destino = instrucoes[j][2][0]
+            if destino != operandos[DESTINO[op]]:
+                operandos[DESTINO[op]] = destino
+                mudancas += 1
+        seguinte = instrucoes[i + 1] if i + 1 < len(instrucoes) else None
+        if seguinte is None or removidas[i]:
+            continue
+        if op == SALTAR and operandos[0] == seguinte[0]:
+            removidas[i] = True
+            mudancas += 1
+        elif seguinte[0] not in alvos:
+            par = (op, seguinte[1])
+            if par in ((CARREGAR_LOCAL, GUARDAR_LOCAL), (CARREGAR_GLOBAL, GUARDAR_GLOBAL)) \
+                    and operandos == seguinte[2]:
+                removidas[i] = removidas[i + 1] = True
+                mudancas += 1
+            elif op == CONST and seguinte[1] in (NEGAR, PARA_REAL):
+                valor = objeto.constantes[operandos[0]]
+                try:
+                    valor = -valor if seguinte[1] == NEGAR else float(valor)
+                except OverflowError:
+                    continue
+                operandos[0] = indice_constante(valor)
+                removidas[i + 1] = True
+                mudancas += 1
+
+    if not mudancas:
+        return Efeito("peephole", 0, "instruções simplificadas")
+
+    # Endereço novo de cada endereço antigo; o de uma instrução removida é o da seguinte
+    novo = {}
+    posicao = 0
+    for i, (pc, op, operandos) in enumerate(instrucoes):
+        novo[pc] = posicao
+        if not removidas[i]:
+            posicao += 1 + OPERANDOS[op]
+    novo[len(objeto.codigo)] = posicao
+
+    codigo = objeto.codigo
+    del codigo[:]
+    for i, (pc, op, operandos) in enumerate(instrucoes):
+        if removidas[i]:
+            continue
+        if op in DESTINO:
+            operandos[DESTINO[op]] = novo[operandos[DESTINO[op]]]
+        codigo.append(op)
+        codigo.extend(operandos)
+    objeto.rotinas = [(nome, novo[entrada], n, modelo) for nome, entrada, n, modelo in objeto.rotinas]
+
+    # Linhas: a de um trecho removido passa para a instrução seguinte, se ela não tiver a sua
+    enderecos, linhas = list(objeto.enderecos), list(objeto.linhas)
+    del objeto.enderecos[:], objeto.linhas[:]
+    for endereco, linha in zip(enderecos, linhas):
+        endereco = novo[endereco]
+        if objeto.enderecos and objeto.enderecos[-1] == endereco:
+            objeto.linhas[-1] = linha
+        elif not objeto.linhas or objeto.linhas[-1] != linha:
+            objeto.enderecos.append(endereco)
+            objeto.linhas.append(linha)
+    return Efeito("peephole", mudancas, "instruções simplificadas")
@@ -0,0 +1,170 @@
+# Códigos dos erros semânticos, como os L001... do léxico
+NAO_DECLARADO = "S001"
+JA_DECLARADO = "S002"
+
+# Categorias dos símbolos declarados
+CONSTANTE = "constante"
+VARIAVEL = "variavel"
+PARAMETRO = "parametro"
+PROCEDIMENTO = "procedimento"
+FUNCAO = "funcao"
+
+# Modos do analisador: o que fazer com um id consumido. Fora das
+# declarações, um id é uso de um nome (USO); o nome do programa é IGNORADO.
+USO = "uso"
+IGNORADO = "ignorado"
+
+# O modo é herdado: ao expandir um destes não-terminais, os ids da sua
+# subárvore passam a ter o modo dado, até outro destes mudá-lo. VARIAVEIS
+# declara sob DC_V e LISTA_PAR, e usa sob CMD (read/write).
+MODO_DO_NAO_TERMINAL = {
+    "PROGRAMA": IGNORADO,
+    "DC_C": CONSTANTE,
+    "DC_V": VARIAVEL,
+    "LISTA_PAR": PARAMETRO,
+    "DC_P": PROCEDIMENTO,
+    "DC_FUNC": FUNCAO,
+    "CMD": USO,
+}
+
+# O escopo de um procedimento ou função abre nos parâmetros (o nome fica
+# no escopo de fora) e fecha ao fim do corpo
+ABRE_ESCOPO = ("PARAMETROS",)
+FECHA_ESCOPO = ("CORPO_P",)
+
+# Terminais que dão o tipo das declarações pendentes: os tipos de var, dos
+# parâmetros e de retorno, e os números das constantes
+TIPO_DO_TERMINAL = {
+    "integer": "integer",
+    "real": "real",
+    "char": "char",
+    "num_int": "integer",
+    "num_real": "real",
+}
+
+
+class Simbolo:
+    """Um nome declarado: categoria, tipo (None até ser conhecido), nível do escopo e posição."""
+
+    __slots__ = ("nome", "categoria", "tipo", "nivel", "linha", "coluna")
+
+    def __init__(self, nome, categoria, nivel, linha, coluna, tipo=None):
+        self.nome = nome
+        self.categoria = categoria
+        self.tipo = tipo
+        self.nivel = nivel
+        self.linha = linha
+        self.coluna = coluna
+
+    def __repr__(self):
+        return f"<Simbolo {self.categoria} {self.nome}: {self.tipo} (nível {self.nivel}, linha {self.linha})>"
+
+
+class ErroSemantico:
+    """
+    Um erro semântico de analisar_semantico(): código (S001...), índice,
+    linha e coluna do id e a mensagem. str(erro) é a mensagem.
+    """
+
+    __slots__ = ("codigo", "indice", "linha", "coluna", "mensagem")
+
+    def __init__(self, codigo, indice, linha, coluna, mensagem):
+        self.codigo = codigo
+        self.indice = indice
+        self.linha = linha
+        self.coluna = coluna
+        self.mensagem = mensagem
+
+    def __str__(self):
+        return self.mensagem
+
+    def __repr__(self):
+        return f"<ErroSemantico {self.codigo} linha {self.linha}, coluna {self.coluna}>"
+
+
+class TabelaSimbolos:
+    """
+    Pilha de escopos sobre um único dicionário: simbolos[id] é a pilha das
+    declarações visíveis do identificador id (vale a do topo) e escopos[k]
+    lista os ids declarados no escopo k, para desfazê-las quando ele fecha.
+    Os ids são os da TabelaIdentificadores do léxico (identificadores), então
+    as chaves são inteiros, não lexemas. Declarar e buscar custam O(1),
+    qualquer que seja o número de escopos ou de nomes; fechar um escopo
+    custa O(nomes declarados nele).
+    """
+
+    __slots__ = ("identificadores", "simbolos", "escopos", "total")
+
+    def __init__(self, identificadores):
+        self.identificadores = identificadores
+        self.simbolos = {}
+        self.escopos = [[]]  # o escopo global fica sempre aberto
+        self.total = 0
+
+    def __len__(self):
+        """Nomes visíveis agora."""
+        return len(self.simbolos)
+
+    def __repr__(self):
+        return f"<TabelaSimbolos: {len(self)} nomes visíveis, nível {self.nivel}>"
+
+    @property
+    def nivel(self):
+        return len(self.escopos) - 1
+
+    def abrir_escopo(self):
+        self.escopos.append([])
+
+    def fechar_escopo(self):
+        simbolos = self.simbolos
+        for chave in self.escopos.pop():
+            visiveis = simbolos[chave]
+            visiveis.pop()
+            if not visiveis:
+                del simbolos[chave]
+
+    def buscar(self, nome):
+        """A declaração visível de nome, ou None."""
+        visiveis = self.simbolos.get(self.identificadores.ids.get(nome))
+        return visiveis[-1] if visiveis else None
+
+    def declarar(self, chave, categoria, linha, coluna):
+        """
+        Declara o identificador de id chave no escopo atual. Devolve
+        (simbolo, anterior): anterior é a declaração do mesmo nome neste
+        escopo, se houver, e então nada é declarado.
+        """
+        nivel = len(self.escopos) - 1
+        visiveis = self.simbolos.get(chave)
+        if visiveis is None:
+            visiveis = self.simbolos[chave] = []
+        elif visiveis[-1].nivel == nivel:
+            return None, visiveis[-1]
+        simbolo = Simbolo(self.identificadores.nome(chave), categoria, nivel, linha, coluna)
+        visiveis.append(simbolo)
+        self.escopos[-1].append(chave)
+        self.total += 1
+        return simbolo, None
+
+
+def compilar_regras(compilada):
+    """
+    Regras semânticas por id de símbolo da tabela compilada: regras[s] é
+    None ou (modo ou None, abre escopo, fecha escopo) para o não-terminal s.
+    """
+    regras = [None] * len(compilada.nomes)
+    for nome, id_simbolo in compilada.ids.items():
+        modo = MODO_DO_NAO_TERMINAL.get(nome)
+        abre, fecha = nome in ABRE_ESCOPO, nome in FECHA_ESCOPO
+        if modo is not None or abre or fecha:
+            regras[id_simbolo] = (modo, abre, fecha)
+    return regras
+
+
+def mensagem_nao_declarado(nome, linha, coluna):
+    return f"Erro semântico: identificador '{nome}' não declarado na linha {linha}, coluna {coluna}"
+
+
+def mensagem_ja_declarado(nome, anterior, linha, coluna):
+    return (f"Erro semântico: identificador '{nome}' já declarado neste escopo (linha {anterior.linha}) "
+            f"na linha {linha}, coluna {coluna}")
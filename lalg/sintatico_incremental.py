@@ -0,0 +1,384 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .analisador_sintatico import (ARQUIVO_GRAMATICA, CONSUMIR, PRIMEIRA_PRODUCAO, AnalisadorSintatico,
+                                  RastroAcoes)
+from .analisador_lexico_texto import PADRAO_QUEBRA, contar_linhas, varrer_colunar
+from .buffer_tokens import BufferTokens, BufferTokensEditavel
+from .diagnosticos import COMENTARIO_NAO_FECHADO, Diagnostico, LimiteDeErros, ListaDiagnosticos
+
+# A cada quantos tokens a análise guarda uma cópia da pilha (um marco)
+INTERVALO_MARCO = 256
+
+# Tamanho dos blocos comparados de uma vez por trecho_alterado()
+BLOCO_COMPARACAO = 4096
+
+
+def trecho_alterado(antigo, novo, bloco=BLOCO_COMPARACAO):
+    """
+    Menor trecho que difere entre dois textos, pelo prefixo e sufixo comuns:
+    devolve (inicio, fim_antigo, fim_novo), com antigo[inicio:fim_antigo]
+    substituído por novo[inicio:fim_novo]. Compara blocos inteiros antes de
+    descer a caracteres, então o custo fica perto de uma comparação de strings.
+    """
+    n = min(len(antigo), len(novo))
+    inicio = 0
+    while inicio + bloco <= n and antigo[inicio:inicio + bloco] == novo[inicio:inicio + bloco]:
+        inicio += bloco
+    while inicio < n and antigo[inicio] == novo[inicio]:
+        inicio += 1
+
+    # O sufixo comum não pode invadir o prefixo
+    limite = n - inicio
+    fim_a, fim_n = len(antigo), len(novo)
+    sufixo = 0
+    while sufixo + bloco <= limite and antigo[fim_a - sufixo - bloco:fim_a - sufixo] == novo[fim_n - sufixo - bloco:fim_n - sufixo]:
+        sufixo += bloco
+    while sufixo < limite and antigo[fim_a - sufixo - 1] == novo[fim_n - sufixo - 1]:
+        sufixo += 1
+    return inicio, fim_a - sufixo, fim_n - sufixo
+
+
+def _deslocar(coluna, inicio, valor):
+    """Soma valor aos elementos de coluna[inicio:], no lugar."""
+    if valor:
+        coluna[inicio:] = array(coluna.typecode, map(valor.__add__, coluna[inicio:]))
+
+
+def _deslocar_falha(falha, dt):
+    return None if falha is None else (falha[0] + dt, falha[1])
+
+
+class AnalisadorSintaticoIncremental(AnalisadorSintatico):
+    """
+    Análise léxica e sintática para buffers de editor, refeita só onde o
+    texto mudou. O estado guardado é o de uma análise com rastro de ações:
+    os tokens (BufferTokensEditavel), o log de ações (como em RastroAcoes)
+    e os marcos, cópias da pilha tiradas a cada INTERVALO_MARCO tokens
+    consumidos (marcos_tokens[m] é o índice do próximo token,
+    marcos_passos[m] o número de ações até ali e marcos_pilhas[m] a pilha,
+    uma tupla de ids compilados). Cada edição:
+      1. revarre uma janela de texto, da linha do último token antes da
+         edição até o primeiro token depois dela que volte a coincidir com
+         um token antigo (mesmo tipo e mesma posição, deslocada); daí em
+         diante os tokens são os antigos;
+      2. retoma a análise LL(1) no último marco antes do primeiro token de
+         tipo alterado, com a pilha guardada ali;
+      3. para assim que, já depois dos tokens alterados, a pilha volta a ser
+         igual à de um marco antigo no mesmo token: daí em diante a análise
+         seria idêntica, então o resto do log e o desfecho são os antigos.
+    Os comandos que não mudaram (corpos de procedimentos, os outros CMD de
+    COMANDOS) não são refeitos, e tokens, log e marcos são emendados no
+    lugar: o custo cresce com o tamanho da edição, não com o do arquivo. O
+    resultado é sempre igual ao de tokenizar() seguido de
+    analisar(..., rastro=RASTRO_ACOES) sobre o texto inteiro.
+
+    Se a edição introduz um erro sintático, os marcos antigos depois do erro
+    (e o log a partir deles) ficam guardados como reserva, a partir de
+    marcos_tokens[reserva] e acoes[passo_reserva]: quando o erro for
+    corrigido, a análise volta a convergir com eles. Um erro léxico não
+    altera o estado; a edição seguinte é comparada com o último texto
+    analisado (self.analisado).
+    """
+
+    def __init__(self, texto="", gramatica=ARQUIVO_GRAMATICA):
+        super().__init__(gramatica)
+        self.texto = texto
+        self.analisado = None  # texto do estado guardado
+        self.tokens = None
+        self.acoes = None
+        self.marcos_tokens = self.marcos_passos = self.marcos_pilhas = None
+        self.reserva = self.passo_reserva = 0
+        self.falha = self.falha_reserva = None
+        self.erro_lexico = None
+        self.sucesso = False
+        self.mensagem = ""
+        # Medidas da última análise
+        self.tokens_revarridos = 0
+        self.tokens_reanalisados = 0
+        self.reaproveitou = False
+        self._analisar_tudo(texto)
+
+    def rastro(self):
+        """RastroAcoes da análise atual (None se houve erro léxico)."""
+        if self.erro_lexico is not None:
+            return None
+        acoes = self.acoes if self.passo_reserva == len(self.acoes) else self.acoes[:self.passo_reserva]
+        return RastroAcoes(self.tokens, self.compilada, acoes, self.sucesso, self.mensagem)
+
+    def editar(self, inicio, fim, texto_novo):
+        """
+        Substitui self.texto[inicio:fim] (offsets em caracteres) por
+        texto_novo e reanalisa. Devolve (sucesso, mensagem).
+        """
+        texto = self.texto[:inicio] + texto_novo + self.texto[fim:]
+        if self.analisado is not None and self.analisado is self.texto:
+            return self._reanalisar(texto, inicio, fim, inicio + len(texto_novo))
+        return self.sincronizar(texto)
+
+    def sincronizar(self, texto):
+        """
+        Reanalisa o conteúdo completo do editor, localizando o trecho
+        alterado desde a última análise pelo prefixo e sufixo comuns.
+        Devolve (sucesso, mensagem).
+        """
+        if self.analisado is None:
+            return self._analisar_tudo(texto)
+        inicio, fim, fim_novo = trecho_alterado(self.analisado, texto)
+        if fim_novo - inicio > len(texto) // 2:
+            return self._analisar_tudo(texto)  # texto quase todo novo
+        return self._reanalisar(texto, inicio, fim, fim_novo)
+
+    def _analisar_tudo(self, texto):
+        self.texto = texto
+        self.reaproveitou = False
+        tokens, erro = self.tokenizar(texto)
+        if erro is not None:
+            self.analisado = None
+            return self._erro_lexico(erro)
+        self.tokens = BufferTokensEditavel.de_buffer(tokens, contar_linhas(texto) + 1)
+        self.analisado = texto
+        pilha = [self.compilada.fim, self.compilada.inicio]
+        self.acoes = array('H')
+        self.marcos_tokens, self.marcos_passos, self.marcos_pilhas = array('i', [0]), array('q', [0]), [tuple(pilha)]
+        _, self.falha, _ = self._executar(pilha, 0, self.acoes, 0, 0, 0, 0)
+        self.reserva, self.passo_reserva = len(self.marcos_tokens), len(self.acoes)
+        self.tokens_revarridos = self.tokens_reanalisados = len(tokens)
+        return self._desfecho_atual()
+
+    def _reanalisar(self, texto, a, b, b_novo):
+        """Reanalisa texto, em que self.analisado[a:b] virou texto[a:b_novo]."""
+        self.texto = texto
+        tokens = self.tokens
+        n = len(tokens)
+        delta = b_novo - b
+        indices = range(n)
+
+        # 1. Janela léxica. Ela começa no início da linha do último token que
+        # termina antes da edição: uma linha com tokens sempre começa fora
+        # de comentário, e nada antes da janela mudou.
+        k = bisect_left(indices, a, key=tokens.fim) - 1
+        if k >= 0:
+            de = tokens.inicio(k) - tokens.colunas[k] + 1
+            num_linha = tokens.linha(k)
+        else:
+            de, num_linha = 0, 1
+        primeiro = bisect_left(indices, de, key=tokens.inicio)
+        seguinte = bisect_left(indices, b, key=tokens.inicio)  # primeiro token depois da edição
+
+        ate = self._fim_da_linha(texto, b_novo)
+        while True:
+            janela = BufferTokens(texto, tokens.identificadores)
+            erros = ListaDiagnosticos(max_erros=1)
+            try:
+                aberto = varrer_colunar(texto, de, ate, num_linha, janela, erros)
+            except LimiteDeErros:
+                return self._erro_lexico(erros[0])
+            if aberto and ate == len(texto):
+                # Sem "*/" até o fim do texto, como em analisar_compilado()
+                return self._erro_lexico(Diagnostico(COMENTARIO_NAO_FECHADO, contar_linhas(texto) + 1))
+            if not aberto:
+                reencontro = self._reencontrar(janela, tokens, b_novo, seguinte, delta)
+                if reencontro is not None:
+                    r, j = reencontro
+                    break
+                if ate == len(texto):
+                    r, j = len(janela), n
+                    break
+            # Sem reencontro (ou num comentário aberto): dobra a janela
+            ate = self._fim_da_linha(texto, min(len(texto), ate + max(ate - de, BLOCO_COMPARACAO)))
+        self.tokens_revarridos = len(janela)
+
+        # 2. Tokens de tipo alterado: [i0, fim_antigo) viraram [i0, fim_novo).
+        # Para a análise só os tipos importam.
+        tipos, novos_tipos = tokens.tipos, janela.tipos
+        q = 0
+        while q < r and primeiro + q < j and novos_tipos[q] == tipos[primeiro + q]:
+            q += 1
+        i0 = primeiro + q
+        fim_antigo, fim_r = j, r
+        while fim_antigo > i0 and fim_r > q and tipos[fim_antigo - 1] == novos_tipos[fim_r - 1]:
+            fim_antigo -= 1
+            fim_r -= 1
+        fim_novo = primeiro + fim_r
+        dt = r - (j - primeiro)
+
+        if j < n:
+            linhas_a_mais = janela.linhas[r] - tokens.linha(j)
+            colunas_a_mais = janela.colunas[r] - tokens.colunas[j]
+        else:
+            # Nenhum token depois da janela, mas a linha de referência (a
+            # última do texto, mais um) também anda com as linhas da janela
+            linhas_a_mais = num_linha + contar_linhas(texto[de:]) - tokens.linha_referencia
+            colunas_a_mais = 0
+        for coluna in (janela.tipos, janela.inicios, janela.fins, janela.linhas, janela.colunas, janela.simbolos):
+            del coluna[r:]
+        tokens.substituir(primeiro, j, janela, texto, linhas_a_mais, colunas_a_mais)
+        self.analisado = texto
+
+        # 3. Retoma no último marco válido que só depende de tokens
+        # anteriores a i0; os da reserva ainda não foram alcançados
+        marcos_tokens, marcos_passos, marcos_pilhas = self.marcos_tokens, self.marcos_passos, self.marcos_pilhas
+        m = min(bisect_right(marcos_tokens, i0), self.reserva) - 1
+        passo_inicial = marcos_passos[m]
+        p = max(bisect_left(marcos_tokens, fim_antigo), m + 1)
+        novas = array('H')
+        novos_marcos = (array('i'), array('q'), [])
+        convergiu, falha, p = self._executar(list(marcos_pilhas[m]), marcos_tokens[m], novas, passo_inicial,
+                                             fim_novo, p, dt, novos_marcos)
+        self.reaproveitou = convergiu >= 0
+
+        tinha_reserva = self.reserva < len(marcos_tokens)
+        erro_sintatico = convergiu < 0 and falha is not None and falha[1] is not None
+        if convergiu >= 0:
+            # A análise segue igual à antiga a partir do marco convergiu
+            corte = convergiu
+            self.tokens_reanalisados = marcos_tokens[convergiu] + dt - marcos_tokens[m]
+            falha = _deslocar_falha(self.falha_reserva if convergiu >= self.reserva else self.falha, dt)
+        elif erro_sintatico:
+            # Os marcos antigos depois do erro viram a reserva
+            corte = max(p, self.reserva) if tinha_reserva else p
+            self.falha_reserva = _deslocar_falha(self.falha_reserva if tinha_reserva else self.falha, dt)
+            self.tokens_reanalisados = falha[0] - marcos_tokens[m]
+        else:
+            corte = len(marcos_tokens)
+            self.tokens_reanalisados = len(tokens) - marcos_tokens[m]
+        self.falha = falha
+
+        # Emenda log e marcos no lugar
+        passo_corte = marcos_passos[corte] if corte < len(marcos_tokens) else len(self.acoes)
+        self.acoes[passo_inicial:passo_corte] = novas
+        ds = len(novas) - (passo_corte - passo_inicial)
+        _deslocar(marcos_tokens, corte, dt)
+        _deslocar(marcos_passos, corte, ds)
+        marcos_tokens[m + 1:corte] = novos_marcos[0]
+        marcos_passos[m + 1:corte] = novos_marcos[1]
+        marcos_pilhas[m + 1:corte] = novos_marcos[2]
+
+        fim_novos_marcos = m + 1 + len(novos_marcos[0])
+        if 0 <= convergiu < self.reserva:
+            self.reserva += fim_novos_marcos - corte
+            self.passo_reserva += ds
+        elif erro_sintatico:
+            self.reserva, self.passo_reserva = fim_novos_marcos, passo_inicial + len(novas)
+        else:
+            self.reserva, self.passo_reserva = len(marcos_tokens), len(self.acoes)
+        return self._desfecho_atual()
+
+    def _executar(self, pilha, idx, acoes, passo_inicial, fim_novo, p, dt, novos_marcos=None):
+        """
+        Laço de _analisar() a partir de (pilha, idx), gravando as ações em
+        acoes e os marcos em novos_marcos (ou nos do estado, se None). A
+        partir do token fim_novo compara a pilha com os marcos guardados
+        self.marcos_*[p:], de índices deslocados de dt, e para no primeiro
+        igual. Devolve (marco da convergência ou -1, falha, p).
+        """
+        c = self.compilada
+        n_terminais = c.n_terminais
+        limite_nao_terminais = c.limite_nao_terminais
+        deslocamento = n_terminais * n_terminais
+        celulas = c.celulas
+        empilhar = c.empilhar
+        terminal_do_tipo = c.terminal_do_tipo
+        fim = c.fim
+        tipos = self.tokens.tipos
+        total = len(tipos)
+        registrar = acoes.append
+        if novos_marcos is None:
+            novos_marcos = (self.marcos_tokens, self.marcos_passos, self.marcos_pilhas)
+            antigos_tokens, antigos_pilhas = (), ()
+        else:
+            antigos_tokens, antigos_pilhas = self.marcos_tokens, self.marcos_pilhas
+        marcar_token, marcar_passo, marcar_pilha = (coluna.append for coluna in novos_marcos)
+        n_antigos = len(antigos_tokens)
+
+        token_atual_idx = idx
+        token_atual = terminal_do_tipo[tipos[idx]] if idx < total else fim
+        proximo, p = self._proximo_marco(idx, fim_novo, antigos_tokens, p, dt)
+
+        while pilha:
+            topo = pilha.pop()
+
+            if topo < n_terminais:
+                if topo != token_atual:
+                    return -1, (token_atual_idx, topo), p
+                token_atual_idx += 1
+                token_atual = terminal_do_tipo[tipos[token_atual_idx]] if token_atual_idx < total else fim
+                registrar(CONSUMIR)
+                if token_atual_idx == proximo:
+                    estado = tuple(pilha)
+                    if p < n_antigos and proximo == antigos_tokens[p] + dt and estado == antigos_pilhas[p]:
+                        return p, None, p
+                    marcar_token(token_atual_idx)
+                    marcar_passo(passo_inicial + len(acoes))
+                    marcar_pilha(estado)
+                    proximo, p = self._proximo_marco(token_atual_idx, fim_novo, antigos_tokens, p, dt)
+
+            elif topo < limite_nao_terminais:
+                producao = celulas[topo * n_terminais + token_atual - deslocamento]
+                if producao < 0:
+                    return -1, (token_atual_idx, topo), p
+                pilha.extend(empilhar[producao])
+                registrar(PRIMEIRA_PRODUCAO + producao)
+            else:
+                return -1, (token_atual_idx, topo), p
+
+        return -1, (None if token_atual_idx >= total else (token_atual_idx, None)), p
+
+    @staticmethod
+    def _proximo_marco(idx, fim_novo, antigos_tokens, p, dt):
+        """
+        Token do próximo marco depois de idx: múltiplos de INTERVALO_MARCO
+        antes de fim_novo; depois, os marcos antigos deslocados (onde a pilha
+        é comparada), ou de novo os múltiplos quando eles acabam.
+        """
+        proximo = (idx // INTERVALO_MARCO + 1) * INTERVALO_MARCO
+        if proximo < fim_novo:
+            return proximo, p
+        while p < len(antigos_tokens) and antigos_tokens[p] + dt <= idx:
+            p += 1
+        if p < len(antigos_tokens):
+            return antigos_tokens[p] + dt, p
+        return proximo, p
+
+    @staticmethod
+    def _reencontrar(janela, tokens, b_novo, j, delta):
+        """
+        Primeiro token r da janela, a partir de b_novo, igual a um token
+        antigo j (a partir de j, deslocado de delta) em tipo e posição:
+        dali em diante a varredura repetiria a antiga. Devolve (r, j) ou None.
+        """
+        n = len(tokens)
+        for r in range(bisect_left(janela.inicios, b_novo), len(janela)):
+            posicao = janela.inicios[r]
+            while j < n and tokens.inicio(j) + delta < posicao:
+                j += 1
+            if j == n:
+                return None
+            if (tokens.inicio(j) + delta == posicao and tokens.fim(j) + delta == janela.fins[r]
+                    and tokens.tipos[j] == janela.tipos[r]):
+                return r, j
+        return None
+
+    @staticmethod
+    def _fim_da_linha(texto, pos):
+        """Offset logo após a quebra da linha que contém pos (ou o fim do texto)."""
+        m = PADRAO_QUEBRA.search(texto, pos)
+        return m.end() if m else len(texto)
+
+    def _erro_lexico(self, erro):
+        self.erro_lexico = erro
+        self.sucesso, self.mensagem = False, str(erro)
+        return self.sucesso, self.mensagem
+
+    def _desfecho_atual(self):
+        """sucesso e mensagem a partir de self.falha, com as posições atuais."""
+        self.erro_lexico = None
+        tokens = self.tokens
+        if self.falha is None:
+            self.sucesso, self.mensagem = self._desfecho(tokens, len(tokens))
+        elif self.falha[1] is None:
+            self.sucesso, self.mensagem = self._desfecho(tokens, self.falha[0])
+        else:
+            self.sucesso, self.mensagem = False, self._mensagem_erro(tokens, *self.falha)
+        return self.sucesso, self.mensagem
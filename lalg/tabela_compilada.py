@@ -0,0 +1,74 @@
+from array import array
+
+# Célula vazia da tabela densa (nenhuma produção)
+SEM_PRODUCAO = -1
+
+
+class TabelaCompilada:
+    """
+    Tabela LL(1) compilada para o laço de análise. Cada símbolo da gramática
+    vira um inteiro pequeno:
+      0 .. n_terminais-1                 - terminais, na ordem de `terminais`;
+      n_terminais .. limite_nao_terminais-1 - não-terminais;
+      limite_nao_terminais ..            - símbolos que aparecem na tabela mas
+                                           não foram declarados (erro ao chegar
+                                           ao topo da pilha, como antes).
+    `celulas` é a tabela densa (não-terminal x terminal) de ids de produção,
+    achatada num array; `empilhar[p]` é a produção p já invertida e sem 'ε',
+    pronta para pilha.extend().
+    """
+
+    __slots__ = ("nomes", "ids", "n_terminais", "limite_nao_terminais", "celulas",
+                 "producoes", "empilhar", "terminal_do_tipo", "fim", "inicio")
+
+    def indice(self, nao_terminal, terminal):
+        """Posição da célula (nao_terminal, terminal) em celulas."""
+        return (nao_terminal - self.n_terminais) * self.n_terminais + terminal
+
+
+def compilar(terminais, nao_terminais, tabela, terminal_do_tipo, simbolo_inicial="PROGRAMA", marcador_fim="$"):
+    """
+    Compila a tabela no formato de dicionário ({nao_terminal: {terminal:
+    producao}}, a forma legível gerada de gramatica.bnf) para uma TabelaCompilada.
+    terminal_do_tipo dá o terminal da gramática de cada tipo de token.
+    As produções são numeradas na ordem em que aparecem na tabela; uma
+    produção selecionada por vários terminais ganha um id só, para o qual
+    apontam todas as suas células.
+    """
+    c = TabelaCompilada()
+    c.nomes = list(terminais) + list(nao_terminais)
+    c.ids = {nome: i for i, nome in enumerate(c.nomes)}
+    c.n_terminais = len(terminais)
+    c.limite_nao_terminais = len(c.nomes)
+
+    def intern(nome):
+        if nome not in c.ids:
+            c.ids[nome] = len(c.nomes)
+            c.nomes.append(nome)
+        return c.ids[nome]
+
+    c.celulas = array("h", [SEM_PRODUCAO]) * (len(nao_terminais) * c.n_terminais)
+    c.producoes = []
+    c.empilhar = []
+    id_da_producao = {}
+    for nao_terminal, linha in tabela.items():
+        for terminal, producao in linha.items():
+            chave = (nao_terminal, tuple(producao))
+            p = id_da_producao.get(chave)
+            if p is None:
+                p = id_da_producao[chave] = len(c.producoes)
+                c.producoes.append((nao_terminal, producao))
+                c.empilhar.append(tuple(intern(s) for s in reversed(producao) if s != 'ε'))
+            nt = c.ids.get(nao_terminal, -1)
+            t = c.ids.get(terminal, -1)
+            # Linhas de símbolos não declarados nunca são consultadas
+            if c.n_terminais <= nt < c.limite_nao_terminais and 0 <= t < c.n_terminais:
+                c.celulas[c.indice(nt, t)] = p
+
+    for terminal in terminal_do_tipo:
+        if terminal not in c.ids or c.ids[terminal] >= c.n_terminais:
+            raise ValueError(f"Tipo de token sem terminal na gramática: {terminal}")
+    c.terminal_do_tipo = array("h", (c.ids[t] for t in terminal_do_tipo))
+    c.fim = c.ids[marcador_fim]
+    c.inicio = c.ids[simbolo_inicial]
+    return c
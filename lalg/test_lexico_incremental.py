@@ -0,0 +1,65 @@
+import random
+import unittest
+
+from .analisador_lexico_texto import AnalisadorLexicoTexto
+from .lexico_incremental import AnalisadorLexicoIncremental
+
+# Pedaços dos textos aleatórios: abrem e fecham /* */, quebram linhas e
+# provocam cada erro léxico
+PEDACOS = list("ab09. \t/*<>=:;+") + ["program", "begin", "for", "/*", "*/", "//", "\n", "\r\n", "\n\n",
+                                      "99999999999", "x" * 256, "é", "12.", "3.14"]
+
+
+class TestLexicoIncremental(unittest.TestCase):
+    """Depois de cada edição, tokens e erros devem ser os de uma nova análise completa."""
+
+    def setUp(self):
+        self.gerador = random.Random(0)
+
+    def texto_aleatorio(self, maximo):
+        return "".join(self.gerador.choice(PEDACOS) for _ in range(self.gerador.randint(0, maximo)))
+
+    def assertIgualAoCompleto(self, incremental, edicao=None):
+        completo = AnalisadorLexicoTexto("\n".join(incremental.linhas))
+        # splitlines() do texto juntado perderia uma última linha vazia
+        completo.codigo = list(incremental.linhas)
+        completo.analisar()
+        mensagem = f"linhas {incremental.linhas!r}, edição {edicao!r}"
+        self.assertEqual(list(incremental.tokens()), completo.tokens, mensagem)
+        self.assertEqual(incremental.erros(), list(completo.erros), mensagem)
+
+    def test_comentario_aberto_e_fechado(self):
+        incremental = AnalisadorLexicoIncremental("program p;\nvar a: integer;\nbegin\n  a := 1;\nend.")
+        for linha_ini, linha_fim, texto in [
+            (2, 1, "/* comentário"),  # abre: as linhas de baixo viram comentário
+            (4, 3, "fim */ a"),       # fecha duas linhas abaixo
+            (2, 2, "x"),              # tira a abertura
+            (6, 5, "/*"),             # abre sem fechar, até o fim do texto
+            (6, 6, ""),               # e remove a linha
+        ]:
+            incremental.aplicar_edicao(linha_ini, linha_fim, texto)
+            self.assertIgualAoCompleto(incremental, (linha_ini, linha_fim, texto))
+
+    def test_edicoes_aleatorias(self):
+        for _ in range(500):
+            incremental = AnalisadorLexicoIncremental(self.texto_aleatorio(60))
+            self.assertIgualAoCompleto(incremental)
+            for _ in range(8):
+                if incremental.linhas and self.gerador.random() < 0.3:
+                    # Edição de uma linha pelo conteúdo completo, como na interface
+                    linhas = list(incremental.linhas)
+                    linhas[self.gerador.randrange(len(linhas))] = self.texto_aleatorio(10)
+                    incremental.sincronizar("\n".join(linhas))
+                    edicao = ("sincronizar", linhas)
+                else:
+                    # Troca, inserção (linha_fim = linha_ini - 1) ou remoção (texto vazio) de linhas
+                    linha_ini = self.gerador.randint(1, len(incremental.linhas) + 1)
+                    linha_fim = self.gerador.randint(linha_ini - 1, len(incremental.linhas))
+                    texto = self.texto_aleatorio(15)
+                    incremental.aplicar_edicao(linha_ini, linha_fim, texto)
+                    edicao = ("aplicar_edicao", linha_ini, linha_fim, texto)
+                self.assertIgualAoCompleto(incremental, edicao)
+
+
+if __name__ == "__main__":
+    unittest.main()
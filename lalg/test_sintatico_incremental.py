@@ -0,0 +1,90 @@
+import random
+import unittest
+
+from .analisador_sintatico import RASTRO_ACOES, AnalisadorSintatico
+from .sintatico_incremental import AnalisadorSintaticoIncremental
+
+PROGRAMA = """program p;
+var a, b: integer;
+begin
+    a := 1;
+    if a > 0 then b := a + 2;
+    while (b < 10) do b := b + 1;
+end."""
+
+# Pedaços das edições aleatórias: quebras de linha, comentários e erros
+PEDACOS = ["a", " := ", "1", ";", " end", "begin ", "+", "x", ".", "\n", "\r\n", "\n\n", "/*", "*/", "//", " ",
+           "write(a);", "a := a + 1;\n", "12345678901", "@"]
+
+
+class TestSintaticoIncremental(unittest.TestCase):
+    """Cada edição deve dar o mesmo resultado de tokenizar + analisar o texto inteiro de novo."""
+
+    def setUp(self):
+        self.sintatico = AnalisadorSintatico()
+
+    def completo(self, texto):
+        tokens, erro = self.sintatico.tokenizar(texto)
+        if erro:
+            return ("léxico", str(erro))
+        sucesso, mensagem, rastro = self.sintatico.analisar(tokens, rastro=RASTRO_ACOES)
+        return (sucesso, mensagem, rastro.acoes.tobytes(),
+                [tokens.token(i) + (tokens.inicios[i], tokens.fins[i]) for i in range(len(tokens))])
+
+    def incremental(self, analisador):
+        if analisador.erro_lexico:
+            return ("léxico", analisador.mensagem)
+        tokens = analisador.tokens
+        return (analisador.sucesso, analisador.mensagem, analisador.rastro().acoes.tobytes(),
+                [tokens.token(i) + (tokens.inicio(i), tokens.fim(i)) for i in range(len(tokens))])
+
+    def editar(self, analisador, texto, inicio, fim, novo):
+        texto = texto[:inicio] + novo + texto[fim:]
+        analisador.editar(inicio, fim, novo)
+        self.assertEqual(analisador.texto, texto)
+        self.assertEqual(self.incremental(analisador), self.completo(texto), repr(texto))
+        return texto
+
+    def test_acrescimo_no_fim_e_edicao_acima(self):
+        texto = "program p;\nbegin\nend."
+        analisador = AnalisadorSintaticoIncremental(texto)
+        texto = self.editar(analisador, texto, len(texto), len(texto), "\n\n\nx")
+        texto = self.editar(analisador, texto, 0, 0, " ")
+        self.editar(analisador, texto, 12, 12, "\n")
+
+    def test_serie_de_edicoes(self):
+        texto = PROGRAMA
+        analisador = AnalisadorSintaticoIncremental(texto)
+        fim = len(texto)
+        for inicio, fim_edicao, novo in [
+            (fim, fim, "\n"),                         # linha nova no fim
+            (fim + 1, fim + 1, "// comentário\n\n"),  # mais linhas no fim
+            (0, 0, "\n"),                             # e uma no começo
+            (1, 8, "program q"),                      # troca o nome
+            (20, 20, "/*"),                           # abre um comentário...
+            (40, 40, "*/"),                           # ...e fecha mais abaixo
+            (20, 22, ""),                             # tira a abertura
+        ]:
+            texto = self.editar(analisador, texto, inicio, fim_edicao, novo)
+        # Remove as linhas do fim e volta a escrever embaixo
+        texto = self.editar(analisador, texto, len(texto) - 20, len(texto), "")
+        texto = self.editar(analisador, texto, len(texto), len(texto), "\nend.\n\n")
+        self.editar(analisador, texto, 5, 6, "")
+
+    def test_edicoes_aleatorias(self):
+        gerador = random.Random(0)
+        texto = PROGRAMA
+        analisador = AnalisadorSintaticoIncremental(texto)
+        for _ in range(400):
+            # Metade das edições no começo ou no fim do texto, onde o editor mais escreve
+            inicio = gerador.choice([0, len(texto), len(texto), gerador.randrange(len(texto) + 1)])
+            fim = min(len(texto), inicio + gerador.choice([0, 0, 1, 2, 5, 30]))
+            novo = "".join(gerador.choice(PEDACOS) for _ in range(gerador.choice([0, 1, 1, 2])))
+            texto = self.editar(analisador, texto, inicio, fim, novo)
+            if len(texto) > 2000:
+                texto = PROGRAMA
+                analisador.sincronizar(texto)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from enum import IntEnum
+
+
+class TipoToken(IntEnum):
+    """
+    Tipos de token da LALG como inteiros pequenos, compartilhados pelo
+    analisador léxico e pelo sintático. Os códigos "tokNNN" da tabela de
+    tokens só são montados para exibição e exportação (CODIGO_DO_TIPO).
+    """
+
+    # tok1 - Simbolo Simples
+    ABRE_PARENTESES = 0
+    FECHA_PARENTESES = 1
+    VEZES = 2
+    DIVISAO = 3
+    MAIS = 4
+    MENOS = 5
+    MAIOR = 6
+    MENOR = 7
+    IGUAL = 8
+    CIFRAO = 9
+    PONTO_E_VIRGULA = 10
+    DOIS_PONTOS = 11
+    VIRGULA = 12
+    PONTO = 13
+
+    # tok2 - Simbolo Duplo
+    DIFERENTE = 14
+    MAIOR_IGUAL = 15
+    MENOR_IGUAL = 16
+    ATRIBUICAO = 17
+
+    # tok3 - Numero
+    NUMERO_INTEIRO = 18
+    NUMERO_REAL = 19
+
+    # tok4 - Palavra reservada
+    PROGRAM = 20
+    VAR = 21
+    PROCEDURE = 22
+    IF = 23
+    THEN = 24
+    WHILE = 25
+    DO = 26
+    WRITE = 27
+    READ = 28
+    ELSE = 29
+    BEGIN = 30
+    END = 31
+    INTEGER = 32
+    REAL = 33
+    CONST = 34
+    FUNCTION = 35
+    CHAR = 36
+    REPEAT = 37
+    UNTIL = 38
+    FOR = 39
+    TO = 40
+
+    # tok500 - Identificador
+    IDENTIFICADOR = 41
+
+
+SIMPLES = "()*/+-><=$;:,."
+DUPLOS = ["<>", ">=", "<=", ":="]
+RESERVADAS = ["program", "var", "procedure", "if", "then", "while", "do",
+              "write", "read", "else", "begin", "end", "integer", "real",
+              "const", "function", "char", "repeat", "until", "for", "to"]
+
+# Lexema -> tipo
+TIPO_SIMPLES = {c: TipoToken(TipoToken.ABRE_PARENTESES + i) for i, c in enumerate(SIMPLES)}
+TIPO_DUPLO = {s: TipoToken(TipoToken.DIFERENTE + i) for i, s in enumerate(DUPLOS)}
+TIPO_RESERVADA = {p: TipoToken(TipoToken.PROGRAM + i) for i, p in enumerate(RESERVADAS)}
+
+# Tipo -> código da tabela de tokens (só para exibição e exportação)
+CODIGO_DO_TIPO = (
+    [f"tok1{str(i).zfill(2)}" for i in range(len(SIMPLES))]
+    + [f"tok20{str(i)}" for i in range(len(DUPLOS))]
+    + ["tok300", "tok301"]
+    + [f"tok4{str(i).zfill(2)}" for i in range(len(RESERVADAS))]
+    + ["tok500"]
+)
+
+# Tipo -> terminal da gramática usado na tabela do analisador sintático
+TERMINAL_DO_TIPO = (
+    list(SIMPLES)
+    + DUPLOS
+    + ["num_int", "num_real"]
+    + RESERVADAS
+    + ["id"]
+)
+
+TIPO_DO_CODIGO = {codigo: TipoToken(tipo) for tipo, codigo in enumerate(CODIGO_DO_TIPO)}